@@ -71,7 +71,8 @@ let gameState = {
   cluesFound: [],
   suspectsInterrogated: [],
   confidence: 0,
-  gameStarted: false
+  gameStarted: false,
+  pathTable: null
 };
 
 // Utility for suspect icon (optional, personal flair)
@@ -104,6 +105,7 @@ function selectRandomStory() {
     const key = stories[Math.floor(Math.random() * stories.length)];
     gameState.currentStory = STORYLINES[key];
     gameState.currentRoom = Object.keys(gameState.currentStory.mansion_layout)[0];
+    gameState.pathTable = buildPathTable(gameState.currentStory.mansion_layout);
 }
 
 function startGame() {
@@ -141,6 +143,37 @@ function bfsPath(start, goal) {
     }
     return null;
 }
+// Next-hop table: one BFS per target room, built once per story
+function buildPathTable(mansion) {
+    const table = {};
+    Object.keys(mansion).forEach(target => {
+        const nextHop = { [target]: null };
+        const queue = [target];
+        for (let head = 0; head < queue.length; head++) {
+            const current = queue[head];
+            for (const neighbor of mansion[current].connections) {
+                if (!(neighbor in nextHop)) {
+                    nextHop[neighbor] = current;
+                    queue.push(neighbor);
+                }
+            }
+        }
+        table[target] = nextHop;
+    });
+    return table;
+}
+function lookupPath(start, goal) {
+    if (!gameState.pathTable) return bfsPath(start, goal);
+    const nextHop = gameState.pathTable[goal];
+    if (!nextHop || !(start in nextHop)) return null;
+    const path = [start];
+    let current = start;
+    while (current !== goal) {
+        current = nextHop[current];
+        path.push(current);
+    }
+    return path;
+}
 function calculateConfidence() {
     let total = 0, guilty = 0;
     gameState.cluesFound.forEach(clue => {
@@ -240,7 +273,7 @@ function navigateToRoom(roomName) {
         alert(`Cannot reach ${roomName} from ${gameState.currentRoom}. Rooms are not connected!`);
         return;
     }
-    const path = bfsPath(gameState.currentRoom, roomName);
+    const path = lookupPath(gameState.currentRoom, roomName);
     if (!path) { alert('No path found!'); return; }
     const hazardCheck = checkHazards(roomName);
     const warningsDiv = document.getElementById('hazard-warnings');
@@ -343,7 +376,7 @@ function submitAccusation(accused) {
 function closeInterrogation() { document.getElementById('interrogation-modal').classList.add('hidden'); }
 function continueInterrogation() { closeInterrogation(); }
 function restartGame() {
-    gameState = { currentStory: null, currentRoom: '', cluesFound: [], suspectsInterrogated: [], confidence: 0, gameStarted: false };
+    gameState = { currentStory: null, currentRoom: '', cluesFound: [], suspectsInterrogated: [], confidence: 0, gameStarted: false, pathTable: null };
     document.getElementById('result-modal').classList.add('hidden');
     document.getElementById('accusation-modal').classList.add('hidden');
     document.getElementById('game-screen').classList.add('hidden');
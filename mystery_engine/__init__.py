@@ -0,0 +1,59 @@
+"""Ashford Manor murder mystery engine
+
+Importing the package is free of side effects and of heavy dependencies:
+the classes below are loaded from their submodules on first access, so a
+worker that only needs pathfinding never imports numpy, and plotly is
+only imported when a chart is rendered.
+
+    from mystery_engine import MansionGraph      # loads mystery_engine.graph only
+    python -m mystery_engine solve               # command line (see cli.py)
+"""
+
+import importlib
+
+_EXPORTS = {
+    'NameTable': 'graph',
+    'CompactLayout': 'graph',
+    'PathQueries': 'graph',
+    'MansionGraph': 'graph',
+    'ShortestPathTable': 'graph',
+    'DistanceField': 'graph',
+    'HazardSpread': 'hazards',
+    'SafeRegion': 'hazards',
+    'DialogueNode': 'dialogue',
+    'CompiledDialogueTree': 'dialogue',
+    'compile_dialogue_tree': 'dialogue',
+    'DialogueLibrary': 'dialogue',
+    'DialogueSystem': 'dialogue',
+    'ParallelDialogueSearch': 'dialogue',
+    'Constraint': 'csp',
+    'Equals': 'csp',
+    'NotEquals': 'csp',
+    'AllOf': 'csp',
+    'Predicate': 'csp',
+    'MurderMysteryCSP': 'csp',
+    'KnowledgeBase': 'inference',
+    'WumpusInference': 'inference',
+    'build_case_csp': 'case',
+    'rank_hints': 'hints',
+    'dump_game': 'snapshot',
+    'load_game': 'snapshot',
+    'restore_csp': 'snapshot',
+    'load_mansion': 'loaders',
+    'load_world': 'loaders',
+    'export_all': 'export',
+    'render_chart': 'chart',
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{module}', __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,343 @@
+"""Benchmark suite for the four core algorithms on synthetic, seeded inputs
+
+Every case is timed over several repeats and then run once more under
+tracemalloc for its peak allocation. Each result also records the work
+done (rooms expanded, minimax nodes and prunes, CSP assignments scored),
+and the results are written as JSON so runs can be compared over time:
+compare_reports flags cases that got slower, hungrier or did more work
+than a stored baseline. chart.py plots the same report.
+
+    python -m mystery_engine bench --output benchmarks.json   # full sweep (up to 1M rooms)
+    python -m mystery_engine bench --quick --only bfs,csp     # fast subset
+    python -m mystery_engine bench --quick --save-baseline baseline.json
+    python -m mystery_engine bench --quick --baseline baseline.json   # exits 1 on regression
+"""
+
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from array import array
+from datetime import datetime, timezone
+
+from .csp import AllOf, Equals, MurderMysteryCSP, NotEquals
+from .dialogue import DialogueNode, DialogueSystem
+from .graph import CompactLayout, MansionGraph
+from .inference import WumpusInference
+
+BFS_SIZES = [8, 64, 1_000, 10_000, 100_000, 1_000_000]
+MINIMAX_BRANCHING = [2, 3, 4, 6, 8]
+MINIMAX_DEPTHS = [2, 4, 6, 8, 10]
+MINIMAX_MAX_LEAVES = 300_000
+CSP_DOMAIN_SIZES = [4, 8, 16, 32]
+CSP_CONSTRAINT_COUNTS = [10, 100, 1_000]
+WUMPUS_MOVES = [100, 1_000, 10_000, 100_000]
+QUICK_LIMITS = {'rooms': 10_000, 'leaves': 20_000, 'domain': 16, 'constraints': 100, 'moves': 1_000}
+
+# benchmark -> the parameter its cost scales with (the x axis of its chart)
+SCALING = {
+    'bfs_pathfind': 'rooms',
+    'minimax_with_pruning': 'leaves',
+    'find_best_solution': 'space',
+    'wumpus_move_sequence': 'moves',
+}
+
+def measure(run, setup=None, repeats=3):
+    """Time run(state) over repeats (best/median/mean) plus one tracemalloc pass
+
+    setup() builds a fresh input for every repeat and is not timed.
+    """
+    times = []
+    result = None
+    for _ in range(repeats):
+        state = setup() if setup else None
+        start = time.perf_counter()
+        result = run(state)
+        times.append(time.perf_counter() - start)
+    state = setup() if setup else None
+    tracemalloc.start()
+    try:
+        run(state)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        'repeats': repeats,
+        'seconds': {'min': min(times), 'median': statistics.median(times),
+                    'mean': statistics.fmean(times)},
+        'peak_bytes': peak,
+    }, result
+
+# --- Synthetic inputs ---
+
+def grid_layout(rooms, hazard_rate=0.0, seed=0):
+    """Near-square 4-connected grid written straight into CSR arrays
+
+    Hazards are scattered at hazard_rate and every neighbour of a hazard gets
+    a warning, as in the hand-made mansion.
+    """
+    layout = CompactLayout()
+    columns = max(1, int(rooms ** 0.5))
+    for room_id in range(rooms):
+        layout.intern_room(f'Room {room_id}')
+    offsets, targets = array('i', [0]), array('i')
+    for room_id in range(rooms):
+        row, column = divmod(room_id, columns)
+        if row > 0:
+            targets.append(room_id - columns)
+        if column > 0:
+            targets.append(room_id - 1)
+        if column + 1 < columns and room_id + 1 < rooms:
+            targets.append(room_id + 1)
+        if room_id + columns < rooms:
+            targets.append(room_id + columns)
+        offsets.append(len(targets))
+    layout.offsets, layout.targets = offsets, targets
+    layout.x = array('d', (float(i % columns) for i in range(rooms)))
+    layout.y = array('d', (float(i // columns) for i in range(rooms)))
+
+    rng = random.Random(seed)
+    hazard_text = layout.intern_text('Pit - entering = game over')
+    warning_text = ('You feel a draught',)
+    for room_id in range(1, rooms):
+        if rng.random() < hazard_rate:
+            layout.hazard[room_id] = hazard_text
+            for neighbor in layout.neighbors(room_id):
+                layout.set_warnings(neighbor, warning_text)
+    return layout
+
+def random_dialogue_tree(branching, depth, seed=0):
+    """Complete tree with the given branching factor; leaves carry seeded values"""
+    rng = random.Random(seed)
+
+    def build(level):
+        speaker = 'detective' if level % 2 == 0 else 'Suspect'
+        if level == depth:
+            return DialogueNode(speaker, f'leaf {level}', is_terminal=True,
+                                value=rng.randint(-20, 20))
+        node = DialogueNode(speaker, f'question {level}')
+        node.children = [build(level + 1) for _ in range(branching)]
+        return node
+
+    return build(0)
+
+def random_csp(domain_size, constraints, seed=0):
+    """Four-variable CSP with seeded Equals/NotEquals/AllOf evidence"""
+    rng = random.Random(seed)
+    variables = ['murderer', 'weapon', 'location', 'motive']
+    domains = {var: [f'{var} {i}' for i in range(domain_size)] for var in variables}
+    csp = MurderMysteryCSP(variables, domains)
+    for _ in range(constraints):
+        var = rng.choice(variables)
+        kind = rng.random()
+        if kind < 0.5:
+            constraint = Equals(var, rng.choice(domains[var]))
+        elif kind < 0.8:
+            constraint = NotEquals(var, rng.choice(domains[var]))
+        else:
+            other = rng.choice([v for v in variables if v != var])
+            constraint = AllOf(Equals(var, rng.choice(domains[var])),
+                               Equals(other, rng.choice(domains[other])))
+        csp.add_constraint(constraint, weight=rng.randint(1, 10))
+    return csp
+
+# --- Benchmarks ---
+
+def bench_bfs(quick, repeats):
+    results = []
+    for rooms in BFS_SIZES:
+        if quick and rooms > QUICK_LIMITS['rooms']:
+            continue
+        build_start = time.perf_counter()
+        mansion = MansionGraph(grid_layout(rooms))
+        build_seconds = time.perf_counter() - build_start
+        start, goal = 'Room 0', f'Room {rooms - 1}'
+        timing, path = measure(lambda _: mansion.bfs_pathfind(start, goal), repeats=repeats)
+        results.append({'benchmark': 'bfs_pathfind',
+                        'params': {'rooms': rooms, 'edges': len(mansion.layout.targets)},
+                        'build_seconds': build_seconds,
+                        'path_length': len(path) if path else None,
+                        'work': dict(mansion.paths.search_stats), **timing})
+    return results
+
+def bench_minimax(quick, repeats):
+    results = []
+    max_leaves = QUICK_LIMITS['leaves'] if quick else MINIMAX_MAX_LEAVES
+    for branching in MINIMAX_BRANCHING:
+        for depth in MINIMAX_DEPTHS:
+            if branching ** depth > max_leaves:
+                continue
+            root = random_dialogue_tree(branching, depth, seed=branching * 100 + depth)
+            stats = {}
+
+            def run(dialogue_system):
+                value = dialogue_system.search(root, depth, 'Butler')
+                stats.update(dialogue_system.search_stats)
+                return value
+
+            timing, value = measure(run, setup=DialogueSystem, repeats=repeats)
+            results.append({'benchmark': 'minimax_with_pruning',
+                            'params': {'branching': branching, 'depth': depth,
+                                       'leaves': branching ** depth},
+                            'value': value, 'search_stats': stats,
+                            'work': {'nodes': stats['nodes_searched'],
+                                     'pruned': stats['nodes_pruned']}, **timing})
+    return results
+
+def bench_csp(quick, repeats):
+    results = []
+    for domain_size in CSP_DOMAIN_SIZES:
+        if quick and domain_size > QUICK_LIMITS['domain']:
+            continue
+        for constraints in CSP_CONSTRAINT_COUNTS:
+            if quick and constraints > QUICK_LIMITS['constraints']:
+                continue
+            seed = domain_size * 10_000 + constraints
+            stats = {}
+
+            def run(csp):
+                solution = csp.find_best_solution()
+                stats.update(csp.search_stats)
+                return solution
+
+            timing, (_, score, confidence) = measure(
+                run, setup=lambda: random_csp(domain_size, constraints, seed), repeats=repeats)
+            results.append({'benchmark': 'find_best_solution',
+                            'params': {'domain_size': domain_size, 'variables': 4,
+                                       'space': domain_size ** 4, 'constraints': constraints},
+                            'score': score, 'confidence': confidence,
+                            'work': dict(stats), **timing})
+    return results
+
+def bench_wumpus(quick, repeats):
+    results = []
+    layout = grid_layout(10_000, hazard_rate=0.05, seed=1)
+    for moves in WUMPUS_MOVES:
+        if quick and moves > QUICK_LIMITS['moves']:
+            continue
+
+        def setup():
+            wumpus = WumpusInference(MansionGraph(layout), verbose=False)
+            wumpus.current_room = 'Room 0'
+            return wumpus, random.Random(moves)
+
+        def run(state):
+            wumpus, rng = state
+            rooms = wumpus.mansion.rooms
+            made = 0
+            for _ in range(moves):
+                options = [room for room in rooms[wumpus.current_room]
+                           if wumpus.can_safely_enter(room)]
+                if options and wumpus.move_to_room(rng.choice(options))[0]:
+                    made += 1
+            return made, len(wumpus.knowledge_base), len(wumpus.safe_rooms)
+
+        timing, (made, facts, safe) = measure(run, setup=setup, repeats=repeats)
+        results.append({'benchmark': 'wumpus_move_sequence',
+                        'params': {'rooms': layout.room_count(), 'moves': moves},
+                        'moves_made': made, 'facts': facts, 'safe_rooms': safe,
+                        'work': {'moves': made, 'facts': facts},
+                        'seconds_per_move': timing['seconds']['median'] / max(moves, 1),
+                        **timing})
+    return results
+
+BENCHMARKS = {
+    'bfs': bench_bfs,
+    'minimax': bench_minimax,
+    'csp': bench_csp,
+    'wumpus': bench_wumpus,
+}
+
+def run_benchmarks(only=None, quick=False, repeats=3, progress=None):
+    """Run the selected benchmark groups and return the JSON-ready report"""
+    report = {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'quick': quick,
+            'repeats': repeats,
+        },
+        'results': [],
+    }
+    for name in only or BENCHMARKS:
+        if name not in BENCHMARKS:
+            raise ValueError(f"Unknown benchmark {name!r}; choose from {sorted(BENCHMARKS)}")
+        for result in BENCHMARKS[name](quick, repeats):
+            report['results'].append(result)
+            if progress:
+                progress(result)
+    return report
+
+def result_key(result):
+    return result['benchmark'], json.dumps(result['params'], sort_keys=True)
+
+def compare_reports(report, baseline, tolerance=0.25, min_seconds=0.001):
+    """Regressions of report against baseline, matched by benchmark and params
+
+    A case regresses when its best time or peak memory grows by more than
+    tolerance (times only once the slowdown exceeds min_seconds, to ignore
+    timer noise on tiny inputs) or when any work counter grows at all, since
+    those are deterministic for a seeded input. Returns a list of
+    {'benchmark', 'params', 'metric', 'baseline', 'current', 'ratio'}.
+    """
+    previous = {result_key(result): result for result in baseline['results']}
+    regressions = []
+
+    def check(result, metric, old, new, limit):
+        if old is not None and new is not None and new > old * limit:
+            regressions.append({'benchmark': result['benchmark'], 'params': result['params'],
+                                'metric': metric, 'baseline': old, 'current': new,
+                                'ratio': new / old if old else float('inf')})
+
+    for result in report['results']:
+        old = previous.get(result_key(result))
+        if old is None:
+            continue
+        old_seconds, new_seconds = old['seconds']['min'], result['seconds']['min']
+        if new_seconds - old_seconds > min_seconds:
+            check(result, 'seconds', old_seconds, new_seconds, 1 + tolerance)
+        check(result, 'peak_bytes', old['peak_bytes'], result['peak_bytes'], 1 + tolerance)
+        for counter, count in result.get('work', {}).items():
+            check(result, f'work.{counter}', old.get('work', {}).get(counter), count, 1)
+    return regressions
+
+def configure_parser(parser):
+    parser.add_argument('--only', default=None,
+                        help=f"comma-separated subset of {','.join(BENCHMARKS)}")
+    parser.add_argument('--quick', action='store_true', help="skip the largest inputs")
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--output', default='benchmarks.json')
+    parser.add_argument('--baseline', default=None,
+                        help="report to compare against; exit with status 1 on regressions")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="allowed relative growth in time and memory (default 0.25)")
+    parser.add_argument('--save-baseline', default=None,
+                        help="also write this run as the baseline for later comparisons")
+    parser.set_defaults(run=run)
+
+def run(args):
+    def progress(result):
+        print(f"{result['benchmark']:<24} {json.dumps(result['params'])} "
+              f"median {result['seconds']['median'] * 1000:.2f} ms, "
+              f"peak {result['peak_bytes'] / 1024:.0f} KiB", flush=True)
+
+    only = args.only.split(',') if args.only else None
+    report = run_benchmarks(only, args.quick, args.repeats, progress)
+    for path in filter(None, [args.output, args.save_baseline]):
+        with open(path, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote {len(report['results'])} results to {path}")
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare_reports(report, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression['benchmark']} {json.dumps(regression['params'])} "
+                  f"{regression['metric']}: {regression['baseline']:.6g} -> "
+                  f"{regression['current']:.6g} ({regression['ratio']:.2f}x)")
+        print(f"{len(regressions)} regressions against {args.baseline}")
+        if regressions:
+            sys.exit(1)
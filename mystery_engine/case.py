@@ -0,0 +1,49 @@
+"""The Ashford Manor case: its clues, who reveals what, and the true solution"""
+
+import os
+
+# Repository data directory holding one dialogue tree file per suspect
+DIALOGUE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'dialogues')
+
+# Every clue of the case as (clue name, description), in the order the demo finds them
+CASE_CLUES = [
+    ("bloodstained_glove", "Found in Library, belongs to Heiress"),
+    ("shattered_wine_glass", "Butler admits he dropped it accidentally"),
+    ("suspicious_ledger", "Shows payments from Heiress to Chef"),
+    ("missing_knife", "Red herring - not the murder weapon"),
+    ("poison_analysis", "Wine contained deadly poison"),
+    ("dining_room_scene", "Murder occurred in Dining Room"),
+    ("inheritance_motive", "Heiress inherits father's estate")
+]
+
+SUSPECTS = ['Butler', 'Maid', 'Chef', 'Heiress']
+
+# Evidence (MurderMysteryCSP clue names) yielded by searching each clue room
+ROOM_EVIDENCE = {
+    'Library': ['bloodstained_glove'],
+    'Dining Room': ['shattered_wine_glass', 'dining_room_scene'],
+    'Study': ['suspicious_ledger'],
+    'Kitchen': ['missing_knife'],
+}
+
+# Evidence a suspect gives away when an interrogation goes the detective's way
+TESTIMONY_EVIDENCE = {
+    'Butler': ['poison_analysis'],
+    'Heiress': ['inheritance_motive'],
+}
+
+TRUE_SOLUTION = {'murderer': 'Heiress', 'weapon': 'Poison',
+                 'location': 'Dining Room', 'motive': 'Inheritance'}
+
+# Landmarks suspects head for (see MansionGraph.distance_field)
+CRIME_SCENE = [TRUE_SOLUTION['location']]
+EXITS = ['Hall']  # Where the player enters
+
+def build_case_csp(clues=CASE_CLUES):
+    """MurderMysteryCSP with the given (clue name, description) pairs as evidence"""
+    from .csp import MurderMysteryCSP  # numpy is only needed once a case is solved
+
+    csp = MurderMysteryCSP()
+    for clue_name, description in clues:
+        csp.add_evidence(clue_name, description)
+    return csp
@@ -0,0 +1,131 @@
+"""Measured performance dashboard for the game's four AI algorithms
+
+Plots a benchmark report (see benchmarks.py) instead of hand-typed scores:
+one column per algorithm with latency against input size on top and peak
+memory below, log-log, with the work counters (rooms expanded, minimax
+nodes and prunes, CSP assignments scored) in the hover text. Given a
+baseline report, its curves are drawn dashed and regressed cases are
+marked with a red cross.
+
+plotly is imported only when a chart is actually rendered.
+"""
+
+import json
+
+from .benchmarks import SCALING, compare_reports, result_key, run_benchmarks
+
+TITLES = {
+    'bfs_pathfind': 'BFS Pathfinding',
+    'minimax_with_pruning': 'Minimax Alpha-Beta',
+    'find_best_solution': 'Constraint Satisfaction',
+    'wumpus_move_sequence': 'Wumpus Inference',
+}
+
+# Parameters that split a benchmark into separate curves
+CURVES = {
+    'bfs_pathfind': (),
+    'minimax_with_pruning': ('branching',),
+    'find_best_solution': ('constraints',),
+    'wumpus_move_sequence': (),
+}
+
+# Brand colors
+COLORS = ['#1FB8CD', '#DB4545', '#2E8B57', '#5D878F', '#D2BA4C', '#B4413C']
+
+def series(report, benchmark):
+    """{label: [results sorted by size]} for one benchmark, one entry per CURVES group"""
+    x_param = SCALING[benchmark]
+    curves = {}
+    for result in report['results']:
+        if result['benchmark'] != benchmark:
+            continue
+        label = ', '.join(f"{name}={result['params'][name]}" for name in CURVES[benchmark])
+        curves.setdefault(label or 'measured', []).append(result)
+    for results in curves.values():
+        results.sort(key=lambda result: result['params'][x_param])
+    return curves
+
+def _hover(result):
+    work = ', '.join(f'{counter} {count:,}' for counter, count in result.get('work', {}).items())
+    return (f"{json.dumps(result['params'])}<br>median {result['seconds']['median'] * 1000:.3f} ms"
+            f"<br>peak {result['peak_bytes'] / 1024:,.0f} KiB<br>{work}")
+
+def build_chart(report, baseline=None, tolerance=0.25):
+    """plotly Figure: latency and peak memory against input size per algorithm"""
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
+    benchmarks = [name for name in SCALING
+                  if any(result['benchmark'] == name for result in report['results'])]
+    regressed = set()
+    if baseline is not None:
+        regressed = {result_key(regression)
+                     for regression in compare_reports(report, baseline, tolerance)}
+
+    fig = make_subplots(rows=2, cols=max(len(benchmarks), 1),
+                        subplot_titles=[TITLES[name] for name in benchmarks],
+                        vertical_spacing=0.12, horizontal_spacing=0.06)
+    for col, benchmark in enumerate(benchmarks, 1):
+        x_param = SCALING[benchmark]
+        baseline_curves = series(baseline, benchmark) if baseline is not None else {}
+        for i, (label, results) in enumerate(series(report, benchmark).items()):
+            color = COLORS[i % len(COLORS)]
+            x = [result['params'][x_param] for result in results]
+            for row, metric in ((1, lambda r: r['seconds']['median'] * 1000),
+                                (2, lambda r: r['peak_bytes'] / 1024)):
+                fig.add_trace(go.Scatter(
+                    x=x, y=[metric(result) for result in results], mode='lines+markers',
+                    name=f'{TITLES[benchmark]} {label}', legendgroup=f'{benchmark}-{label}',
+                    showlegend=row == 1, line=dict(color=color),
+                    hovertext=[_hover(result) for result in results], hoverinfo='text',
+                ), row=row, col=col)
+                previous = baseline_curves.get(label)
+                if previous:
+                    fig.add_trace(go.Scatter(
+                        x=[result['params'][x_param] for result in previous],
+                        y=[metric(result) for result in previous], mode='lines',
+                        name=f'{TITLES[benchmark]} {label} (baseline)',
+                        legendgroup=f'{benchmark}-{label}', showlegend=False,
+                        line=dict(color=color, dash='dash'),
+                    ), row=row, col=col)
+                flagged = [result for result in results if result_key(result) in regressed]
+                if flagged:
+                    fig.add_trace(go.Scatter(
+                        x=[result['params'][x_param] for result in flagged],
+                        y=[metric(result) for result in flagged], mode='markers',
+                        name='regression', showlegend=False,
+                        marker=dict(color='red', symbol='x', size=12),
+                        hovertext=[_hover(result) for result in flagged], hoverinfo='text',
+                    ), row=row, col=col)
+        fig.update_xaxes(type='log', title=x_param, row=2, col=col)
+        fig.update_xaxes(type='log', row=1, col=col)
+        fig.update_yaxes(type='log', row=1, col=col)
+        fig.update_yaxes(type='log', row=2, col=col)
+    fig.update_yaxes(title='median latency (ms)', row=1, col=1)
+    fig.update_yaxes(title='peak memory (KiB)', row=2, col=1)
+
+    meta = report.get('meta', {})
+    fig.update_layout(
+        title=f"AI Algorithms Performance - Murder Game (measured {meta.get('timestamp', '')[:19]}, "
+              f"Python {meta.get('python', '?')})",
+        legend=dict(orientation='h', yanchor='top', y=-0.12, xanchor='center', x=0.5),
+        width=max(len(benchmarks), 1) * 420, height=760,
+    )
+    return fig
+
+def render_chart(png='ai_algorithms_chart.png', svg='ai_algorithms_chart.svg', report=None,
+                 baseline=None, html=None):
+    """Save the dashboard as PNG and (unless svg is None) SVG, optionally as HTML
+
+    Without a report, the quick benchmark suite is run first.
+    """
+    if report is None:
+        report = run_benchmarks(quick=True)
+    fig = build_chart(report, baseline)
+    if png:
+        fig.write_image(png)
+    if svg:
+        fig.write_image(svg, format='svg')
+    if html:
+        fig.write_html(html, include_plotlyjs='cdn')
+    return fig
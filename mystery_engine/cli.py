@@ -0,0 +1,103 @@
+"""Command line entry point: python -m mystery_engine <command> [options]
+
+Only the module behind the chosen command is imported, so e.g. `generate`
+never loads numpy and `--help` loads nothing at all.
+"""
+
+import argparse
+import importlib
+import json
+import sys
+
+def configure_solve(parser):
+    parser.add_argument('--world', default=None,
+                        help="solve a generated world directory instead of the Ashford case")
+    parser.add_argument('--top', type=int, default=3, help="number of hypotheses to list")
+    parser.add_argument('--json', action='store_true', help="print the query result as JSON")
+    parser.set_defaults(run=run_solve)
+
+def run_solve(args):
+    if args.world:
+        from .generator import load_world_csp
+        csp = load_world_csp(args.world)
+    else:
+        from .case import build_case_csp
+        csp = build_case_csp()
+    query = csp.query(k=args.top)
+    solution, score, confidence = query['best']
+    if args.json:
+        print(json.dumps({'solution': solution, 'score': score, 'confidence': confidence,
+                          'max_marginals': query['max_marginals'],
+                          'top_k': query['top_k']}, indent=2, default=float))
+        return
+    if solution is None:
+        print("No assignment satisfies the hard constraints")
+        return
+    print(f"Solution ({confidence:.1%} confidence, {score}/{csp.total_weight} points):")
+    for variable, value in solution.items():
+        print(f"  {variable.capitalize()}: {value}")
+    print("\nSuspect rankings:")
+    for i, (suspect, points) in enumerate(csp.get_suspect_rankings(), 1):
+        print(f"  {i}. {suspect}: {points} points")
+    print("\nTop hypotheses:")
+    for assignment, points in query['top_k']:
+        print(f"  {points} pts: {', '.join(str(value) for value in assignment.values())}")
+
+def configure_export(parser):
+    parser.add_argument('--out', default='.', help="directory to write the tables to")
+    parser.add_argument('--format', choices=['csv', 'jsonl', 'parquet'], default='csv',
+                        help="file format (parquet needs pyarrow)")
+    parser.set_defaults(run=run_export)
+
+def run_export(args):
+    from .export import export_all
+    for path in export_all(args.out, format=args.format):
+        print(f"Wrote {path}")
+
+def configure_chart(parser):
+    parser.add_argument('--png', default='ai_algorithms_chart.png')
+    parser.add_argument('--svg', default=None, help="also save an SVG copy here")
+    parser.add_argument('--html', default=None, help="also save an interactive HTML copy here")
+    parser.add_argument('--report', default=None,
+                        help="benchmark JSON to plot (default: run the quick suite now)")
+    parser.add_argument('--baseline', default=None,
+                        help="benchmark JSON to overlay and flag regressions against")
+    parser.set_defaults(run=run_chart)
+
+def run_chart(args):
+    from .chart import render_chart
+    report = baseline = None
+    if args.report:
+        with open(args.report) as f:
+            report = json.load(f)
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    render_chart(args.png, args.svg, report, baseline, args.html)
+    print(f"Wrote {', '.join(filter(None, [args.png, args.svg, args.html]))}")
+
+# command -> (module with configure_parser, or a local configure function; help)
+COMMANDS = {
+    'solve': (configure_solve, "Solve the case (or a generated world) from its evidence"),
+    'simulate': ('.simulation', "Play many headless games and report aggregate statistics"),
+    'export': (configure_export, "Write the data tables (CSV, JSON Lines or Parquet)"),
+    'chart': (configure_chart, "Render the measured performance dashboard (needs plotly)"),
+    'bench': ('.benchmarks', "Run the benchmark suite and write JSON results"),
+    'generate': ('.generator', "Generate a seeded world on disk"),
+    'serve': ('.server', "Serve the web frontend backed by the Python engine"),
+}
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    parser = argparse.ArgumentParser(prog='python -m mystery_engine',
+                                     description="Ashford Manor murder mystery engine")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    for name, (configure, help_text) in COMMANDS.items():
+        subparser = subparsers.add_parser(name, help=help_text, description=help_text)
+        # Only the selected command's options are needed, so only its module is imported
+        if argv[:1] == [name]:
+            if isinstance(configure, str):
+                configure = importlib.import_module(configure, __package__).configure_parser
+            configure(subparser)
+    args = parser.parse_args(argv)
+    args.run(args)
@@ -0,0 +1,740 @@
+"""Weighted constraint satisfaction over the murder hypotheses"""
+
+from collections import deque
+from itertools import product
+
+import numpy as np
+
+class Constraint:
+    """Declarative constraint: a predicate over assignments plus the variables it reads"""
+    scope = ()
+
+    def __call__(self, assignment):
+        raise NotImplementedError
+
+    def possible(self, assignment, domains):
+        """Could some completion of a partial assignment satisfy this constraint?"""
+        free = [var for var in self.scope if var not in assignment]
+        if not free:
+            return bool(self(assignment))
+        trial = dict(assignment)
+        for values in product(*(domains[var] for var in free)):
+            trial.update(zip(free, values))
+            if self(trial):
+                return True
+        return False
+
+class Equals(Constraint):
+    def __init__(self, variable, value):
+        self.variable = variable
+        self.value = value
+        self.scope = (variable,)
+
+    def __call__(self, assignment):
+        return assignment[self.variable] == self.value
+
+    def possible(self, assignment, domains):
+        if self.variable in assignment:
+            return assignment[self.variable] == self.value
+        return self.value in domains[self.variable]
+
+    def __repr__(self):
+        return f"Equals({self.variable!r}, {self.value!r})"
+
+class NotEquals(Constraint):
+    def __init__(self, variable, value):
+        self.variable = variable
+        self.value = value
+        self.scope = (variable,)
+
+    def __call__(self, assignment):
+        return assignment[self.variable] != self.value
+
+    def possible(self, assignment, domains):
+        if self.variable in assignment:
+            return assignment[self.variable] != self.value
+        return any(value != self.value for value in domains[self.variable])
+
+    def __repr__(self):
+        return f"NotEquals({self.variable!r}, {self.value!r})"
+
+class AllOf(Constraint):
+    """Conjunction of constraints; scope is the union of theirs"""
+
+    def __init__(self, *parts):
+        self.parts = parts
+        scope = []
+        for part in parts:
+            scope.extend(var for var in part.scope if var not in scope)
+        self.scope = tuple(dict.fromkeys(scope))
+
+    def __call__(self, assignment):
+        return all(part(assignment) for part in self.parts)
+
+    def possible(self, assignment, domains):
+        # Optimistic: each part on its own (exact once the scope is assigned)
+        if all(var in assignment for var in self.scope):
+            return self(assignment)
+        return all(part.possible(assignment, domains) for part in self.parts)
+
+    def __repr__(self):
+        return f"AllOf({', '.join(map(repr, self.parts))})"
+
+class Predicate(Constraint):
+    """Wraps a plain function of the assignment; scope defaults to every variable"""
+
+    def __init__(self, func, scope):
+        self.func = func
+        self.scope = tuple(dict.fromkeys(scope))
+
+    def __call__(self, assignment):
+        return self.func(assignment)
+
+class MurderMysteryCSP:
+    # Assignment spaces larger than this are solved by branch-and-bound
+    # instead of a dense score tensor
+    tensor_limit = 2_000_000
+
+    def __init__(self, variables=None, domains=None):
+        # Variables: who, what, where, when
+        self.variables = variables or ['murderer', 'weapon', 'location', 'motive']
+        
+        # Domains: possible values for each variable
+        self.domains = domains or {
+            'murderer': ['Butler', 'Maid', 'Chef', 'Heiress'],
+            'weapon': ['Knife', 'Poison', 'Candlestick', 'Rope'],
+            'location': ['Hall', 'Study', 'Library', 'Dining Room', 'Kitchen', 'Conservatory'],
+            'motive': ['Money', 'Revenge', 'Blackmail', 'Inheritance']
+        }
+        
+        # Constraints based on clues found
+        self.constraints = []
+        
+        # Evidence collected (clue -> constraint impact)
+        self.evidence = {}
+        self.evidence_constraints = {}
+        
+        # Running score state: updated per constraint, queries cached until it changes
+        self.version = 0
+        self.total_weight = 0
+        self._scores = None
+        self._feasible = None
+        self._queries = {}
+        self._watching = None
+        self.search_stats = {'nodes': 0, 'pruned': 0}
+        
+    def add_evidence(self, clue_name, clue_data, constraints=None):
+        """Add evidence which creates constraints
+
+        constraints optionally lists (Constraint, weight) pairs for clues the
+        built-in case does not know, such as those of a generated world.
+        """
+        self.evidence[clue_name] = clue_data
+        first_new = len(self.constraints)
+        if constraints is None:
+            self._add_evidence_constraints(clue_name)
+        else:
+            for constraint, weight in constraints:
+                self.add_constraint(constraint, weight=weight)
+        self.evidence_constraints.setdefault(clue_name, []).extend(self.constraints[first_new:])
+    
+    def retract_evidence(self, clue_name):
+        """Withdraw a clue (e.g. a red herring) and subtract its constraints"""
+        if clue_name not in self.evidence:
+            return False
+        del self.evidence[clue_name]
+        for constraint in self.evidence_constraints.pop(clue_name, []):
+            self.remove_constraint(constraint)
+        return True
+    
+    def evidence_weight(self, clue_name):
+        """Total weight of the constraints a clue contributed (0 if it has none)"""
+        constraints = self.evidence_constraints.get(clue_name, ())
+        return sum(constraint['weight'] for constraint in constraints)
+
+    @staticmethod
+    def clue_constraints(clue_name):
+        """(Constraint, weight) pairs a known clue translates into ([] if unknown)"""
+        
+        # Create constraints based on clues
+        if clue_name == "bloodstained_glove":
+            # Glove belongs to Heiress, increases her suspicion
+            return [(Equals('murderer', 'Heiress'), 8)]
+            
+        elif clue_name == "shattered_wine_glass": 
+            # Glass was broken by Butler (innocent accident)
+            return [(NotEquals('murderer', 'Butler'), 5)]
+            
+        elif clue_name == "suspicious_ledger":
+            # Ledger shows Heiress bribing Chef
+            return [(Equals('murderer', 'Heiress'), 6)]
+            
+        elif clue_name == "missing_knife":
+            # Red herring - knife wasn't the weapon
+            return [(NotEquals('weapon', 'Knife'), 9)]
+            
+        elif clue_name == "poison_analysis":
+            # If poison is confirmed as weapon
+            return [(Equals('weapon', 'Poison'), 10)]
+            
+        elif clue_name == "dining_room_scene":
+            # Murder occurred in dining room
+            return [(Equals('location', 'Dining Room'), 10)]
+            
+        elif clue_name == "inheritance_motive":
+            # Heiress inherits estate
+            return [(AllOf(Equals('murderer', 'Heiress'), Equals('motive', 'Inheritance')), 7)]
+        return []
+    
+    def _add_evidence_constraints(self, clue_name):
+        """Translate a known clue into weighted constraints"""
+        for constraint, weight in self.clue_constraints(clue_name):
+            self.add_constraint(constraint, weight=weight)
+    
+    def add_constraint(self, constraint_func, weight=1, scope=None, hard=False):
+        """Add a weighted constraint
+
+        constraint_func is a Constraint or any function of the assignment;
+        for plain functions, scope names the variables it reads so it can be
+        tabulated over just those domains (None means every variable). Hard
+        constraints must hold: they carry no weight and prune the domains.
+        """
+        if not isinstance(constraint_func, Constraint):
+            constraint_func = Predicate(constraint_func, scope or self.variables)
+        constraint = {'func': constraint_func, 'weight': 0 if hard else weight,
+                      'scope': constraint_func.scope, 'hard': hard}
+        self.constraints.append(constraint)
+        self.total_weight += constraint['weight']
+        if hard:
+            self._feasible = None
+        elif self._scores is not None:
+            self._apply(constraint, 1)
+        self._changed()
+        return constraint
+    
+    def remove_constraint(self, constraint):
+        """Drop a constraint, subtracting only its own contribution"""
+        for i, existing in enumerate(self.constraints):
+            if existing is constraint:
+                del self.constraints[i]
+                break
+        else:
+            return False
+        self.total_weight -= constraint['weight']
+        if constraint.get('hard'):
+            self._feasible = None
+        elif self._scores is not None:
+            self._apply(constraint, -1)
+        self._changed()
+        return True
+    
+    def _apply(self, constraint, sign):
+        weight = constraint['weight']
+        if not isinstance(weight, (int, np.integer)) and self._scores.dtype.kind == 'i':
+            self._scores = self._scores.astype(np.float64)
+        self._scores += (sign * weight) * self.constraint_mask(constraint)
+    
+    def _changed(self):
+        self.version += 1
+        self._watching = None
+        self._queries = {}
+    
+    def shape(self):
+        """Dimensions of the assignment space, one axis per variable"""
+        return tuple(len(self.domains[var]) for var in self.variables)
+    
+    def space_size(self):
+        return int(np.prod(self.shape(), dtype=object))
+    
+    def constraint_mask(self, constraint):
+        """Boolean array over the assignment space, broadcastable (size 1 off-scope)"""
+        if 'mask' not in constraint:
+            scope = constraint['scope'] or self.variables
+            sizes = [len(self.domains[var]) for var in scope]
+            table = np.fromiter(
+                (bool(constraint['func'](dict(zip(scope, values))))
+                 for values in product(*(self.domains[var] for var in scope))),
+                dtype=bool, count=int(np.prod(sizes))).reshape(sizes)
+            # Reorder the scope axes to variable order, then add singleton axes
+            axes = [self.variables.index(var) for var in scope]
+            table = np.transpose(table, np.argsort(axes))
+            constraint['mask'] = table.reshape(
+                [len(self.domains[var]) if var in scope else 1 for var in self.variables])
+        return constraint['mask']
+    
+    def score_tensor(self):
+        """Weighted constraint satisfaction for every assignment, as one array
+
+        The tensor is kept up to date by add_constraint/remove_constraint and
+        only rebuilt from scratch if the domains have been changed.
+        """
+        if self._scores is None or self._scores.shape != self.shape():
+            if self._scores is not None:
+                for constraint in self.constraints:
+                    constraint.pop('mask', None)
+                self._feasible = None
+                self._changed()
+            self._scores = np.zeros(self.shape(), dtype=np.int64)
+            for constraint in self.constraints:
+                if not constraint['hard']:
+                    self._apply(constraint, 1)
+        return self._scores
+    
+    def feasible_mask(self):
+        """Assignments satisfying every hard constraint (None when there are none)"""
+        if self._feasible is None:
+            hard = [c for c in self.constraints if c['hard']]
+            if not hard:
+                return None
+            feasible = np.ones(self.shape(), dtype=bool)
+            for constraint in hard:
+                feasible &= self.constraint_mask(constraint)
+            self._feasible = feasible
+        return self._feasible
+    
+    def _ranked_scores(self):
+        """Score tensor with infeasible assignments pushed below every real score"""
+        scores = self.score_tensor()
+        feasible = self.feasible_mask()
+        if feasible is None:
+            return scores, None
+        floor = np.iinfo(scores.dtype).min if scores.dtype.kind == 'i' else -np.inf
+        return np.where(feasible, scores, floor), floor
+    
+    def assignment_at(self, index):
+        """Assignment dict for a multi-dimensional index into the score tensor"""
+        return {var: self.domains[var][i] for var, i in zip(self.variables, index)}
+    
+    def variable_maxima(self, scores=None):
+        """Best achievable score for each value of each variable
+
+        Values that no assignment satisfying the hard constraints can take
+        map to -inf.
+        """
+        if scores is None:
+            return self.query()['max_marginals']
+        scores, floor = scores
+        maxima = {}
+        for axis, var in enumerate(self.variables):
+            others = tuple(a for a in range(scores.ndim) if a != axis)
+            best = scores.max(axis=others) if others else scores
+            maxima[var] = {value: (float('-inf') if floor is not None and best[i] == floor else best[i].item())
+                           for i, value in enumerate(self.domains[var])}
+        return maxima
+    
+    def evaluate_assignment(self, assignment):
+        """Evaluate how well an assignment satisfies constraints"""
+        total_score = 0
+        max_score = 0
+        
+        for constraint in self.constraints:
+            max_score += constraint['weight']
+            if constraint['func'](assignment):
+                total_score += constraint['weight']
+                
+        return total_score, max_score
+    
+    def find_best_solution(self):
+        """Find the assignment that best satisfies all constraints"""
+        assignment, best_score, best_confidence = self.query()['best']
+        return (dict(assignment) if assignment else None), best_score, best_confidence
+    
+    def query(self, k=5, temperature=1.0):
+        """Solution, per-value marginals and top-k hypotheses from one pass over the scores
+
+        Returns a dict with:
+          best          -- (assignment, score, confidence), as find_best_solution
+          max_marginals -- {var: {value: best score with var = value}}
+          confidence    -- max_marginals divided by the total evidence weight
+          marginals     -- {var: {value: probability}}, soft counts where every
+                           assignment weighs exp(score / temperature)
+          top_k         -- the k best complete hypotheses as (assignment, score)
+        The result is cached until the evidence changes. Spaces above
+        tensor_limit are answered by branch-and-bound: marginals then come
+        from the max-marginals and top_k holds only the best hypothesis.
+        search_stats['nodes'] counts the complete assignments scored by the
+        tensor pass, or the search nodes of branch-and-bound.
+        """
+        key = (k, temperature)
+        if key not in self._queries:
+            if self.space_size() > self.tensor_limit:
+                self._queries[key] = self._query_branch_and_bound(temperature)
+            else:
+                self._queries[key] = self._query_tensor(k, temperature)
+        return self._queries[key]
+    
+    def _query_tensor(self, k, temperature):
+        scores, floor = self._ranked_scores()
+        flat = scores.ravel()
+        self.search_stats = {'nodes': flat.size, 'pruned': 0}
+        total = self.total_weight
+        
+        # Max-marginals (and the best solution) by max reductions
+        max_marginals = self.variable_maxima((scores, floor))
+        # argmax returns the first maximum in domain order, like the nested loops did
+        best_flat = int(np.argmax(flat))
+        if floor is not None and flat[best_flat] == floor:
+            best = (None, 0, 0)
+        else:
+            best_score = flat[best_flat].item()
+            best = (self.assignment_at(np.unravel_index(best_flat, scores.shape)), best_score,
+                    best_score / total if total > 0 else 0)
+        
+        # Soft counts: normalized exp(score / T), infeasible assignments excluded
+        if best[0] is None:
+            weights = np.zeros(scores.shape)
+        else:
+            weights = np.exp((scores.astype(float) - best[1]) / temperature)
+            if floor is not None:
+                weights[scores == floor] = 0.0
+        normalizer = weights.sum()
+        marginals = {}
+        for axis, var in enumerate(self.variables):
+            others = tuple(a for a in range(scores.ndim) if a != axis)
+            mass = weights.sum(axis=others) if others else weights
+            marginals[var] = {value: (mass[i] / normalizer).item() if normalizer > 0 else 0.0
+                              for i, value in enumerate(self.domains[var])}
+        
+        # Top-k by partial selection, then ordered by score and domain order
+        k = min(k, flat.size)
+        negated = -flat.astype(float)
+        if floor is not None:
+            negated[flat == floor] = np.inf
+        if k < flat.size:
+            # Ties at the cutoff go to the earliest assignments, not argpartition's pick
+            cutoff = np.partition(negated, k - 1)[k - 1]
+            better = np.flatnonzero(negated < cutoff)
+            candidates = np.concatenate((better, np.flatnonzero(negated == cutoff)[:k - better.size]))
+        else:
+            candidates = np.arange(flat.size)
+        candidates = sorted(candidates.tolist(), key=lambda i: (negated[i], i))
+        top_k = [(self.assignment_at(np.unravel_index(i, scores.shape)), flat[i].item())
+                 for i in candidates if floor is None or flat[i] != floor]
+        
+        return {'best': best, 'max_marginals': max_marginals,
+                'confidence': self._normalized(max_marginals),
+                'marginals': marginals, 'top_k': top_k}
+    
+    def _query_branch_and_bound(self, temperature):
+        best = self.solve_branch_and_bound()
+        totals = dict(self.search_stats)
+        max_marginals = {var: self._branch_and_bound_maxima(var, totals) for var in self.variables}
+        self.search_stats = totals
+        marginals = {}
+        for var, maxima in max_marginals.items():
+            peak = max(maxima.values())
+            weights = {value: (np.exp((score - peak) / temperature) if score != float('-inf') else 0.0)
+                       for value, score in maxima.items()}
+            normalizer = sum(weights.values())
+            marginals[var] = {value: (float(weight / normalizer) if normalizer > 0 else 0.0)
+                              for value, weight in weights.items()}
+        return {'best': best, 'max_marginals': max_marginals,
+                'confidence': self._normalized(max_marginals),
+                'marginals': marginals, 'top_k': [best[:2]] if best[0] is not None else []}
+    
+    def _normalized(self, max_marginals):
+        total = self.total_weight
+        return {var: {value: (max(score, 0) / total if total > 0 else 0)
+                      for value, score in maxima.items()}
+                for var, maxima in max_marginals.items()}
+    
+    # Rows x assignments scored per block by counterfactuals
+    counterfactual_block = 1 << 22
+
+    def counterfactuals(self, candidates, temperature=1.0):
+        """What adding each candidate's evidence would do, for all candidates in one pass
+
+        candidates maps a label to the (Constraint, weight) pairs that piece
+        of evidence would add (see clue_constraints). Instead of re-solving
+        once per candidate, each distinct set of constraints becomes one row
+        of a (rows x assignments) block: the flattened score tensor plus its
+        weighted constraint masks. Every row's best assignment and marginals
+        then come from row-wise reductions over the whole block.
+
+        Returns {label: result} with, for each candidate:
+          solution, score, confidence -- the best hypothesis with it, as query()['best']
+          changes_solution            -- whether that hypothesis differs from now
+          confidence_gain             -- its confidence minus the current one
+          shift                       -- largest total-variation distance between a
+                                         variable's marginals now and with it (0 to 1)
+        Spaces above tensor_limit fall back to adding, querying and removing
+        each candidate's constraints in turn.
+        """
+        current = self.query(temperature=temperature)
+        if self.space_size() > self.tensor_limit:
+            return {label: self._counterfactual_by_search(pairs, current, temperature)
+                    for label, pairs in candidates.items()}
+
+        # Distinct constraints (by repr) as flat masks; candidates with equal evidence share a row
+        columns, masks = {}, []
+        rows, row_of = {}, {}
+        for label, pairs in candidates.items():
+            weights = {}
+            for constraint, weight in pairs:
+                key = repr(constraint)
+                if key not in columns:
+                    columns[key] = len(masks)
+                    masks.append(np.broadcast_to(
+                        self.constraint_mask({'func': constraint, 'scope': constraint.scope}),
+                        self.shape()).ravel())
+                weights[columns[key]] = weights.get(columns[key], 0) + weight
+            signature = tuple(sorted(weights.items()))
+            row_of[label] = rows.setdefault(signature, len(rows))
+
+        scores = self.score_tensor()
+        shape = self.shape()
+        flat = scores.ravel().astype(float)
+        feasible = self.feasible_mask()
+        if feasible is not None:
+            flat[~feasible.ravel()] = -np.inf
+        integral = scores.dtype.kind == 'i' and all(
+            isinstance(weight, (int, np.integer)) for signature in rows for _, weight in signature)
+        now = [np.array([current['marginals'][var][value] for value in self.domains[var]])
+               for var in self.variables]
+        # Per axis: (assignments before it, its domain, assignments after it)
+        splits = [(int(np.prod(shape[:axis])), size, int(np.prod(shape[axis + 1:])))
+                  for axis, size in enumerate(shape)]
+        signatures = list(rows)
+        best_flat = np.zeros(len(signatures), dtype=np.intp)
+        best_scores = np.zeros(len(signatures))
+        shifts = np.zeros(len(signatures))
+        step = max(1, self.counterfactual_block // flat.size)
+        for first in range(0, len(signatures), step):
+            block_rows = signatures[first:first + step]
+            block = np.tile(flat, (len(block_rows), 1))
+            for i, signature in enumerate(block_rows):
+                for column, weight in signature:
+                    block[i] += weight * masks[column]
+            span = slice(first, first + len(block_rows))
+            best_flat[span] = block.argmax(axis=1)
+            best_scores[span] = block[np.arange(len(block_rows)), best_flat[span]]
+            if not np.isfinite(best_scores[span]).all():
+                continue  # Nothing feasible: no marginals to compare
+            # Row-normalized Boltzmann weights, computed in place
+            block -= best_scores[span, None]
+            block /= temperature
+            np.exp(block, out=block)
+            block /= block.sum(axis=1, keepdims=True)
+            for (before, size, after), marginal in zip(splits, now):
+                counter = np.einsum('ibja->ij', block.reshape(len(block_rows), before, size, after))
+                shifts[span] = np.maximum(shifts[span],
+                                          0.5 * np.abs(counter - marginal).sum(axis=1))
+        self.search_stats = {'nodes': len(signatures) * flat.size, 'pruned': 0}
+
+        now_solution, _, now_confidence = current['best']
+        outcomes = []
+        for row, signature in enumerate(signatures):
+            score = best_scores[row].item()
+            total = self.total_weight + sum(weight for _, weight in signature)
+            if not np.isfinite(score):
+                solution, score, confidence = None, 0, 0
+            else:
+                solution = self.assignment_at(np.unravel_index(best_flat[row], shape))
+                score = int(score) if integral else score
+                confidence = score / total if total > 0 else 0
+            outcomes.append({'solution': solution, 'score': score, 'confidence': confidence,
+                             'changes_solution': solution != now_solution,
+                             'confidence_gain': confidence - now_confidence,
+                             'shift': shifts[row].item()})
+        return {label: dict(outcomes[row]) for label, row in row_of.items()}
+    
+    def _counterfactual_by_search(self, pairs, current, temperature):
+        added = [self.add_constraint(constraint, weight=weight) for constraint, weight in pairs]
+        try:
+            query = self.query(temperature=temperature)
+        finally:
+            for constraint in added:
+                self.remove_constraint(constraint)
+        solution, score, confidence = query['best']
+        shift = max((0.5 * sum(abs(marginal[value] - current['marginals'][var][value])
+                               for value in marginal)
+                     for var, marginal in query['marginals'].items()), default=0.0)
+        return {'solution': solution, 'score': score, 'confidence': confidence,
+                'changes_solution': solution != current['best'][0],
+                'confidence_gain': confidence - current['best'][2], 'shift': shift}
+    
+    def get_suspect_rankings(self):
+        """Rank suspects based on evidence"""
+        suspect_scores = self.variable_maxima()['murderer']
+        
+        # Sort suspects by score (highest = most suspicious)
+        ranked_suspects = sorted(suspect_scores.items(), 
+                               key=lambda x: x[1], reverse=True)
+        return ranked_suspects
+    
+    def propagate(self, domains, constraints=None):
+        """Generalized arc consistency over the hard constraints, pruning domains in place
+
+        Returns False if some domain is wiped out. Constraints whose other
+        variables span too many combinations are left to be checked once
+        their scope is fully assigned.
+        """
+        hard = [c for c in (self.constraints if constraints is None else constraints) if c['hard']]
+        if not hard:
+            return True
+        if self._watching is None:
+            self._watching = {}
+            for constraint in self.constraints:
+                if constraint['hard']:
+                    for var in constraint['scope']:
+                        self._watching.setdefault(var, []).append(constraint)
+        watching = self._watching
+        queue = deque(hard)
+        queued = set(map(id, hard))
+        while queue:
+            constraint = queue.popleft()
+            queued.discard(id(constraint))
+            func, scope = constraint['func'], constraint['scope']
+            for var in scope:
+                others = [other for other in scope if other != var]
+                if np.prod([len(domains[o]) for o in others], dtype=object) > 10_000:
+                    continue
+                supported = []
+                for value in domains[var]:
+                    trial = {var: value}
+                    for values in product(*(domains[o] for o in others)):
+                        trial.update(zip(others, values))
+                        if func(trial):
+                            supported.append(value)
+                            break
+                if len(supported) < len(domains[var]):
+                    if not supported:
+                        return False
+                    domains[var] = supported
+                    for neighbor in watching.get(var, []):
+                        if neighbor is not constraint and id(neighbor) not in queued:
+                            queue.append(neighbor)
+                            queued.add(id(neighbor))
+        return True
+    
+    def solve_branch_and_bound(self, domains=None):
+        """Weighted branch-and-bound over the variables, for spaces too big to tabulate
+
+        Hard constraints are kept arc consistent after every assignment.
+        At each node, every constraint with a single free variable left is
+        folded into a per-value score table for that variable. Each wider
+        soft constraint is charged to one of its free variables, counting
+        for the values that still leave it satisfiable, so the bound is the
+        best value per free variable and conflicting clues cannot all be
+        counted at once. Variables
+        still coupled by a wider constraint are branched on first (pinned,
+        then most constrained, then smallest domain), values best score
+        first. Once nothing couples the free variables they are completed
+        directly with their best values.
+        """
+        domains = {var: list((domains or self.domains)[var]) for var in self.variables}
+        self.search_stats = {'nodes': 0, 'pruned': 0}
+        if not self.propagate(domains):
+            return None, 0, 0
+        
+        unary = {var: {value: 0 for value in self.domains[var]} for var in self.variables}
+        wide = []
+        for constraint in self.constraints:
+            if len(constraint['scope']) == 1 and not constraint['hard']:
+                var = constraint['scope'][0]
+                for value in self.domains[var]:
+                    if constraint['func']({var: value}):
+                        unary[var][value] += constraint['weight']
+            else:
+                wide.append(constraint)
+        touching = {var: [] for var in self.variables}
+        for constraint in wide:
+            for var in constraint['scope']:
+                touching[var].append(constraint)
+        
+        best = {'assignment': None, 'score': float('-inf')}
+        assignment = {}
+        
+        def fold(domains, free):
+            """Per-value realized and optimistic scores for each free variable, plus coupled vars"""
+            scores = {var: {value: unary[var][value] for value in domains[var]} for var in free}
+            potential = []
+            coupled = set()
+            for constraint in wide:
+                unassigned = [var for var in constraint['scope'] if var not in assignment]
+                if not unassigned:
+                    continue
+                if len(unassigned) == 1:
+                    var = unassigned[0]
+                    table = scores[var]
+                    for value in list(table):
+                        assignment[var] = value
+                        satisfied = constraint['func'](assignment)
+                        if constraint['hard']:
+                            if not satisfied:
+                                del table[value]
+                        elif satisfied:
+                            table[value] += constraint['weight']
+                    del assignment[var]
+                    continue
+                coupled.update(unassigned)
+                if not constraint['hard'] and constraint['weight'] > 0:
+                    potential.append((unassigned[0], constraint))
+            optimistic = {var: dict(table) for var, table in scores.items()}
+            for var, constraint in potential:
+                table = optimistic[var]
+                for value in table:
+                    assignment[var] = value
+                    if constraint['func'].possible(assignment, domains):
+                        table[value] += constraint['weight']
+                del assignment[var]
+            return scores, optimistic, coupled
+        
+        def search(domains, gained):
+            self.search_stats['nodes'] += 1
+            free = [var for var in self.variables if var not in assignment]
+            if not free:
+                if gained > best['score']:
+                    best['assignment'], best['score'] = dict(assignment), gained
+                return
+            scores, optimistic, coupled = fold(domains, free)
+            if not all(scores[var] for var in free):
+                return
+            bound = gained + sum(max(optimistic[var].values()) for var in free)
+            if bound <= best['score']:
+                self.search_stats['pruned'] += 1
+                return
+            if not coupled:
+                # Each free variable independently takes its best value
+                for var in free:
+                    assignment[var] = max(scores[var], key=scores[var].get)
+                best['assignment'], best['score'] = dict(assignment), bound
+                for var in free:
+                    del assignment[var]
+                return
+            var = min(coupled, key=lambda v: (len(domains[v]) > 1, -len(touching[v]),
+                                              len(domains[v]), self.variables.index(v)))
+            table = optimistic[var]
+            values = sorted(table, key=lambda value: -table[value])
+            # Bound without var's own best score; values are sorted, so once
+            # one value cannot beat the incumbent none of the rest can
+            rest = bound - table[values[0]]
+            for position, value in enumerate(values):
+                if rest + table[value] <= best['score']:
+                    self.search_stats['pruned'] += len(values) - position
+                    break
+                assignment[var] = value
+                child_domains = dict(domains)
+                child_domains[var] = [value]
+                if self.propagate(child_domains, touching[var]):
+                    search(child_domains, gained + scores[var][value])
+                del assignment[var]
+        
+        search(domains, 0)
+        if best['assignment'] is None:
+            return None, 0, 0
+        score = best['score']
+        return best['assignment'], score, (score / self.total_weight if self.total_weight > 0 else 0)
+    
+    def _branch_and_bound_maxima(self, var, totals=None):
+        """Best score with var pinned to each value in turn (search_stats summed into totals)"""
+        maxima = {}
+        for value in self.domains[var]:
+            pinned = dict(self.domains)
+            pinned[var] = [value]
+            assignment, score, _ = self.solve_branch_and_bound(pinned)
+            if totals is not None:
+                for counter, count in self.search_stats.items():
+                    totals[counter] += count
+            maxima[value] = score if assignment is not None else float('-inf')
+        return maxima
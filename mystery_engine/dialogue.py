@@ -0,0 +1,819 @@
+"""Dialogue trees and the minimax interrogation search"""
+
+from array import array
+from collections import deque
+from itertools import islice
+import json
+import math
+import os
+import random
+import time
+
+# Transposition table bound flags
+EXACT, LOWER_BOUND, UPPER_BOUND = 0, 1, 2
+
+# Compiled node flags for the keywords evaluate_dialogue_outcome looks at
+MENTIONS_TRUTH, MENTIONS_DEFLECT = 1, 2
+
+# Nodes between clock checks in a budgeted search (well under a millisecond of work)
+BUDGET_CHECK_INTERVAL = 256
+
+class _BudgetExhausted(Exception):
+    """Unwinds a budgeted search; the current iteration's result is discarded"""
+
+class DialogueNode:
+    __slots__ = ('speaker', 'question', 'responses', 'is_terminal', 'value', 'children', 'key')
+
+    def __init__(self, speaker, question, responses=None, is_terminal=False, value=0, key=None):
+        self.speaker = speaker  # 'detective' or suspect name
+        self.question = question
+        self.responses = responses or []  # List of possible responses
+        self.is_terminal = is_terminal
+        self.value = value  # Utility value for terminal nodes
+        self.children = []
+        self.key = key  # Optional stable id; shared follow-ups reuse the same key
+
+    def search_key(self):
+        """Identity used by the transposition table (the node itself if no key)"""
+        return self if self.key is None else self.key
+
+class CompiledDialogueTree:
+    """Flat, array-backed dialogue tree compiled from a dialogue file
+
+    Node i is described by parallel arrays: speaker/text ids into interned
+    string tables, its utility value, a terminal flag, keyword flags used by
+    the evaluation, and its children child_index[child_offsets[i]:child_offsets[i + 1]].
+    Node 0 is the root. Shared follow-ups compile to a single node, so the
+    tree stays a DAG.
+    """
+
+    __slots__ = ('suspect', 'node_ids', 'speakers', 'texts', 'speaker', 'text', 'values',
+                 'terminal', 'flags', 'child_offsets', 'child_index')
+
+    def __init__(self, suspect):
+        self.suspect = suspect
+        self.node_ids = []
+        self.speakers = []
+        self.texts = []
+        self.speaker = array('H')
+        self.text = array('i')
+        self.values = array('d')
+        self.terminal = bytearray()
+        self.flags = bytearray()
+        self.child_offsets = array('i', [0])
+        self.child_index = array('i')
+
+    def __len__(self):
+        return len(self.values)
+
+    def children(self, node):
+        return self.child_index[self.child_offsets[node]:self.child_offsets[node + 1]]
+
+    def node_text(self, node):
+        return self.texts[self.text[node]]
+
+    def node_speaker(self, node):
+        return self.speakers[self.speaker[node]]
+
+def compile_dialogue_tree(document):
+    """Compile a parsed dialogue document ({'suspect', 'root', 'nodes'}) into arrays"""
+    nodes = {node['id']: node for node in document['nodes']}
+    root = document.get('root', document['nodes'][0]['id'])
+    if root not in nodes:
+        raise ValueError(f"Dialogue root {root!r} is not a node")
+
+    # Number nodes breadth-first from the root so children sit close together
+    index = {root: 0}
+    order = [root]
+    queue = deque([root])
+    while queue:
+        for child in nodes[queue.popleft()].get('children', []):
+            if child not in nodes:
+                raise ValueError(f"Dialogue node {child!r} is referenced but not defined")
+            if child not in index:
+                index[child] = len(order)
+                order.append(child)
+                queue.append(child)
+
+    tree = CompiledDialogueTree(document.get('suspect'))
+    speaker_ids, text_ids = {}, {}
+    for node_id in order:
+        node = nodes[node_id]
+        speaker, text = node.get('speaker', ''), node.get('text', '')
+        if speaker not in speaker_ids:
+            speaker_ids[speaker] = len(tree.speakers)
+            tree.speakers.append(speaker)
+        if text not in text_ids:
+            text_ids[text] = len(tree.texts)
+            tree.texts.append(text)
+        lowered = text.lower()
+        tree.node_ids.append(node_id)
+        tree.speaker.append(speaker_ids[speaker])
+        tree.text.append(text_ids[text])
+        tree.values.append(node.get('value', 0))
+        tree.terminal.append(1 if node.get('terminal', False) else 0)
+        tree.flags.append((MENTIONS_TRUTH if 'truth' in lowered else 0) |
+                          (MENTIONS_DEFLECT if 'deflect' in lowered else 0))
+        tree.child_index.extend(index[child] for child in node.get('children', []))
+        tree.child_offsets.append(len(tree.child_index))
+    return tree
+
+def dialogue_tree_to_document(root, suspect):
+    """Serialize a DialogueNode tree/DAG into the dialogue file format"""
+    ids = {}
+    nodes = []
+    queue = deque([root])
+    ids[root.search_key()] = 'n0'
+    while queue:
+        node = queue.popleft()
+        entry = {'id': ids[node.search_key()], 'speaker': node.speaker, 'text': node.question}
+        if node.is_terminal:
+            entry['terminal'] = True
+        if node.value:
+            entry['value'] = node.value
+        if node.children:
+            entry['children'] = []
+            for child in node.children:
+                if child.search_key() not in ids:
+                    ids[child.search_key()] = f"n{len(ids)}"
+                    queue.append(child)
+                entry['children'].append(ids[child.search_key()])
+        nodes.append(entry)
+    return {'suspect': suspect, 'root': 'n0', 'nodes': nodes}
+
+class DialogueLibrary:
+    """Dialogue files for every suspect, loaded and compiled only when first needed"""
+
+    def __init__(self, directory='dialogues'):
+        self.directory = directory
+        self.trees = {}
+
+    def path_for(self, suspect):
+        return os.path.join(self.directory, suspect.lower().replace(' ', '_') + '.json')
+
+    def has_tree(self, suspect):
+        return suspect in self.trees or os.path.exists(self.path_for(suspect))
+
+    def get(self, suspect):
+        """Compiled tree for suspect (loads <directory>/<suspect>.json once)"""
+        tree = self.trees.get(suspect)
+        if tree is None:
+            with open(self.path_for(suspect)) as f:
+                tree = compile_dialogue_tree(json.load(f))
+            if tree.suspect is None:
+                tree.suspect = suspect
+            self.trees[suspect] = tree
+        return tree
+
+    def unload(self, suspect):
+        self.trees.pop(suspect, None)
+
+class DialogueSystem:
+    # Entries each search table may hold; they are caches, so a full one sheds its older half
+    table_limit = 1_000_000
+
+    def __init__(self, suspects=None):
+        # Define the suspects from the user's description (or e.g. loaders.read_suspects_csv)
+        self.suspects = suspects or {
+            'Butler': {
+                'name': 'James',
+                'personality': 'Calm, polite, but evasive',
+                'guilty': False,
+                'truth_value': 5,  # How truthful they are (1-10)
+                'suspicion_level': 3  # Current suspicion (1-10)
+            },
+            'Maid': {
+                'name': 'Clara', 
+                'personality': 'Nervous and chatty',
+                'guilty': False,
+                'truth_value': 8,
+                'suspicion_level': 2
+            },
+            'Chef': {
+                'name': 'Marco',
+                'personality': 'Defensive and grumpy', 
+                'guilty': False,
+                'truth_value': 6,
+                'suspicion_level': 4
+            },
+            'Heiress': {
+                'name': 'Sophia',
+                'personality': 'Elegant, clever, manipulative',
+                'guilty': True,  # The actual murderer
+                'truth_value': 2,  # Very untruthful
+                'suspicion_level': 1  # Initially low suspicion
+            }
+        }
+        
+        # Search tables shared across calls: transpositions, move ordering, leaf scores
+        # (each capped at table_limit entries)
+        self.transposition_table = {}
+        self.history_scores = {}
+        self.killer_moves = {}
+        self.evaluation_cache = {}
+        self.search_stats = self._empty_stats()
+        # Anytime search budget; minimax_compiled checks it once nodes_searched reaches _check_at
+        self._check_at = float('inf')
+        self._deadline = self._node_limit = None
+        self._horizon_reached = False
+        # Root bound published by other searches (see ParallelDialogueSearch), polled at
+        # the same checks; it caps every window as alpha floor or beta ceiling
+        self._shared_bound = None
+        self._root_maximizing = True
+        self._alpha_floor, self._beta_ceiling = float('-inf'), float('inf')
+    
+    @staticmethod
+    def _empty_stats():
+        return {'nodes_searched': 0, 'nodes_pruned': 0, 'tt_hits': 0, 'evaluations': 0}
+    
+    def _remember(self, table, key, value):
+        """table[key] = value, first dropping the older half of a table at table_limit"""
+        if len(table) >= self.table_limit:
+            for stale in list(islice(table, len(table) // 2)):
+                del table[stale]
+        table[key] = value
+    
+    def clear_search_tables(self):
+        """Forget cached search results (e.g. after a suspect's profile changes)"""
+        self.transposition_table.clear()
+        self.history_scores.clear()
+        self.killer_moves.clear()
+        self.evaluation_cache.clear()
+    
+    def search(self, root, depth, suspect_name, maximizing_player=True):
+        """Full-window search from root; search_stats describe this call only"""
+        self.search_stats = self._empty_stats()
+        return self.minimax_with_pruning(root, depth, maximizing_player,
+                                         float('-inf'), float('inf'), suspect_name)
+    
+    def order_children(self, children, depth, key_of=DialogueNode.search_key):
+        """Killer moves first, then by history score (stable for ties)"""
+        if len(children) < 2:
+            return children
+        killers = self.killer_moves.get(depth, ())
+        history = self.history_scores
+        return sorted(children, key=lambda child: (
+            key_of(child) not in killers,
+            -history.get(key_of(child), 0)))
+    
+    def record_cutoff(self, child_key, depth):
+        """Reward a child that caused a beta/alpha cutoff"""
+        self._remember(self.history_scores, child_key,
+                       self.history_scores.get(child_key, 0) + depth * depth)
+        killers = self.killer_moves.get(depth, ())
+        if child_key not in killers:
+            self.killer_moves[depth] = (child_key,) + killers[:1]
+    
+    def minimax_with_pruning(self, node, depth, maximizing_player, alpha, beta, suspect_name):
+        """
+        Minimax with alpha-beta pruning for dialogue optimization
+        Detective wants to maximize information gain (find contradictions)
+        Suspect wants to minimize suspicion 
+        
+        Shared follow-up nodes are looked up in a transposition table with
+        exact/lower/upper bound flags, and children are tried killer and
+        history moves first so cutoffs happen as early as possible.
+        """
+        stats = self.search_stats
+        stats['nodes_searched'] += 1
+        node_key = node.search_key()
+        
+        if depth == 0 or node.is_terminal:
+            cache_key = (node_key, suspect_name)
+            if cache_key not in self.evaluation_cache:
+                stats['evaluations'] += 1
+                self._remember(self.evaluation_cache, cache_key,
+                               self.evaluate_dialogue_outcome(node, suspect_name))
+            return self.evaluation_cache[cache_key]
+        
+        tt_key = (node_key, suspect_name, depth, maximizing_player)
+        entry = self.transposition_table.get(tt_key)
+        if entry is not None:
+            flag, value = entry
+            if flag == EXACT:
+                stats['tt_hits'] += 1
+                return value
+            if flag == LOWER_BOUND:
+                alpha = max(alpha, value)
+            else:
+                beta = min(beta, value)
+            if beta <= alpha:
+                stats['tt_hits'] += 1
+                return value
+        alpha_orig, beta_orig = alpha, beta
+        
+        children = self.order_children(node.children, depth)
+        if maximizing_player:  # Detective's turn
+            best = float('-inf')
+            for index, child in enumerate(children):
+                eval_score = self.minimax_with_pruning(child, depth-1, False, alpha, beta, suspect_name)
+                best = max(best, eval_score)
+                alpha = max(alpha, eval_score)
+                if beta <= alpha:
+                    stats['nodes_pruned'] += len(children) - index - 1
+                    self.record_cutoff(child.search_key(), depth)
+                    break  # Alpha-beta pruning
+        else:  # Suspect's turn
+            best = float('inf')
+            for index, child in enumerate(children):
+                eval_score = self.minimax_with_pruning(child, depth-1, True, alpha, beta, suspect_name)
+                best = min(best, eval_score)
+                beta = min(beta, eval_score)
+                if beta <= alpha:
+                    stats['nodes_pruned'] += len(children) - index - 1
+                    self.record_cutoff(child.search_key(), depth)
+                    break  # Alpha-beta pruning
+        
+        if best <= alpha_orig:
+            flag = UPPER_BOUND
+        elif best >= beta_orig:
+            flag = LOWER_BOUND
+        else:
+            flag = EXACT
+        self._remember(self.transposition_table, tt_key, (flag, best))
+        return best
+    
+    def search_compiled(self, tree, depth, suspect_name, maximizing_player=True):
+        """Full-window search over a CompiledDialogueTree from its root"""
+        self.search_stats = self._empty_stats()
+        return self.minimax_compiled(tree, 0, depth, maximizing_player,
+                                     float('-inf'), float('inf'), suspect_name)
+    
+    def minimax_compiled(self, tree, node, depth, maximizing_player, alpha, beta, suspect_name):
+        """minimax_with_pruning over the array form; node is an index into tree
+
+        Transposition entries also keep the best child, which is how
+        search_anytime reads back its principal variation, and whether the
+        depth limit cut their subtree short, so a search answered from the
+        table still knows if it has exhausted the tree.
+        """
+        stats = self.search_stats
+        stats['nodes_searched'] += 1
+        if stats['nodes_searched'] >= self._check_at:
+            self._check_budget()
+        
+        if depth == 0 or tree.terminal[node]:
+            if depth == 0 and not tree.terminal[node]:
+                self._horizon_reached = True
+            cache_key = (tree, node, suspect_name)
+            if cache_key not in self.evaluation_cache:
+                stats['evaluations'] += 1
+                self._remember(self.evaluation_cache, cache_key,
+                               self.evaluate_compiled(tree, node, suspect_name))
+            return self.evaluation_cache[cache_key]
+        
+        if alpha < self._alpha_floor:
+            alpha = self._alpha_floor
+        if beta > self._beta_ceiling:
+            beta = self._beta_ceiling
+        tt_key = (tree, node, suspect_name, depth, maximizing_player)
+        entry = self.transposition_table.get(tt_key)
+        if entry is not None:
+            flag, value, _, horizon = entry
+            if flag == EXACT:
+                stats['tt_hits'] += 1
+                if horizon:
+                    self._horizon_reached = True
+                return value
+            if flag == LOWER_BOUND:
+                alpha = max(alpha, value)
+            else:
+                beta = min(beta, value)
+            if beta <= alpha:
+                stats['tt_hits'] += 1
+                if horizon:
+                    self._horizon_reached = True
+                return value
+        alpha_orig, beta_orig = alpha, beta
+        # Whether this subtree was cut off by the depth limit is kept with its entry
+        reached, self._horizon_reached = self._horizon_reached, False
+        
+        children = self.order_children(tree.children(node), depth, lambda child: (tree, child))
+        best_child = None
+        if maximizing_player:
+            best = float('-inf')
+            for index, child in enumerate(children):
+                eval_score = self.minimax_compiled(tree, child, depth-1, False, alpha, beta, suspect_name)
+                if best_child is None or eval_score > best:
+                    best, best_child = eval_score, child
+                alpha = max(alpha, eval_score)
+                if beta <= alpha:
+                    stats['nodes_pruned'] += len(children) - index - 1
+                    self.record_cutoff((tree, child), depth)
+                    break
+        else:
+            best = float('inf')
+            for index, child in enumerate(children):
+                eval_score = self.minimax_compiled(tree, child, depth-1, True, alpha, beta, suspect_name)
+                if best_child is None or eval_score < best:
+                    best, best_child = eval_score, child
+                beta = min(beta, eval_score)
+                if beta <= alpha:
+                    stats['nodes_pruned'] += len(children) - index - 1
+                    self.record_cutoff((tree, child), depth)
+                    break
+        
+        # A shared bound that tightened mid-node narrowed the window the children saw
+        if best <= max(alpha_orig, self._alpha_floor):
+            flag = UPPER_BOUND
+        elif best >= min(beta_orig, self._beta_ceiling):
+            flag = LOWER_BOUND
+        else:
+            flag = EXACT
+        horizon = self._horizon_reached
+        self._remember(self.transposition_table, tt_key, (flag, best, best_child, horizon))
+        self._horizon_reached = reached or horizon
+        return best
+    
+    def search_anytime(self, tree, suspect_name, time_limit=None, node_limit=None,
+                       max_depth=None, maximizing_player=True, method='alphabeta', seed=None):
+        """Best move at the root of a CompiledDialogueTree within a time and/or node budget
+
+        method 'alphabeta' deepens minimax_compiled one ply at a time,
+        searching the previous iteration's best move first, until the tree
+        is exhausted, max_depth is reached or the budget runs out. An
+        interrupted iteration still counts if it finished the previous
+        best move: that move, searched first with a full window, has an
+        exact value, and a later move only replaces it by beating it, which
+        also gives an exact value (moves that fail low only get a bound and
+        are never chosen). Depth 1 (one evaluation per root child) always
+        completes, so there is a move even under a zero budget. Method
+        'mcts' runs UCT instead and needs a budget.
+
+        Returns a dict: 'move' (root child index), 'question' (the first
+        detective line on the principal variation, None if there is none),
+        'value', 'principal_variation' (node indices from the move on),
+        'depth' (the depth move, value and line were searched to, which can
+        be an interrupted iteration's; the PV length for mcts) and
+        'complete' (the whole tree was searched, never so for mcts).
+        search_stats cover the entire call.
+
+        Hand-built DialogueNode trees can be compiled with
+        compile_dialogue_tree(dialogue_tree_to_document(root, suspect)).
+        """
+        if method == 'mcts':
+            if time_limit is None and node_limit is None:
+                raise ValueError("mcts needs a time_limit or a node_limit")
+            return self._search_mcts(tree, suspect_name, time_limit, node_limit,
+                                     maximizing_player, random.Random(seed))
+        if method != 'alphabeta':
+            raise ValueError(f"unknown search method {method!r}")
+
+        start = time.perf_counter()
+        self.search_stats = self._empty_stats()
+        moves = list(tree.children(0))
+        if tree.terminal[0] or not moves:
+            return self._anytime_result(tree, None, self.evaluate_compiled(tree, 0, suspect_name),
+                                        [], 0, True)
+        better = (lambda a, b: a > b) if maximizing_player else (lambda a, b: a < b)
+        max_depth = len(tree) if max_depth is None else max_depth
+        best, value, line_depth, exhausted = moves[0], None, 0, False
+        self._deadline = None if time_limit is None else start + time_limit
+        self._node_limit = node_limit
+        try:
+            for depth in range(1, max_depth + 1):
+                # The budget is armed once depth 1 has produced a move
+                self._check_at = 0 if depth > 1 else float('inf')
+                self._horizon_reached = False
+                alpha, beta = float('-inf'), float('inf')
+                iteration_best = iteration_value = None
+                try:
+                    for move in moves:
+                        score = self.minimax_compiled(tree, move, depth - 1, not maximizing_player,
+                                                      alpha, beta, suspect_name)
+                        if iteration_best is None or better(score, iteration_value):
+                            iteration_best, iteration_value = move, score
+                            if maximizing_player:
+                                alpha = score
+                            else:
+                                beta = score
+                except _BudgetExhausted:
+                    if iteration_best is not None:
+                        best, value, line_depth = iteration_best, iteration_value, depth
+                    break
+                best, value, line_depth = iteration_best, iteration_value, depth
+                moves.remove(best)
+                moves.insert(0, best)
+                if not self._horizon_reached:
+                    exhausted = True
+                    break
+        finally:
+            self._check_at = float('inf')
+            self._deadline = self._node_limit = None
+        line = self._principal_variation(tree, best, line_depth, maximizing_player, suspect_name)
+        return self._anytime_result(tree, best, value, line, line_depth, exhausted)
+
+    def _check_budget(self):
+        """Raise _BudgetExhausted once the node or time budget is spent; poll the shared bound"""
+        if self._shared_bound is not None:
+            if self._root_maximizing:
+                self._alpha_floor = max(self._alpha_floor, self._shared_bound.value)
+            else:
+                self._beta_ceiling = min(self._beta_ceiling, self._shared_bound.value)
+        nodes = self.search_stats['nodes_searched']
+        if (self._node_limit is not None and nodes >= self._node_limit
+                or self._deadline is not None and time.perf_counter() >= self._deadline):
+            raise _BudgetExhausted
+        self._check_at = nodes + BUDGET_CHECK_INTERVAL
+        if self._node_limit is not None:
+            self._check_at = min(self._check_at, self._node_limit)
+
+    def _principal_variation(self, tree, move, depth, maximizing_player, suspect_name):
+        """Best line from move on, read from the transposition table's best children"""
+        line = [move]
+        node, depth, maximizing_player = move, depth - 1, not maximizing_player
+        while depth > 0 and not tree.terminal[node]:
+            entry = self.transposition_table.get((tree, node, suspect_name, depth,
+                                                  maximizing_player))
+            if entry is None or entry[2] is None:
+                break
+            node = entry[2]
+            line.append(node)
+            depth, maximizing_player = depth - 1, not maximizing_player
+        return line
+
+    @staticmethod
+    def _anytime_result(tree, move, value, line, depth, complete):
+        question = next((tree.node_text(node) for node in line
+                         if tree.node_speaker(node) == 'detective'), None)
+        return {'move': move, 'question': question, 'value': value,
+                'principal_variation': line, 'depth': depth, 'complete': complete}
+
+    def _search_mcts(self, tree, suspect_name, time_limit, node_limit, maximizing_player, rng,
+                     exploration=1.4):
+        """UCT for search_anytime: random playouts to a terminal node, scored by evaluate_compiled
+
+        Statistics are kept per node index, so shared follow-ups pool their
+        playouts. The move is the most visited root child.
+        """
+        stats = self.search_stats = self._empty_stats()
+        deadline = None if time_limit is None else time.perf_counter() + time_limit
+        visits, totals = {0: 0}, {0: 0.0}
+        scale = 1.0
+        terminal = tree.terminal
+        while True:
+            if (node_limit is not None and stats['nodes_searched'] >= node_limit
+                    or deadline is not None and time.perf_counter() >= deadline):
+                break
+            # Selection and expansion
+            path, node, maximizing = [0], 0, maximizing_player
+            while not terminal[node]:
+                children = tree.children(node)
+                if not len(children):
+                    break
+                unvisited = [child for child in children if child not in visits]
+                if unvisited:
+                    node = rng.choice(unvisited)
+                    visits[node], totals[node] = 0, 0.0
+                    path.append(node)
+                    break
+                log_visits = math.log(visits[node])
+                sign = 1 if maximizing else -1
+                node = max(children, key=lambda child: (
+                    sign * totals[child] / visits[child]
+                    + exploration * scale * math.sqrt(log_visits / visits[child])))
+                path.append(node)
+                maximizing = not maximizing
+            # Playout
+            leaf = node
+            while not terminal[leaf] and len(tree.children(leaf)):
+                leaf = rng.choice(tree.children(leaf))
+                stats['nodes_searched'] += 1
+            stats['nodes_searched'] += len(path)
+            stats['evaluations'] += 1
+            value = self.evaluate_compiled(tree, leaf, suspect_name)
+            scale = max(scale, abs(value))
+            for node in path:
+                visits[node] += 1
+                totals[node] += value
+
+        line = []
+        node = 0
+        while not terminal[node]:
+            children = [child for child in tree.children(node) if visits.get(child)]
+            if not children:
+                break
+            node = max(children, key=visits.__getitem__)
+            line.append(node)
+        if not line:
+            return self._anytime_result(tree, None, self.evaluate_compiled(tree, 0, suspect_name),
+                                        [], 0, True)
+        move = line[0]
+        return self._anytime_result(tree, move, totals[move] / visits[move], line, len(line),
+                                    False)
+    
+    def evaluate_compiled(self, tree, node, suspect_name):
+        """evaluate_dialogue_outcome using the keyword flags baked in at compile time"""
+        suspect = self.suspects[suspect_name]
+        base_value = tree.values[node]
+        if suspect['guilty'] and tree.flags[node] & MENTIONS_TRUTH:
+            base_value -= 20
+        if tree.flags[node] & MENTIONS_DEFLECT:
+            base_value += suspect['truth_value'] - 5
+        return base_value
+    
+    def evaluate_dialogue_outcome(self, node, suspect_name):
+        """Evaluate the utility of a dialogue outcome"""
+        suspect = self.suspects[suspect_name]
+        
+        # Factors affecting the evaluation:
+        # 1. Information gained (detective benefits from contradictions)
+        # 2. Suspicion level increase/decrease
+        # 3. Whether suspect reveals truth or lies successfully
+        
+        base_value = node.value
+        
+        # If suspect is guilty and reveals truth, very bad for suspect
+        if suspect['guilty'] and 'truth' in node.question.lower():
+            base_value -= 20
+        
+        # If suspect deflects suspicion successfully, good for suspect  
+        if 'deflect' in node.question.lower():
+            base_value += suspect['truth_value'] - 5
+            
+        return base_value
+    
+    def create_butler_dialogue_tree(self):
+        """Create dialogue tree for Butler interrogation"""
+        
+        # Root: Detective asks initial question
+        root = DialogueNode('detective', 
+                           'You were in the Dining Room when Lord Ashford died?')
+        
+        # Butler's possible responses
+        honest_response = DialogueNode('Butler', 
+                                     'Yes, I was polishing silverware when he collapsed.')
+        
+        evasive_response = DialogueNode('Butler',
+                                      'I... I may have stepped out briefly.')
+        
+        root.children = [honest_response, evasive_response]
+        
+        # Detective follow-up to honest response
+        followup_honest = DialogueNode('detective',
+                                     'Did you touch the wine glass?')
+        honest_response.children = [followup_honest]
+        
+        # Butler's responses to follow-up
+        butler_admits = DialogueNode('Butler',
+                                   'Yes, I dropped it in panic. I should have said so earlier.',
+                                   is_terminal=True, value=10)  # Good info for detective
+        
+        butler_denies = DialogueNode('Butler', 
+                                   'No, I never touched it!',
+                                   is_terminal=True, value=-5)  # Contradiction detected
+        
+        followup_honest.children = [butler_admits, butler_denies]
+        
+        # Detective follow-up to evasive response  
+        followup_evasive = DialogueNode('detective',
+                                      'Where did you go?')
+        evasive_response.children = [followup_evasive]
+        
+        butler_cellar = DialogueNode('Butler',
+                                   'To the Cellar for wine, but the fumes drove me out.',
+                                   is_terminal=True, value=8)  # Hazard warning + alibi
+        
+        butler_vague = DialogueNode('Butler',
+                                  'Just... around. Nothing important.',
+                                  is_terminal=True, value=5)  # Still suspicious
+        
+        followup_evasive.children = [butler_cellar, butler_vague]
+        
+        return root
+
+# --- Parallel search over a process pool ---
+
+# Per-worker state: (tree, DialogueSystem, shared root bound)
+_worker_state = None
+
+def _init_search_worker(tree, suspects, bound):
+    global _worker_state
+    dialogue_system = DialogueSystem(suspects)
+    dialogue_system._shared_bound = bound
+    _worker_state = (tree, dialogue_system)
+
+def _search_subtree(node, depth, maximizing_player, root_maximizing, suspect_name):
+    """Worker task: search one frontier node inside the best root bound published so far
+
+    The bound is polled again every BUDGET_CHECK_INTERVAL nodes, so root
+    children finished elsewhere in the meantime still prune this search.
+    """
+    tree, dialogue_system = _worker_state
+    dialogue_system._root_maximizing = root_maximizing
+    dialogue_system.search_stats = dialogue_system._empty_stats()
+    dialogue_system._check_at = 0
+    try:
+        value = dialogue_system.minimax_compiled(tree, node, depth, maximizing_player,
+                                                 float('-inf'), float('inf'), suspect_name)
+    finally:
+        dialogue_system._check_at = float('inf')
+        dialogue_system._alpha_floor, dialogue_system._beta_ceiling = float('-inf'), float('inf')
+    return value, dialogue_system.search_stats
+
+class ParallelDialogueSearch:
+    """Root-split minimax over a CompiledDialogueTree on a process pool
+
+    The frontier is the root's children, or its grandchildren when there are
+    fewer children than workers. Young Brothers Wait: the eldest root child
+    is searched first, and only then are its younger brothers farmed out.
+    Every finished root child's value is published through a shared
+    double. Running tasks poll it every BUDGET_CHECK_INTERVAL nodes and
+    raise their alpha to it (lower their beta when the root minimizes), so
+    they prune against the best line found anywhere, even one finished
+    after they started.
+
+    A task that fails low returns an upper bound no higher than the
+    published bound, which never exceeds the true root value; combining
+    such bounds with the exact results therefore yields exactly the value
+    of the serial DialogueSystem search.
+
+        with ParallelDialogueSearch(tree, workers=8) as parallel:
+            value = parallel.search(depth=10, suspect_name='Butler')
+
+    The tree is handed to the workers once, when the pool starts.
+    """
+
+    def __init__(self, tree, suspects=None, workers=None):
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        self.tree = tree
+        self.suspects = suspects
+        self.workers = workers or os.cpu_count() or 1
+        self.bound = multiprocessing.Value('d', 0.0)
+        self.pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_search_worker,
+                                        initargs=(tree, suspects, self.bound))
+        self.search_stats = DialogueSystem._empty_stats()
+
+    def close(self):
+        self.pool.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def frontier(self, depth):
+        """[(root child, frontier node)] to hand out; node is child itself at split depth 1"""
+        tree = self.tree
+        children = list(tree.children(0))
+        if len(children) >= self.workers or depth < 3:
+            return [(child, child) for child in children]
+        frontier = []
+        for child in children:
+            grandchildren = [] if tree.terminal[child] else list(tree.children(child))
+            frontier.extend((child, node) for node in grandchildren or [child])
+        return frontier
+
+    def search(self, depth, suspect_name, maximizing_player=True):
+        """Minimax value of the tree's root, identical to DialogueSystem.search_compiled"""
+        from concurrent.futures import FIRST_COMPLETED, wait
+
+        tree = self.tree
+        self.search_stats = DialogueSystem._empty_stats()
+        if depth == 0 or tree.terminal[0] or not len(tree.children(0)):
+            return DialogueSystem(self.suspects).search_compiled(tree, depth, suspect_name,
+                                                                 maximizing_player)
+        better = max if maximizing_player else min
+        worse = min if maximizing_player else max
+        self.bound.value = float('-inf') if maximizing_player else float('inf')
+
+        frontier = self.frontier(depth)
+        # Frontier nodes under each root child still to report, and their combined value
+        pending = {}
+        for child, node in frontier:
+            pending[child] = pending.get(child, 0) + 1
+        child_values = {}
+        best = None
+
+        def submit(child, node):
+            level = 1 if node == child else 2
+            return self.pool.submit(_search_subtree, node, depth - level,
+                                    maximizing_player == (level == 2), maximizing_player,
+                                    suspect_name)
+
+        def finish(child, value, stats):
+            nonlocal best
+            for counter, count in stats.items():
+                self.search_stats[counter] += count
+            if child in child_values:
+                value = worse(child_values[child], value)
+            child_values[child] = value
+            pending[child] -= 1
+            if not pending[child]:
+                best = value if best is None else better(best, value)
+                self.bound.value = best
+
+        # Young Brothers Wait: the eldest brother establishes the first bound,
+        # then the younger ones are searched in parallel
+        eldest = frontier[0][0]
+        for group in ([item for item in frontier if item[0] == eldest],
+                      [item for item in frontier if item[0] != eldest]):
+            tasks = {submit(child, node): child for child, node in group}
+            while tasks:
+                done, _ = wait(tasks, return_when=FIRST_COMPLETED)
+                for future in done:
+                    finish(tasks.pop(future), *future.result())
+        return best
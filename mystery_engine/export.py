@@ -0,0 +1,256 @@
+"""Streaming table exports of the mansion, suspects, clues, solution and simulations
+
+Rows are produced by generators and written one at a time through a
+TableWriter, so memory stays bounded however many rows there are. The
+writer is picked from the file extension: .csv and .jsonl are built in and
+can be appended to, .parquet needs pyarrow and writes row groups of
+ROW_GROUP_SIZE rows.
+
+    with open_table('games.jsonl', GAME_FIELDS, append=True) as table:
+        table.write_rows(rows)
+"""
+
+import csv
+import json
+import os
+
+from .case import CASE_CLUES
+
+EXPORT_FILES = ['mansion_layout.csv', 'suspect_profiles.csv', 'clue_analysis.csv',
+                'algorithm_analysis.csv', 'mystery_solution.csv']
+
+ALGORITHM_ANALYSIS = [
+    {
+        'algorithm': 'BFS Pathfinding',
+        'purpose': 'Room navigation and shortest path finding',
+        'time_complexity': 'O(V + E) where V=vertices, E=edges',
+        'space_complexity': 'O(V)',
+        'implemented': True,
+        'use_case': 'Navigate between mansion rooms efficiently'
+    },
+    {
+        'algorithm': 'Minimax with Alpha-Beta Pruning',
+        'purpose': 'Optimal dialogue tree traversal',
+        'time_complexity': 'O(b^(d/2)) best case, O(b^d) worst case',
+        'space_complexity': 'O(d)',
+        'implemented': True,
+        'use_case': 'Interrogation strategy optimization'
+    },
+    {
+        'algorithm': 'Constraint Satisfaction Problem',
+        'purpose': 'Evidence analysis and suspect evaluation', 
+        'time_complexity': 'O(d^n) where d=domain size, n=variables',
+        'space_complexity': 'O(n)',
+        'implemented': True,
+        'use_case': 'Solve murder mystery based on collected clues'
+    },
+    {
+        'algorithm': 'Wumpus World Inference',
+        'purpose': 'Hazard detection and safe navigation',
+        'time_complexity': 'O(n) for inference rules',
+        'space_complexity': 'O(n) for knowledge base',
+        'implemented': True,
+        'use_case': 'Avoid dangerous rooms using logical reasoning'
+    }
+]
+
+ROW_GROUP_SIZE = 65536
+
+class TableWriter:
+    """Writes dict rows restricted to fieldnames; use as a context manager"""
+
+    def __init__(self, path, fieldnames, append=False):
+        self.path = path
+        self.fieldnames = list(fieldnames)
+        self.rows = 0
+
+    def write(self, row):
+        raise NotImplementedError
+
+    def write_rows(self, rows):
+        for row in rows:
+            self.write(row)
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+class CsvWriter(TableWriter):
+    def __init__(self, path, fieldnames, append=False):
+        super().__init__(path, fieldnames, append)
+        resume = append and os.path.exists(path) and os.path.getsize(path) > 0
+        self.file = open(path, 'a' if append else 'w', newline='')
+        self.writer = csv.DictWriter(self.file, fieldnames=self.fieldnames, extrasaction='ignore')
+        if not resume:
+            self.writer.writeheader()
+
+    def write(self, row):
+        self.writer.writerow(row)
+        self.rows += 1
+
+    def close(self):
+        self.file.close()
+
+class JsonLinesWriter(TableWriter):
+    def __init__(self, path, fieldnames, append=False):
+        super().__init__(path, fieldnames, append)
+        self.file = open(path, 'a' if append else 'w')
+
+    def write(self, row):
+        self.file.write(json.dumps({field: row.get(field) for field in self.fieldnames},
+                                   default=str))
+        self.file.write('\n')
+        self.rows += 1
+
+    def close(self):
+        self.file.close()
+
+class ParquetWriter(TableWriter):
+    """Columnar output through pyarrow, buffering one row group at a time"""
+
+    def __init__(self, path, fieldnames, append=False):
+        if append:
+            raise ValueError("Parquet files cannot be appended to; write a new file instead")
+        super().__init__(path, fieldnames, append)
+        import pyarrow  # Only needed for Parquet output
+        import pyarrow.parquet
+
+        self.pyarrow = pyarrow
+        self.writer = None
+        self.columns = {field: [] for field in self.fieldnames}
+        self.buffered = 0
+
+    def write(self, row):
+        for field, column in self.columns.items():
+            column.append(row.get(field))
+        self.buffered += 1
+        self.rows += 1
+        if self.buffered >= ROW_GROUP_SIZE:
+            self._flush()
+
+    def _flush(self):
+        if not self.buffered:
+            return
+        table = self.pyarrow.table(self.columns)
+        if self.writer is None:
+            self.writer = self.pyarrow.parquet.ParquetWriter(self.path, table.schema)
+        self.writer.write_table(table)
+        for column in self.columns.values():
+            column.clear()
+        self.buffered = 0
+
+    def close(self):
+        self._flush()
+        if self.writer is not None:
+            self.writer.close()
+
+# format (file extension) -> writer class
+FORMATS = {
+    'csv': CsvWriter,
+    'jsonl': JsonLinesWriter,
+    'parquet': ParquetWriter,
+}
+
+def open_table(path, fieldnames, format=None, append=False):
+    """TableWriter for path; format defaults to the file extension"""
+    format = format or os.path.splitext(path)[1].lstrip('.').lower()
+    if format not in FORMATS:
+        raise ValueError(f"Unknown export format {format!r}; choose from {sorted(FORMATS)}")
+    return FORMATS[format](path, fieldnames, append)
+
+def write_table(path, fieldnames, rows, format=None, append=False):
+    """Stream rows into path and return how many were written"""
+    with open_table(path, fieldnames, format, append) as table:
+        table.write_rows(rows)
+    return table.rows
+
+# --- Row sources ---
+
+MANSION_FIELDS = ['room', 'connections', 'clue', 'hazard', 'warnings']
+SUSPECT_FIELDS = ['role', 'name', 'personality', 'is_guilty', 'truth_level', 'suspicion_level']
+CLUE_FIELDS = ['clue_name', 'description', 'affects_murderer', 'constraint_weight']
+ALGORITHM_FIELDS = ['algorithm', 'purpose', 'time_complexity', 'space_complexity',
+                    'implemented', 'use_case']
+SOLUTION_FIELDS = ['variable', 'solution', 'confidence', 'evidence_points', 'total_possible']
+
+def mansion_rows(mansion):
+    """Room connections, clues, hazards"""
+    for room, connections in mansion.rooms.items():
+        yield {
+            'room': room,
+            'connections': ", ".join(connections),
+            'clue': mansion.clues.get(room, ""),
+            'hazard': mansion.hazards.get(room, ""),
+            'warnings': ", ".join(mansion.warnings.get(room, []))
+        }
+
+def suspect_rows(dialogue_system):
+    """Character data and guilt status"""
+    for role, info in dialogue_system.suspects.items():
+        yield {
+            'role': role,
+            'name': info['name'],
+            'personality': info['personality'],
+            'is_guilty': info['guilty'],
+            'truth_level': info['truth_value'],
+            'suspicion_level': info['suspicion_level']
+        }
+
+def clue_rows(csp, clues=CASE_CLUES):
+    """Evidence and the weight of the constraints each clue added to the CSP"""
+    for clue_name, description in clues:
+        yield {
+            'clue_name': clue_name,
+            'description': description,
+            'affects_murderer': 'Heiress' in description or 'ledger' in clue_name or 'glove' in clue_name,
+            'constraint_weight': csp.evidence_weight(clue_name)
+        }
+
+def solution_rows(csp):
+    """Best solution with confidences (one query over the current evidence)"""
+    case_query = csp.query()
+    solution = case_query['best'][0]
+    for variable in csp.variables:
+        value = solution[variable]
+        yield {
+            'variable': variable,
+            'solution': value,
+            'confidence': f"{case_query['confidence'][variable][value]:.2%}",
+            'evidence_points': case_query['max_marginals'][variable][value],
+            'total_possible': csp.total_weight
+        }
+
+def export_all(directory='.', mansion=None, dialogue_system=None, csp=None, clues=CASE_CLUES,
+               format='csv'):
+    """Write the five data tables into directory and return their paths
+
+    Anything not passed in is built fresh for the Ashford case. Files are
+    named as in EXPORT_FILES with the extension of the chosen format.
+    """
+    if mansion is None:
+        from .graph import MansionGraph
+        mansion = MansionGraph()
+    if dialogue_system is None:
+        from .dialogue import DialogueSystem
+        dialogue_system = DialogueSystem()
+    if csp is None:
+        from .case import build_case_csp
+        csp = build_case_csp(clues)
+    os.makedirs(directory, exist_ok=True)
+    paths = [os.path.join(directory, f"{os.path.splitext(filename)[0]}.{format}")
+             for filename in EXPORT_FILES]
+    tables = [
+        (MANSION_FIELDS, mansion_rows(mansion)),
+        (SUSPECT_FIELDS, suspect_rows(dialogue_system)),
+        (CLUE_FIELDS, clue_rows(csp, clues)),
+        (ALGORITHM_FIELDS, ALGORITHM_ANALYSIS),
+        (SOLUTION_FIELDS, solution_rows(csp)),
+    ]
+    for path, (fieldnames, rows) in zip(paths, tables):
+        write_table(path, fieldnames, rows, format)
+    return paths
@@ -0,0 +1,362 @@
+"""Seeded procedural mystery generator for large-scale worlds
+
+Writes a complete case to a directory, streaming every file row by row so
+memory stays flat however many rooms are requested:
+
+    mansion.csv     one row per room (same columns as mansion_layout.csv)
+    suspects.csv    suspect profiles (same columns as suspect_profiles.csv)
+    dialogues/      one dialogue tree file per suspect (same format as dialogues/butler.json)
+    clues.jsonl     one clue per line with its room and weighted CSP constraints
+    world.json      parameters, CSP variables/domains and the true solution
+
+The mansion is a grid whose rows are corridors joined at their west end,
+with extra north-south doors drawn at random, so it is always connected.
+Per-room choices come from a counter-based hash of (seed, room), so any row
+can be produced without remembering the others.
+
+    python -m mystery_engine generate --seed 7 --rooms 1000000 --clues 200 --out worlds/seed7
+"""
+
+import csv
+import json
+import os
+import random
+
+ROOM_KINDS = ['Hall', 'Study', 'Library', 'Dining Room', 'Kitchen', 'Cellar', 'Conservatory',
+              'Gallery', 'Ballroom', 'Parlour', 'Billiard Room', 'Chapel', 'Nursery',
+              'Pantry', 'Armoury', 'Observatory', 'Bedroom', 'Attic', 'Wine Vault', 'Solar']
+
+# (hazard description, warning heard in the rooms next to it)
+HAZARDS = [
+    ('Gas leak - entering without caution = game over', 'You smell gas from the {room}'),
+    ('May collapse - you hear rumbling nearby', 'You hear rumbling from the {room}'),
+    ('Flooded - the floor gives way', 'You hear dripping water from the {room}'),
+    ('Guard dog - attacks intruders', 'You hear growling from the {room}'),
+]
+
+ROLES = ['Butler', 'Maid', 'Chef', 'Heiress', 'Gardener', 'Chauffeur', 'Governess', 'Nephew',
+         'Doctor', 'Solicitor', 'Valet', 'Housekeeper', 'Colonel', 'Widow', 'Artist', 'Vicar']
+FIRST_NAMES = ['James', 'Clara', 'Marco', 'Sophia', 'Edwin', 'Agnes', 'Henry', 'Lydia',
+               'Arthur', 'Mabel', 'Victor', 'Rose', 'Percy', 'Ivy', 'Walter', 'Edith']
+PERSONALITIES = ['Calm, polite, but evasive', 'Nervous and chatty', 'Defensive and grumpy',
+                 'Elegant, clever, manipulative', 'Quiet and observant', 'Boastful and careless',
+                 'Anxious to please', 'Cold and precise']
+WEAPONS = ['Poison', 'Knife', 'Candlestick', 'Rope', 'Revolver', 'Lead Pipe', 'Wrench',
+           'Letter Opener', 'Dumbbell', 'Axe', 'Trophy', 'Fire Iron']
+MOTIVES = ['Money', 'Revenge', 'Jealousy', 'Inheritance', 'Blackmail', 'Love', 'Fear',
+           'Ambition', 'Secrecy', 'Honour']
+CLUE_OBJECTS = ['Torn glove', 'Broken glass', 'Ledger page', 'Muddy footprint', 'Burnt letter',
+                'Pocket watch', 'Empty vial', 'Bloodstained cloth', 'Signet ring', 'Telegram']
+
+# Hash salts for the independent per-room draws
+_DOOR, _HAZARD, _HAZARD_KIND, _ROOM_KIND = 1, 2, 3, 4
+
+_MASK64 = (1 << 64) - 1
+
+def _splitmix(x):
+    x = (x + 0x9E3779B97F4A7C15) & _MASK64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return x ^ (x >> 31)
+
+def _unit(seed, salt, index):
+    """Deterministic uniform draw in [0, 1) for (seed, salt, index)"""
+    return _splitmix(_splitmix(seed * 16 + salt) ^ index) / 2.0 ** 64
+
+class MansionPlan:
+    """The generated mansion as pure functions of the room id (nothing stored)"""
+
+    def __init__(self, seed, rooms, door_density=0.35, hazard_rate=0.02):
+        self.seed = seed
+        self.rooms = rooms
+        self.columns = max(1, int(rooms ** 0.5))
+        self.door_density = door_density
+        self.hazard_rate = hazard_rate
+
+    def name(self, room_id):
+        kind = ROOM_KINDS[int(_unit(self.seed, _ROOM_KIND, room_id) * len(ROOM_KINDS))]
+        return f'{kind} {room_id}' if self.rooms > 1 else kind
+
+    def neighbors(self, room_id):
+        columns = self.columns
+        column = room_id % columns
+        result = []
+        above = room_id - columns
+        if above >= 0 and self._has_door(above):
+            result.append(above)
+        if column > 0:
+            result.append(room_id - 1)
+        if column + 1 < columns and room_id + 1 < self.rooms:
+            result.append(room_id + 1)
+        below = room_id + columns
+        if below < self.rooms and self._has_door(room_id):
+            result.append(below)
+        return result
+
+    def _has_door(self, upper_id):
+        # The west wall joins every corridor, which keeps the grid connected
+        return upper_id % self.columns == 0 or _unit(self.seed, _DOOR, upper_id) < self.door_density
+
+    def hazard(self, room_id):
+        """Index into HAZARDS, or None; the entrance (room 0) is always safe"""
+        if room_id == 0 or _unit(self.seed, _HAZARD, room_id) >= self.hazard_rate:
+            return None
+        return int(_unit(self.seed, _HAZARD_KIND, room_id) * len(HAZARDS))
+
+    def safe_rooms(self, rng, count, exclude=()):
+        """Draw count distinct hazard-free rooms other than exclude"""
+        chosen = []
+        taken = set(exclude)
+        while len(chosen) < count and len(taken) < self.rooms:
+            room_id = rng.randrange(self.rooms)
+            if room_id not in taken:
+                taken.add(room_id)
+                if self.hazard(room_id) is None:
+                    chosen.append(room_id)
+        return chosen
+
+def generate_world(directory, seed=0, rooms=1000, suspects=4, clues=20, locations=8,
+                   weapons=6, motives=6, dialogue_branching=2, dialogue_depth=3,
+                   door_density=0.35, hazard_rate=0.02):
+    """Generate a world into directory and return its manifest (also saved as world.json)"""
+    if rooms < 1 or suspects < 1:
+        raise ValueError("A world needs at least one room and one suspect")
+    rng = random.Random(seed)
+    plan = MansionPlan(seed, rooms, door_density, hazard_rate)
+    os.makedirs(os.path.join(directory, 'dialogues'), exist_ok=True)
+
+    # Cast, case and the handful of rooms that matter are drawn up front
+    cast = _cast(rng, suspects)
+    scene_ids = plan.safe_rooms(rng, min(locations, rooms))
+    clue_ids = plan.safe_rooms(rng, min(clues, rooms), exclude=[0])
+    domains = {
+        'murderer': [suspect['role'] for suspect in cast],
+        'weapon': rng.sample(WEAPONS, min(weapons, len(WEAPONS))),
+        'location': [plan.name(room_id) for room_id in scene_ids],
+        'motive': rng.sample(MOTIVES, min(motives, len(MOTIVES))),
+    }
+    solution = {
+        'murderer': next(s['role'] for s in cast if s['guilty']),
+        'weapon': rng.choice(domains['weapon']),
+        'location': rng.choice(domains['location']) if domains['location'] else None,
+        'motive': rng.choice(domains['motive']),
+    }
+    clue_records = [_clue(rng, index, plan.name(room_id), domains, solution)
+                    for index, room_id in enumerate(clue_ids)]
+    clue_text = {room_id: record['description'] for room_id, record in zip(clue_ids, clue_records)}
+
+    _write_mansion(os.path.join(directory, 'mansion.csv'), plan, clue_text)
+    _write_suspects(os.path.join(directory, 'suspects.csv'), cast)
+    for suspect in cast:
+        _write_dialogue(directory, rng, suspect, domains, solution,
+                        dialogue_branching, dialogue_depth)
+    with open(os.path.join(directory, 'clues.jsonl'), 'w') as f:
+        for record in clue_records:
+            f.write(json.dumps(record) + '\n')
+
+    manifest = {
+        'seed': seed,
+        'parameters': {'rooms': rooms, 'suspects': suspects, 'clues': len(clue_records),
+                       'locations': len(scene_ids), 'dialogue_branching': dialogue_branching,
+                       'dialogue_depth': dialogue_depth, 'door_density': door_density,
+                       'hazard_rate': hazard_rate},
+        'start_room': plan.name(0),
+        'variables': list(domains),
+        'domains': domains,
+        'solution': solution,
+        'files': {'mansion': 'mansion.csv', 'suspects': 'suspects.csv',
+                  'dialogues': 'dialogues', 'clues': 'clues.jsonl'},
+    }
+    with open(os.path.join(directory, 'world.json'), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+def _cast(rng, count):
+    guilty = rng.randrange(count)
+    cast = []
+    for index in range(count):
+        role = ROLES[index % len(ROLES)]
+        if index >= len(ROLES):
+            role = f'{role} {index // len(ROLES) + 1}'
+        cast.append({
+            'role': role,
+            'name': FIRST_NAMES[rng.randrange(len(FIRST_NAMES))],
+            'personality': rng.choice(PERSONALITIES),
+            'guilty': index == guilty,
+            'truth_value': rng.randint(1, 10),
+            'suspicion_level': rng.randint(1, 10),
+        })
+    return cast
+
+def _clue(rng, index, room, domains, solution):
+    """A clue and its weighted constraints: mostly pointing at the truth, some red herrings"""
+    variable = rng.choice(list(domains))
+    truth = solution[variable]
+    others = [value for value in domains[variable] if value != truth]
+    roll = rng.random()
+    if roll < 0.45 or not others:
+        constraint = {'type': 'Equals', 'var': variable, 'value': truth}
+        weight = rng.randint(5, 10)
+    elif roll < 0.7:
+        constraint = {'type': 'NotEquals', 'var': variable, 'value': rng.choice(others)}
+        weight = rng.randint(3, 9)
+    elif roll < 0.85:
+        # Red herring: points at a wrong value, less convincingly
+        constraint = {'type': 'Equals', 'var': variable, 'value': rng.choice(others)}
+        weight = rng.randint(1, 4)
+    else:
+        constraint = {'type': 'AllOf', 'parts': [
+            {'type': 'Equals', 'var': 'murderer', 'value': solution['murderer']},
+            {'type': 'Equals', 'var': 'motive', 'value': solution['motive']}]}
+        weight = rng.randint(5, 9)
+    return {
+        'clue': f'clue_{index}',
+        'room': room,
+        'description': f'{rng.choice(CLUE_OBJECTS)} found in the {room}',
+        'constraints': [{'constraint': constraint, 'weight': weight}],
+    }
+
+def _write_mansion(path, plan, clue_text):
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['room', 'connections', 'clue', 'hazard', 'warnings'])
+        for room_id in range(plan.rooms):
+            neighbors = plan.neighbors(room_id)
+            hazard = plan.hazard(room_id)
+            warnings = []
+            for neighbor in neighbors:
+                neighbor_hazard = plan.hazard(neighbor)
+                if neighbor_hazard is not None:
+                    warnings.append(HAZARDS[neighbor_hazard][1].format(room=plan.name(neighbor)))
+            writer.writerow([
+                plan.name(room_id),
+                ', '.join(plan.name(neighbor) for neighbor in neighbors),
+                clue_text.get(room_id, ''),
+                HAZARDS[hazard][0] if hazard is not None else '',
+                ', '.join(warnings),
+            ])
+
+def _write_suspects(path, cast):
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['role', 'name', 'personality', 'is_guilty', 'truth_level', 'suspicion_level'])
+        for suspect in cast:
+            writer.writerow([suspect['role'], suspect['name'], suspect['personality'],
+                             suspect['guilty'], suspect['truth_value'], suspect['suspicion_level']])
+
+def _write_dialogue(directory, rng, suspect, domains, solution, branching, depth):
+    """Complete branching-ary tree written node by node in breadth-first order
+
+    Node k's children are k * branching + 1 ... k * branching + branching, so
+    every node can be written without holding the tree.
+    """
+    role = suspect['role']
+    # Same file naming as DialogueLibrary.path_for
+    path = os.path.join(directory, 'dialogues', role.lower().replace(' ', '_') + '.json')
+    with open(path, 'w') as f:
+        f.write(json.dumps({'suspect': role, 'root': 'n0'})[:-1] + ', "nodes": [\n')
+        node_id, level_end, level = 0, 1, 0
+        while level <= depth:
+            detective = level % 2 == 0
+            if detective:
+                subject = rng.choice(list(domains))
+                text = rng.choice(['Where were you when it happened?',
+                                   f'What do you know about the {subject}?',
+                                   'Who else could have done it?',
+                                   'Why should I believe you?'])
+            else:
+                text = rng.choice(['I was alone, I swear it.',
+                                   "I'll tell you the truth: I saw everything.",
+                                   'You should deflect your attention to the others.',
+                                   'I would rather not say.',
+                                   f"Ask about the {rng.choice(domains['weapon'])}, not me."])
+            node = {'id': f'n{node_id}', 'speaker': 'detective' if detective else role,
+                    'text': text}
+            if level == depth:
+                base = rng.randint(-10, 12)
+                node['terminal'] = True
+                node['value'] = base - 8 if suspect['guilty'] and rng.random() < 0.5 else base
+            else:
+                first = node_id * branching + 1
+                node['children'] = [f'n{child}' for child in range(first, first + branching)]
+            f.write(('  ' if node_id == 0 else ',\n  ') + json.dumps(node))
+            node_id += 1
+            if node_id == level_end:
+                level += 1
+                level_end = level_end * branching + 1
+        f.write('\n]}\n')
+
+def constraint_from_spec(spec):
+    """CSP Constraint for a clues.jsonl constraint spec"""
+    from .csp import AllOf, Equals, NotEquals  # generating a world does not need numpy
+
+    if spec['type'] == 'AllOf':
+        return AllOf(*(constraint_from_spec(part) for part in spec['parts']))
+    if spec['type'] == 'Equals':
+        return Equals(spec['var'], spec['value'])
+    if spec['type'] == 'NotEquals':
+        return NotEquals(spec['var'], spec['value'])
+    raise ValueError(f"Unknown constraint type {spec['type']!r}")
+
+def constraint_to_spec(constraint):
+    """Inverse of constraint_from_spec; ValueError for constraints with no spec (Predicate)"""
+    from .csp import AllOf, Equals, NotEquals
+
+    if isinstance(constraint, AllOf):
+        return {'type': 'AllOf', 'parts': [constraint_to_spec(part) for part in constraint.parts]}
+    if isinstance(constraint, (Equals, NotEquals)):
+        return {'type': type(constraint).__name__, 'var': constraint.variable,
+                'value': constraint.value}
+    raise ValueError(f"no spec for constraint {constraint!r}")
+
+def read_world_clues(directory):
+    """A generated world's manifest and its clue records (clue, room, description, constraints)"""
+    with open(os.path.join(directory, 'world.json')) as f:
+        manifest = json.load(f)
+    with open(os.path.join(directory, manifest['files']['clues'])) as f:
+        return manifest, [json.loads(line) for line in f]
+
+def clue_record_constraints(record):
+    """(Constraint, weight) pairs of one clues.jsonl record"""
+    return [(constraint_from_spec(item['constraint']), item['weight'])
+            for item in record['constraints']]
+
+def load_world_csp(directory, clue_names=None):
+    """MurderMysteryCSP over a generated world's domains with its clues as evidence
+
+    clue_names limits the evidence to clues found so far (default: all).
+    """
+    manifest, records = read_world_clues(directory)
+    from .csp import MurderMysteryCSP
+
+    csp = MurderMysteryCSP(manifest['variables'], manifest['domains'])
+    wanted = None if clue_names is None else set(clue_names)
+    for record in records:
+        if wanted is None or record['clue'] in wanted:
+            csp.add_evidence(record['clue'], record['description'],
+                             constraints=clue_record_constraints(record))
+    return csp
+
+def configure_parser(parser):
+    parser.add_argument('--out', required=True, help="output directory")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--rooms', type=int, default=1000)
+    parser.add_argument('--suspects', type=int, default=4)
+    parser.add_argument('--clues', type=int, default=20)
+    parser.add_argument('--locations', type=int, default=8)
+    parser.add_argument('--weapons', type=int, default=6)
+    parser.add_argument('--motives', type=int, default=6)
+    parser.add_argument('--dialogue-branching', type=int, default=2)
+    parser.add_argument('--dialogue-depth', type=int, default=3)
+    parser.add_argument('--door-density', type=float, default=0.35)
+    parser.add_argument('--hazard-rate', type=float, default=0.02)
+    parser.set_defaults(run=run)
+
+def run(args):
+    manifest = generate_world(args.out, args.seed, args.rooms, args.suspects, args.clues,
+                              args.locations, args.weapons, args.motives,
+                              args.dialogue_branching, args.dialogue_depth,
+                              args.door_density, args.hazard_rate)
+    print(f"Generated world {args.seed} in {args.out}: {args.rooms} rooms, "
+          f"{len(manifest['domains']['murderer'])} suspects, {manifest['parameters']['clues']} clues")
+    print(f"Solution: {manifest['solution']}")
@@ -0,0 +1,1001 @@
+"""Mansion graph: compact room storage, path queries, distance fields and the all-pairs path table"""
+
+from array import array
+from collections import deque
+from collections.abc import Mapping, MutableMapping, Sequence
+import heapq
+from zlib import crc32
+
+class NameTable:
+    """Interned room names packed into one UTF-8 buffer with an open-addressing index
+
+    id -> name is a slice of the buffer; name -> id probes a flat array of
+    slots, so no per-name str or dict entry is kept alive. Slots are placed
+    by CRC-32 rather than hash() so the table is the same in every process
+    and can be saved and memory-mapped back (see loaders.py); the buffers
+    may then be read-only memoryviews, copied into arrays on the first add.
+    """
+
+    def __init__(self):
+        self.data = bytearray()
+        self.offsets = array('I', [0])
+        self.slots = array('i', [-1]) * 8
+
+    @classmethod
+    def from_buffers(cls, data, offsets, slots):
+        table = cls.__new__(cls)
+        table.data, table.offsets, table.slots = data, offsets, slots
+        return table
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, room_id):
+        if not 0 <= room_id < len(self):
+            raise IndexError(room_id)
+        return str(self.data[self.offsets[room_id]:self.offsets[room_id + 1]], 'utf-8')
+
+    def __iter__(self):
+        data, offsets = self.data, self.offsets
+        for room_id in range(len(self)):
+            yield str(data[offsets[room_id]:offsets[room_id + 1]], 'utf-8')
+
+    def __contains__(self, name):
+        return self.get(name) is not None
+
+    def _probe(self, encoded):
+        """Return the slot holding the name, or the empty slot where it belongs"""
+        slots, data, offsets = self.slots, self.data, self.offsets
+        mask = len(slots) - 1
+        slot = crc32(encoded) & mask
+        while True:
+            room_id = slots[slot]
+            if room_id < 0 or data[offsets[room_id]:offsets[room_id + 1]] == encoded:
+                return slot
+            slot = (slot + 1) & mask
+
+    def get(self, name, default=None):
+        if not isinstance(name, str):
+            return default
+        room_id = self.slots[self._probe(name.encode())]
+        return default if room_id < 0 else room_id
+
+    def index(self, name):
+        room_id = self.get(name)
+        if room_id is None:
+            raise KeyError(name)
+        return room_id
+
+    def add(self, name):
+        """Append a new name (caller checks it is not already present)"""
+        if not isinstance(self.data, bytearray):
+            self.data = bytearray(self.data)
+            self.offsets = array('I', self.offsets)
+            self.slots = array('i', self.slots)
+        encoded = name.encode()
+        room_id = len(self)
+        self.data += encoded
+        self.offsets.append(len(self.data))
+        if 2 * (room_id + 1) > len(self.slots):
+            self._grow()
+        else:
+            self.slots[self._probe(encoded)] = room_id
+        return room_id
+
+    def _grow(self):
+        self.slots = array('i', [-1]) * (len(self.slots) * 2)
+        data, offsets = self.data, self.offsets
+        for room_id in range(len(self)):
+            self.slots[self._probe(bytes(data[offsets[room_id]:offsets[room_id + 1]]))] = room_id
+
+class PackedTuples(Sequence):
+    """Read-only list of int tuples stored as CSR offsets and items"""
+
+    def __init__(self, offsets, items):
+        self.offsets = offsets
+        self.items = items
+
+    def __getitem__(self, index):
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return tuple(self.items[self.offsets[index]:self.offsets[index + 1]])
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+class CompactLayout:
+    """Integer-indexed mansion storage: CSR adjacency and array-backed room attributes
+
+    Room names are interned to dense ids by a NameTable. Neighbours of room r live in
+    targets[offsets[r]:offsets[r + 1]]; clues and hazards are indices into an
+    interned text table (-1 for none) and warnings index interned tuples of
+    text ids (0 for none). Per room this costs a handful of machine ints
+    instead of a dict entry, a list object and a string per neighbour.
+
+    to_buffers/from_buffers expose the whole layout as the flat arrays named
+    in BUFFERS, which loaders.py saves and memory-maps. A mapped layout reads
+    straight from the mapping and copies into arrays only when rooms or
+    edges are added.
+    """
+
+    # Per-room (and adjacency) arrays as (attribute, array typecode)
+    ROOM_ARRAYS = [('offsets', 'i'), ('targets', 'i'), ('clue', 'i'), ('hazard', 'i'),
+                   ('warning', 'i'), ('x', 'd'), ('y', 'd')]
+    # Every buffer of a saved layout as (buffer name, array typecode)
+    BUFFERS = ([('names.data', 'B'), ('names.offsets', 'I'), ('names.slots', 'i'),
+                ('texts.data', 'B'), ('texts.offsets', 'I'), ('texts.slots', 'i')] +
+               ROOM_ARRAYS + [('warning_set_offsets', 'i'), ('warning_set_items', 'i')])
+
+    def __init__(self):
+        self.names = NameTable()
+        self.offsets = array('i', [0])
+        self.targets = array('i')
+        self.clue = array('i')
+        self.hazard = array('i')
+        self.warning = array('i')
+        self.texts = NameTable()
+        self.warning_sets = [()]
+        self.warning_set_ids = {(): 0}
+        # Grid coordinates (NaN when a room has no position)
+        self.x = array('d')
+        self.y = array('d')
+        # Bumped on every adjacency edit so derived caches can tell they are stale
+        self.version = 0
+        # Likewise for clue and hazard edits
+        self.attribute_version = 0
+
+    @classmethod
+    def from_dicts(cls, rooms, clues=None, hazards=None, warnings=None, positions=None):
+        """Build the compact form from name-keyed dicts in a single pass"""
+        layout = cls()
+        for room in rooms:
+            layout.intern_room(room)
+        targets = []
+        offsets = [0]
+        for room in layout.names:
+            targets.extend(layout.intern_room(neighbor) for neighbor in rooms.get(room, []))
+            offsets.append(len(targets))
+        # Rooms only mentioned as neighbours get empty rows
+        offsets.extend([len(targets)] * (len(layout.names) + 1 - len(offsets)))
+        layout.offsets = array('i', offsets)
+        layout.targets = array('i', targets)
+        for room, text in (clues or {}).items():
+            layout.clue[layout.intern_room(room)] = layout.intern_text(text)
+        for room, text in (hazards or {}).items():
+            layout.hazard[layout.intern_room(room)] = layout.intern_text(text)
+        for room, texts in (warnings or {}).items():
+            layout.set_warnings(layout.intern_room(room), texts)
+        for room, (x, y) in (positions or {}).items():
+            room_id = layout.intern_room(room)
+            layout.x[room_id] = x
+            layout.y[room_id] = y
+        return layout
+
+    def to_buffers(self):
+        """{buffer name: array or buffer} for every entry of BUFFERS"""
+        set_offsets, set_items = array('i', [0]), array('i')
+        for texts in self.warning_sets:
+            set_items.extend(texts)
+            set_offsets.append(len(set_items))
+        return {
+            'names.data': self.names.data, 'names.offsets': self.names.offsets,
+            'names.slots': self.names.slots, 'texts.data': self.texts.data,
+            'texts.offsets': self.texts.offsets, 'texts.slots': self.texts.slots,
+            'offsets': self.offsets, 'targets': self.targets, 'clue': self.clue,
+            'hazard': self.hazard, 'warning': self.warning, 'x': self.x, 'y': self.y,
+            'warning_set_offsets': set_offsets, 'warning_set_items': set_items,
+        }
+
+    @classmethod
+    def from_buffers(cls, buffers):
+        """Layout over buffers shaped like to_buffers() output, without copying them"""
+        layout = cls.__new__(cls)
+        layout.names = NameTable.from_buffers(buffers['names.data'], buffers['names.offsets'],
+                                              buffers['names.slots'])
+        layout.texts = NameTable.from_buffers(buffers['texts.data'], buffers['texts.offsets'],
+                                              buffers['texts.slots'])
+        for name, _ in cls.ROOM_ARRAYS:
+            setattr(layout, name, buffers[name])
+        layout.warning_sets = PackedTuples(buffers['warning_set_offsets'],
+                                           buffers['warning_set_items'])
+        layout.warning_set_ids = None  # Built on the first set_warnings
+        layout.version = layout.attribute_version = 0
+        return layout
+
+    def _own_arrays(self):
+        """Copy mapped per-room buffers into arrays before they are resized"""
+        for name, typecode in self.ROOM_ARRAYS:
+            values = getattr(self, name)
+            if not isinstance(values, array):
+                setattr(self, name, array(typecode, values))
+
+    def intern_room(self, name):
+        """Return the id for a room name, allocating an empty row if new"""
+        room_id = self.names.get(name)
+        if room_id is None:
+            self._own_arrays()
+            room_id = self.names.add(name)
+            self.offsets.append(self.offsets[-1])
+            self.clue.append(-1)
+            self.hazard.append(-1)
+            self.warning.append(0)
+            self.x.append(float('nan'))
+            self.y.append(float('nan'))
+        return room_id
+
+    def intern_text(self, text):
+        text_id = self.texts.get(text)
+        if text_id is None:
+            text_id = self.texts.add(text)
+        return text_id
+
+    def set_warnings(self, room_id, texts):
+        if self.warning_set_ids is None:
+            self.warning_sets = list(self.warning_sets)
+            self.warning_set_ids = {key: set_id for set_id, key in enumerate(self.warning_sets)}
+        key = tuple(self.intern_text(text) for text in texts)
+        set_id = self.warning_set_ids.get(key)
+        if set_id is None:
+            set_id = len(self.warning_sets)
+            self.warning_sets.append(key)
+            self.warning_set_ids[key] = set_id
+        self.warning[room_id] = set_id
+
+    def warnings_of(self, room_id):
+        return [self.texts[text_id] for text_id in self.warning_sets[self.warning[room_id]]]
+
+    def room_count(self):
+        return len(self.names)
+
+    def neighbors(self, room_id):
+        return self.targets[self.offsets[room_id]:self.offsets[room_id + 1]]
+
+    def has_edge(self, room_a, room_b):
+        return room_b in self.neighbors(room_a)
+
+    def add_edge(self, room_a, room_b):
+        """Append room_b to room_a's row (directed; O(E) splice, meant for rare edits)"""
+        self._own_arrays()
+        end = self.offsets[room_a + 1]
+        self.targets.insert(end, room_b)
+        self._shift_offsets(room_a + 1, 1)
+        self.version += 1
+
+    def _shift_offsets(self, start, delta, stop=None):
+        """Add delta to offsets[start:stop] (the loop runs in C through map)"""
+        stop = len(self.offsets) if stop is None else stop
+        self.offsets[start:stop] = array('i', map(delta.__add__, self.offsets[start:stop]))
+
+    def remove_edge(self, room_a, room_b):
+        self._own_arrays()
+        start, end = self.offsets[room_a], self.offsets[room_a + 1]
+        for i in range(start, end):
+            if self.targets[i] == room_b:
+                del self.targets[i]
+                self._shift_offsets(room_a + 1, -1)
+                self.version += 1
+                return True
+        return False
+
+    def remove_edges(self, pairs):
+        """Remove several directed edges with a single pass over offsets; returns how many existed"""
+        self._own_arrays()
+        offsets, targets = self.offsets, self.targets
+        found = {}
+        for room_a, room_b in pairs:
+            for i in range(offsets[room_a], offsets[room_a + 1]):
+                if targets[i] == room_b:
+                    found[i] = room_a
+                    break
+        if not found:
+            return 0
+        for i in sorted(found, reverse=True):
+            del targets[i]
+        # Rows after the k-th removed edge's row shrink by k
+        rows = sorted(found.values())
+        for k, row in enumerate(rows):
+            stop = rows[k + 1] + 1 if k + 1 < len(rows) else len(offsets)
+            if stop > row + 1:
+                self._shift_offsets(row + 1, -(k + 1), stop)
+        self.version += 1
+        return len(found)
+
+class PathQueries:
+    """Single-search path queries over a CompactLayout, all keyed by room id
+
+    Every search records parent pointers in a flat array and rebuilds the
+    path once at the end, so memory stays O(V) whatever the path depth.
+    blocked is an optional bytearray mask of rooms the search must not enter.
+    search_stats['expanded'] counts the rooms dequeued by the last bfs/nearest.
+    """
+
+    def __init__(self, layout):
+        self.layout = layout
+        self.search_stats = {'expanded': 0}
+        self._edge_span = None
+        self._edge_span_version = -1
+
+    @staticmethod
+    def _walk_back(parent, room_id):
+        path = [room_id]
+        while parent[room_id] >= 0:
+            room_id = parent[room_id]
+            path.append(room_id)
+        path.reverse()
+        return path
+
+    def bfs(self, start, goal, blocked=None):
+        """Shortest path from start to goal (None if unreachable)"""
+        if start == goal:
+            return [start]
+        goal_mask = bytearray(self.layout.room_count())
+        goal_mask[goal] = 1
+        return self.nearest(start, goal_mask, blocked)
+
+    def nearest(self, start, targets, blocked=None):
+        """Path to the closest room whose entry in the targets mask is set"""
+        if targets[start]:
+            return [start]
+        offsets, edges = self.layout.offsets, self.layout.targets
+        parent = array('i', [-1]) * self.layout.room_count()
+        visited = bytearray(blocked) if blocked is not None else bytearray(len(parent))
+        visited[start] = 1
+        queue = deque([start])
+        expanded = 0
+        while queue:
+            current = queue.popleft()
+            expanded += 1
+            for i in range(offsets[current], offsets[current + 1]):
+                neighbor = edges[i]
+                if not visited[neighbor]:
+                    visited[neighbor] = 1
+                    parent[neighbor] = current
+                    if targets[neighbor]:
+                        self.search_stats = {'expanded': expanded}
+                        return self._walk_back(parent, neighbor)
+                    queue.append(neighbor)
+        self.search_stats = {'expanded': expanded}
+        return None
+
+    def bidirectional(self, start, goal, blocked=None):
+        """Shortest path growing level by level from both ends, smaller side first"""
+        if start == goal:
+            return [start]
+        if blocked is not None and (blocked[start] or blocked[goal]):
+            return None
+        offsets, edges = self.layout.offsets, self.layout.targets
+        count = self.layout.room_count()
+        dist_f = array('i', [-1]) * count
+        dist_b = array('i', [-1]) * count
+        parent_f = array('i', [-1]) * count
+        parent_b = array('i', [-1]) * count
+        dist_f[start] = 0
+        dist_b[goal] = 0
+        frontier_f, frontier_b = [start], [goal]
+        while frontier_f and frontier_b:
+            forward = len(frontier_f) <= len(frontier_b)
+            frontier = frontier_f if forward else frontier_b
+            dist, parent = (dist_f, parent_f) if forward else (dist_b, parent_b)
+            other_dist = dist_b if forward else dist_f
+
+            # Expand one whole level; the best meeting point on it is optimal
+            next_frontier = []
+            meet, meet_length = -1, 0
+            for current in frontier:
+                for i in range(offsets[current], offsets[current + 1]):
+                    neighbor = edges[i]
+                    if dist[neighbor] >= 0 or (blocked is not None and blocked[neighbor]):
+                        continue
+                    dist[neighbor] = dist[current] + 1
+                    parent[neighbor] = current
+                    next_frontier.append(neighbor)
+                    if other_dist[neighbor] >= 0:
+                        length = dist[neighbor] + other_dist[neighbor]
+                        if meet < 0 or length < meet_length:
+                            meet, meet_length = neighbor, length
+            if meet >= 0:
+                head = self._walk_back(parent_f, meet)
+                tail = self._walk_back(parent_b, meet)
+                tail.reverse()
+                return head + tail[1:]
+            if forward:
+                frontier_f = next_frontier
+            else:
+                frontier_b = next_frontier
+        return None
+
+    def edge_span(self):
+        """Longest Manhattan length of any connection, cached per layout version
+
+        NaN unless every room has coordinates (max() alone would skip NaN lengths).
+        """
+        layout = self.layout
+        if self._edge_span_version != layout.version:
+            span = 0.0
+            x, y, offsets, edges = layout.x, layout.y, layout.offsets, layout.targets
+            if any(value != value for value in x) or any(value != value for value in y):
+                span = float('nan')
+            else:
+                for room in range(layout.room_count()):
+                    for i in range(offsets[room], offsets[room + 1]):
+                        neighbor = edges[i]
+                        span = max(span, abs(x[room] - x[neighbor]) + abs(y[room] - y[neighbor]))
+            self._edge_span = span
+            self._edge_span_version = layout.version
+        return self._edge_span
+
+    def astar(self, start, goal, blocked=None):
+        """A* using Manhattan distance on room coordinates
+
+        The heuristic is scaled by the longest connection so it never
+        overestimates the hop count. Unless every room has coordinates, this
+        falls back to bidirectional BFS.
+        """
+        layout = self.layout
+        x, y = layout.x, layout.y
+        span = self.edge_span()
+        if span != span or span == 0:
+            return self.bidirectional(start, goal, blocked)
+        if start == goal:
+            return [start]
+        offsets, edges = layout.offsets, layout.targets
+        goal_x, goal_y = x[goal], y[goal]
+        cost = array('i', [-1]) * layout.room_count()
+        parent = array('i', [-1]) * layout.room_count()
+        closed = bytearray(blocked) if blocked is not None else bytearray(len(cost))
+        if closed[start]:
+            return None
+        cost[start] = 0
+        heap = [(0.0, 0, start)]
+        while heap:
+            _, steps, current = heapq.heappop(heap)
+            if current == goal:
+                return self._walk_back(parent, goal)
+            if closed[current]:
+                continue
+            closed[current] = 1
+            for i in range(offsets[current], offsets[current + 1]):
+                neighbor = edges[i]
+                if closed[neighbor]:
+                    continue
+                if cost[neighbor] < 0 or steps + 1 < cost[neighbor]:
+                    cost[neighbor] = steps + 1
+                    parent[neighbor] = current
+                    estimate = (abs(x[neighbor] - goal_x) + abs(y[neighbor] - goal_y)) / span
+                    heapq.heappush(heap, (steps + 1 + estimate, steps + 1, neighbor))
+        return None
+
+class DistanceField:
+    """Hop distance from every room to the nearest of a set of target rooms
+
+    One multi-source BFS outward from the targets (connections are
+    undirected, so this is the reverse search every agent would otherwise
+    run) fills distance[room] (-1 if no target is reachable) and
+    next_hop[room], the neighbour one step closer (-1 at a target or when
+    unreachable). Any number of agents then move toward the targets with
+    two array reads each. Blocked rooms are never entered, but an agent
+    standing in one still gets a way out through its best neighbour.
+    """
+
+    __slots__ = ('layout', 'targets', 'distance', 'next_hop')
+
+    def __init__(self, layout, targets, blocked=None):
+        self.layout = layout
+        offsets, edges = layout.offsets, layout.targets
+        count = layout.room_count()
+        self.targets = sorted(set(targets))
+        dist = array('i', [-1]) * count
+        hop = array('i', [-1]) * count
+        queue = deque()
+        for target in self.targets:
+            if blocked is None or not blocked[target]:
+                dist[target] = 0
+                queue.append(target)
+        while queue:
+            current = queue.popleft()
+            for i in range(offsets[current], offsets[current + 1]):
+                neighbor = edges[i]
+                if dist[neighbor] < 0 and (blocked is None or not blocked[neighbor]):
+                    dist[neighbor] = dist[current] + 1
+                    hop[neighbor] = current
+                    queue.append(neighbor)
+        if blocked is not None:
+            for room in range(count):
+                if blocked[room]:
+                    for i in range(offsets[room], offsets[room + 1]):
+                        neighbor = edges[i]
+                        if not blocked[neighbor] and dist[neighbor] >= 0 and (
+                                dist[room] < 0 or dist[neighbor] + 1 < dist[room]):
+                            dist[room] = dist[neighbor] + 1
+                            hop[room] = neighbor
+        self.distance = dist
+        self.next_hop = hop
+
+    def step(self, room_ids):
+        """Next room id for each agent position (unchanged at a target or when stuck)"""
+        hop = self.next_hop
+        return [room_id if hop[room_id] < 0 else hop[room_id] for room_id in room_ids]
+
+    def distance_from(self, room):
+        """Moves from room to the nearest target (None if none is reachable)"""
+        d = self.distance[self.layout.names.index(room)]
+        return None if d < 0 else d
+
+    def next_room(self, room):
+        """Room to move to from room (None at a target or when none is reachable)"""
+        room_id = self.next_hop[self.layout.names.index(room)]
+        return None if room_id < 0 else self.layout.names[room_id]
+
+    def path_from(self, room):
+        """Shortest path from room to its nearest target (None if unreachable)"""
+        room_id = self.layout.names.index(room)
+        if self.distance[room_id] < 0:
+            return None
+        path = [room_id]
+        while self.next_hop[room_id] >= 0:
+            room_id = self.next_hop[room_id]
+            path.append(room_id)
+        return [self.layout.names[room_id] for room_id in path]
+
+class RoomsView(Mapping):
+    """Read-only name -> [neighbour names] facade over a CompactLayout"""
+
+    def __init__(self, layout):
+        self.layout = layout
+
+    def __getitem__(self, room):
+        layout = self.layout
+        return [layout.names[n] for n in layout.neighbors(layout.names.index(room))]
+
+    def __contains__(self, room):
+        return room in self.layout.names
+
+    def __iter__(self):
+        return iter(self.layout.names)
+
+    def __len__(self):
+        return len(self.layout.names)
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+class TextAttributeView(MutableMapping):
+    """name -> text facade over one of the layout's attribute arrays (clue/hazard)"""
+
+    def __init__(self, layout, attribute):
+        self.layout = layout
+        self.attribute = attribute
+
+    def __getitem__(self, room):
+        room_id = self.layout.names.get(room)
+        text_id = -1 if room_id is None else getattr(self.layout, self.attribute)[room_id]
+        if text_id < 0:
+            raise KeyError(room)
+        return self.layout.texts[text_id]
+
+    def __contains__(self, room):
+        room_id = self.layout.names.get(room)
+        return room_id is not None and getattr(self.layout, self.attribute)[room_id] >= 0
+
+    def __setitem__(self, room, text):
+        # New rooms come in through MansionGraph.add_connection, which keeps the path table sized
+        room_id = self.layout.names.get(room)
+        if room_id is None:
+            raise KeyError(room)
+        getattr(self.layout, self.attribute)[room_id] = self.layout.intern_text(text)
+        self.layout.attribute_version += 1
+
+    def __delitem__(self, room):
+        if room not in self:
+            raise KeyError(room)
+        getattr(self.layout, self.attribute)[self.layout.names.index(room)] = -1
+        self.layout.attribute_version += 1
+
+    def __iter__(self):
+        values = getattr(self.layout, self.attribute)
+        return (self.layout.names[i] for i, text_id in enumerate(values) if text_id >= 0)
+
+    def __len__(self):
+        return sum(1 for text_id in getattr(self.layout, self.attribute) if text_id >= 0)
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+class WarningsView(MutableMapping):
+    """name -> [warning texts] facade over the layout's warning array"""
+
+    def __init__(self, layout):
+        self.layout = layout
+
+    def __getitem__(self, room):
+        room_id = self.layout.names.get(room)
+        if room_id is None or self.layout.warning[room_id] == 0:
+            raise KeyError(room)
+        return self.layout.warnings_of(room_id)
+
+    def __contains__(self, room):
+        room_id = self.layout.names.get(room)
+        return room_id is not None and self.layout.warning[room_id] != 0
+
+    def __setitem__(self, room, texts):
+        room_id = self.layout.names.get(room)
+        if room_id is None:
+            raise KeyError(room)
+        self.layout.set_warnings(room_id, texts)
+
+    def __delitem__(self, room):
+        if room not in self:
+            raise KeyError(room)
+        self.layout.warning[self.layout.names.index(room)] = 0
+
+    def __iter__(self):
+        return (self.layout.names[i] for i, set_id in enumerate(self.layout.warning) if set_id)
+
+    def __len__(self):
+        return sum(1 for set_id in self.layout.warning if set_id)
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+class MansionGraph:
+    """Represents the mansion as a graph for pathfinding"""
+
+    # Named target sets for distance_field: name -> rooms of a mansion
+    FIELD_TARGETS = {
+        'clues': lambda mansion: list(mansion.clues),
+        'safe': lambda mansion: mansion.get_safe_rooms(),
+    }
+    
+    def __init__(self, layout=None):
+        if layout is None:
+            layout = CompactLayout.from_dicts(
+                # Define the mansion layout from the user's description
+                rooms={
+                    'Hall': ['Study', 'Dining Room', 'Conservatory'],
+                    'Study': ['Hall', 'Library'],
+                    'Library': ['Study'],  # Dead end with clue
+                    'Dining Room': ['Hall', 'Kitchen'], 
+                    'Kitchen': ['Dining Room', 'Cellar'],
+                    'Cellar': ['Kitchen'],  # Hazard: gas leak
+                    'Conservatory': ['Hall', 'Secret Passage'],
+                    'Secret Passage': ['Conservatory']  # Hazard: may collapse
+                },
+                # Define clues in each room
+                clues={
+                    'Library': 'Bloodstained glove (belongs to Heiress)',
+                    'Dining Room': 'Shattered wine glass (Butler broke it)',
+                    'Study': 'Suspicious ledger with payments to Chef',
+                    'Kitchen': 'Missing knife (red herring)'
+                },
+                # Define hazards (Wumpus-style)
+                hazards={
+                    'Cellar': 'Gas leak - entering without caution = game over',
+                    'Secret Passage': 'May collapse - you hear rumbling nearby'
+                },
+                # Hazard warnings in adjacent rooms
+                warnings={
+                    'Kitchen': ['You smell gas from the Cellar'],
+                    'Conservatory': ['You hear rumbling from the Secret Passage']
+                },
+                # Grid positions used by the web map (app.js)
+                positions={
+                    'Hall': (2, 2), 'Study': (1, 2), 'Library': (0, 2),
+                    'Dining Room': (2, 1), 'Kitchen': (3, 1), 'Cellar': (4, 1),
+                    'Conservatory': (2, 3), 'Secret Passage': (1, 3)
+                }
+            )
+        
+        # Integer-indexed storage; the name-keyed attributes are thin views over it
+        self.layout = layout
+        self.rooms = RoomsView(layout)
+        self.clues = TextAttributeView(layout, 'clue')
+        self.hazards = TextAttributeView(layout, 'hazard')
+        self.warnings = WarningsView(layout)
+        self.paths = PathQueries(layout)
+
+        # Precomputed next-hop/distance table (built on demand)
+        self.path_table = None
+        # (targets key, avoid_hazards) -> (layout stamp, DistanceField)
+        self._distance_fields = {}
+
+    @classmethod
+    def from_dicts(cls, rooms, clues=None, hazards=None, warnings=None, positions=None):
+        """Build a mansion from name-keyed dicts (e.g. a generated world)"""
+        return cls(CompactLayout.from_dicts(rooms, clues, hazards, warnings, positions))
+
+    def build_path_table(self):
+        """Precompute the all-pairs next-hop/distance table"""
+        self.path_table = ShortestPathTable(self)
+        return self.path_table
+
+    def add_connection(self, room_a, room_b):
+        """Connect two rooms (both directions), updating the path table"""
+        layout = self.layout
+        for room in (room_a, room_b):
+            if room not in layout.names:
+                layout.intern_room(room)
+                if self.path_table is not None:
+                    self.path_table.room_added()
+        id_a, id_b = layout.names.index(room_a), layout.names.index(room_b)
+        if not layout.has_edge(id_a, id_b):
+            layout.add_edge(id_a, id_b)
+        if not layout.has_edge(id_b, id_a):
+            layout.add_edge(id_b, id_a)
+        if self.path_table is not None:
+            self.path_table.connection_added(id_a, id_b)
+
+    def remove_connection(self, room_a, room_b):
+        """Remove a connection (e.g. a collapsed passage), updating the path table"""
+        layout = self.layout
+        if room_a not in layout.names or room_b not in layout.names:
+            return
+        id_a, id_b = layout.names.index(room_a), layout.names.index(room_b)
+        layout.remove_edge(id_a, id_b)
+        layout.remove_edge(id_b, id_a)
+        if self.path_table is not None:
+            self.path_table.connection_removed(id_a, id_b)
+
+    def remove_connections(self, pairs):
+        """remove_connection for many (room, room) pairs, editing the adjacency only once"""
+        names = self.layout.names
+        pairs = [(names.index(room_a), names.index(room_b)) for room_a, room_b in pairs
+                 if room_a in names and room_b in names]
+        self.layout.remove_edges(pairs + [(id_b, id_a) for id_a, id_b in pairs])
+        if self.path_table is not None:
+            for id_a, id_b in pairs:
+                self.path_table.connection_removed(id_a, id_b)
+
+    def shortest_path(self, start, goal):
+        """Shortest path via the precomputed table, falling back to BFS"""
+        if self.path_table is None:
+            return self.bfs_pathfind(start, goal)
+        return self.path_table.path(start, goal)
+
+    def bfs_pathfind(self, start, goal):
+        """Find shortest path using BFS"""
+        if start == goal:
+            return [start]
+        names = self.layout.names
+        return self._to_names(self.paths.bfs(names.index(start), names.index(goal)))
+
+    def bidirectional_path(self, start, goal, avoid=()):
+        """Shortest path searched from both ends at once"""
+        names = self.layout.names
+        return self._to_names(self.paths.bidirectional(
+            names.index(start), names.index(goal), self._room_mask(avoid)))
+
+    def astar_path(self, start, goal, avoid=()):
+        """Goal-directed shortest path using the rooms' grid positions"""
+        names = self.layout.names
+        return self._to_names(self.paths.astar(
+            names.index(start), names.index(goal), self._room_mask(avoid)))
+
+    def nearest_room(self, start, targets, avoid=()):
+        """Path to the closest room among targets (names or a predicate), in one BFS"""
+        if callable(targets):
+            targets = [room for room in self.layout.names if targets(room)]
+        mask = self._room_mask(targets)
+        if mask is None:
+            return None
+        return self._to_names(self.paths.nearest(
+            self.layout.names.index(start), mask, self._room_mask(avoid)))
+
+    def nearest_unfound_clue(self, start, found_rooms=(), avoid=()):
+        """Path to the closest room whose clue has not been picked up yet"""
+        found = set(found_rooms)
+        return self.nearest_room(start, [room for room in self.clues if room not in found], avoid)
+
+    def nearest_safe_room(self, start, avoid=()):
+        """Path to the closest room without a hazard, not counting start"""
+        layout = self.layout
+        start_id = layout.names.index(start)
+        mask = bytearray(1 if hazard < 0 else 0 for hazard in layout.hazard)
+        mask[start_id] = 0
+        return self._to_names(self.paths.nearest(start_id, mask, self._room_mask(avoid)))
+
+    def distance_field(self, targets, avoid_hazards=True):
+        """Shared DistanceField toward targets, rebuilt only once the mansion has changed
+
+        targets is a FIELD_TARGETS name ('clues', 'safe'), one room name or
+        an iterable of room names (e.g. case.CRIME_SCENE, case.EXITS).
+        Every caller asking for the same targets gets the same field, so
+        moving any number of NPCs costs one BFS per change to the rooms,
+        connections, clues or hazards rather than one per NPC per tick.
+        With avoid_hazards, rooms with a hazard are never entered.
+        """
+        if isinstance(targets, str):
+            key = targets
+        else:
+            targets = list(targets)
+            key = frozenset(targets)
+        layout = self.layout
+        stamp = (layout.version, layout.attribute_version, layout.room_count())
+        cached = self._distance_fields.get((key, avoid_hazards))
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+
+        if isinstance(targets, str):
+            targets = self.FIELD_TARGETS[targets](self) if targets in self.FIELD_TARGETS else [targets]
+        blocked = None
+        if avoid_hazards:
+            blocked = bytearray(1 if hazard >= 0 else 0 for hazard in layout.hazard)
+        field = DistanceField(layout, [layout.names.index(room) for room in targets], blocked)
+        self._distance_fields[key, avoid_hazards] = (stamp, field)
+        return field
+
+    def _room_mask(self, rooms):
+        """bytearray with 1 for every named room (None if there are none)"""
+        mask = None
+        for room in rooms:
+            if mask is None:
+                mask = bytearray(self.layout.room_count())
+            mask[self.layout.names.index(room)] = 1
+        return mask
+
+    def _to_names(self, path):
+        if path is None:
+            return None
+        return [self.layout.names[room_id] for room_id in path]
+
+    def get_safe_rooms(self):
+        """Get rooms that are safe to enter"""
+        layout = self.layout
+        return [layout.names[i] for i, hazard in enumerate(layout.hazard) if hazard < 0]
+
+    def check_hazard_warnings(self, current_room):
+        """Wumpus-style inference: check for hazard warnings"""
+        room_id = self.layout.names.get(current_room)
+        if room_id is None:
+            return []
+        return self.layout.warnings_of(room_id)
+
+class ShortestPathTable:
+    """All-pairs next-hop/distance table with incremental edge updates
+
+    One BFS tree is kept per target room id: distance[target][room] is the
+    hop count from room to target (-1 if unreachable) and next_hop[target][room]
+    is the neighbour one step closer. Connections are undirected, so a path
+    lookup just follows next_hop and costs O(1) per step. Adding or removing
+    a connection only touches the trees (and the subtrees within them) whose
+    distances change.
+    """
+
+    def __init__(self, mansion):
+        self.mansion = mansion
+        self.layout = mansion.layout
+        self.distance = []
+        self.next_hop = []
+        for target in range(self.layout.room_count()):
+            self._build_tree(target)
+
+    def _build_tree(self, target):
+        """Plain BFS outward from the target"""
+        offsets, targets = self.layout.offsets, self.layout.targets
+        count = self.layout.room_count()
+        dist = array('i', [-1]) * count
+        hop = array('i', [-1]) * count
+        dist[target] = 0
+        queue = deque([target])
+        while queue:
+            current = queue.popleft()
+            for i in range(offsets[current], offsets[current + 1]):
+                neighbor = targets[i]
+                if dist[neighbor] < 0:
+                    dist[neighbor] = dist[current] + 1
+                    hop[neighbor] = current
+                    queue.append(neighbor)
+        self.distance.append(dist)
+        self.next_hop.append(hop)
+
+    def distance_between(self, start, goal):
+        """Number of moves from start to goal (None if unreachable)"""
+        names = self.layout.names
+        d = self.distance[names.index(goal)][names.index(start)]
+        return None if d < 0 else d
+
+    def next_room(self, start, goal):
+        """First room to move to on a shortest path from start to goal"""
+        names = self.layout.names
+        room_id = self.next_hop[names.index(goal)][names.index(start)]
+        return None if room_id < 0 else self.layout.names[room_id]
+
+    def path(self, start, goal):
+        """Reconstruct the shortest path by following next hops"""
+        if start == goal:
+            return [start]
+        path_ids = self.path_ids(self.layout.names.index(start), self.layout.names.index(goal))
+        if path_ids is None:
+            return None
+        return [self.layout.names[room_id] for room_id in path_ids]
+
+    def path_ids(self, start, goal):
+        if self.distance[goal][start] < 0:
+            return None
+        hop = self.next_hop[goal]
+        path = [start]
+        current = start
+        while current != goal:
+            current = hop[current]
+            path.append(current)
+        return path
+
+    def room_added(self):
+        """Grow every tree by the newly interned (still unconnected) room"""
+        for dist, hop in zip(self.distance, self.next_hop):
+            dist.append(-1)
+            hop.append(-1)
+        self._build_tree(self.layout.room_count() - 1)
+
+    def connection_added(self, room_a, room_b):
+        """Shorten distances that can now go through the new connection"""
+        for target, dist in enumerate(self.distance):
+            dist_a = dist[room_a]
+            dist_b = dist[room_b]
+            if dist_a >= 0 and (dist_b < 0 or dist_a + 1 < dist_b):
+                self._propagate_decrease(target, room_b, room_a)
+            elif dist_b >= 0 and (dist_a < 0 or dist_b + 1 < dist_a):
+                self._propagate_decrease(target, room_a, room_b)
+
+    def _propagate_decrease(self, target, room, via):
+        """Re-parent room under via and push the improvement outward"""
+        offsets, targets = self.layout.offsets, self.layout.targets
+        dist = self.distance[target]
+        hop = self.next_hop[target]
+        dist[room] = dist[via] + 1
+        hop[room] = via
+        queue = deque([room])
+        while queue:
+            current = queue.popleft()
+            for i in range(offsets[current], offsets[current + 1]):
+                neighbor = targets[i]
+                known = dist[neighbor]
+                if known < 0 or dist[current] + 1 < known:
+                    dist[neighbor] = dist[current] + 1
+                    hop[neighbor] = current
+                    queue.append(neighbor)
+
+    def connection_removed(self, room_a, room_b):
+        """Repair only the trees that routed through the removed connection"""
+        for target, hop in enumerate(self.next_hop):
+            if hop[room_a] == room_b:
+                self._repair_subtree(target, room_a)
+            elif hop[room_b] == room_a:
+                self._repair_subtree(target, room_b)
+
+    def _repair_subtree(self, target, cut_room):
+        """Reattach the subtree hanging below cut_room to the rest of the tree"""
+        offsets, targets = self.layout.offsets, self.layout.targets
+        dist = self.distance[target]
+        hop = self.next_hop[target]
+
+        # Collect every room whose next-hop chain passed through cut_room
+        orphaned = {cut_room}
+        queue = deque([cut_room])
+        while queue:
+            current = queue.popleft()
+            for i in range(offsets[current], offsets[current + 1]):
+                neighbor = targets[i]
+                if neighbor not in orphaned and hop[neighbor] == current:
+                    orphaned.add(neighbor)
+                    queue.append(neighbor)
+        for room in orphaned:
+            dist[room] = -1
+            hop[room] = -1
+
+        # Seed from the intact boundary, then settle orphans in distance order
+        frontier = []
+        for room in orphaned:
+            for i in range(offsets[room], offsets[room + 1]):
+                neighbor = targets[i]
+                if dist[neighbor] >= 0:
+                    heapq.heappush(frontier, (dist[neighbor] + 1, room, neighbor))
+        while frontier:
+            d, room, via = heapq.heappop(frontier)
+            if dist[room] >= 0:
+                continue
+            dist[room] = d
+            hop[room] = via
+            for i in range(offsets[room], offsets[room + 1]):
+                neighbor = targets[i]
+                if dist[neighbor] < 0 and neighbor in orphaned:
+                    heapq.heappush(frontier, (d + 1, neighbor, room))
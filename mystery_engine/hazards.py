@@ -0,0 +1,334 @@
+"""Hazards that change over time, and the safe region they leave the player
+
+HazardSpread advances the mansion's hazards one tick at a time: gas seeps
+from every gas-filled room into its neighbours, and the passages of
+collapse-prone rooms cave in. Changes go through MansionGraph (hazards,
+warnings, remove_connections), so the path table and distance fields stay
+in step; a WumpusInference handed to it forgets any belief that a room the
+gas reaches is safe. Only the hazard frontier is looked at: gas rooms that
+still have a clear neighbour, collapse-prone rooms that still have a
+passage.
+
+SafeRegion keeps the set of rooms reachable from the player without
+entering a hazard as a spanning tree. A room going bad or a passage
+caving in only re-attaches the subtree that hung below it; a new passage
+only grows the region from that point.
+
+    region = SafeRegion(mansion, 'Hall')
+    spread = HazardSpread(mansion, seed=7, region=region)
+    for _ in range(10):
+        changes = spread.tick()
+    'Library' in region
+"""
+
+from array import array
+from collections import deque
+import random
+
+from .generator import HAZARDS
+
+# HAZARDS entries that evolve: gas spreads, collapse-prone rooms lose passages
+GAS_LEAK, COLLAPSE = HAZARDS[0], HAZARDS[1]
+
+class SafeRegion:
+    """Rooms reachable from start without entering a hazard, maintained incrementally
+
+    parent[room] is the room's parent in a spanning tree of the region (the
+    root is its own parent, -1 outside the region). search_stats['touched']
+    counts the rooms the last update looked at.
+    """
+
+    def __init__(self, mansion, start):
+        self.mansion = mansion
+        self.layout = mansion.layout
+        self.search_stats = {'touched': 0}
+        self.reset(start)
+
+    def reset(self, start):
+        """Rebuild the region around start (e.g. after the player has moved out of it)"""
+        count = self.layout.room_count()
+        self.root = self.layout.names.index(start)
+        self.parent = array('i', [-1]) * count
+        self.size = 0
+        if not self._blocked(self.root):
+            self.parent[self.root] = self.root
+            self.size = 1
+            self.search_stats = {'touched': self._grow([self.root])}
+
+    def __contains__(self, room):
+        room_id = self.layout.names.get(room)
+        return room_id is not None and room_id < len(self.parent) and self.parent[room_id] >= 0
+
+    def __iter__(self):
+        names = self.layout.names
+        return (names[room_id] for room_id, parent in enumerate(self.parent) if parent >= 0)
+
+    def __len__(self):
+        return self.size
+
+    def _blocked(self, room_id):
+        return self.layout.hazard[room_id] >= 0
+
+    def _fit(self):
+        """Extend parent for rooms interned since the region was built"""
+        missing = self.layout.room_count() - len(self.parent)
+        if missing > 0:
+            self.parent.extend(array('i', [-1]) * missing)
+
+    def _grow(self, frontier):
+        """Attach every clear room reachable from the frontier rooms (already in the region)"""
+        offsets, targets = self.layout.offsets, self.layout.targets
+        hazard = self.layout.hazard
+        parent = self.parent
+        queue = deque(frontier)
+        touched = 0
+        while queue:
+            current = queue.popleft()
+            touched += 1
+            for i in range(offsets[current], offsets[current + 1]):
+                neighbor = targets[i]
+                if parent[neighbor] < 0 and hazard[neighbor] < 0:
+                    parent[neighbor] = current
+                    self.size += 1
+                    queue.append(neighbor)
+        return touched
+
+    def _leads_home(self, room_id, home, lost):
+        """True if room_id's tree path reaches the root; memoized in home/lost"""
+        parent = self.parent
+        path = []
+        while room_id != self.root and room_id not in home:
+            if room_id in lost or parent[room_id] < 0:
+                lost.update(path)
+                return False
+            path.append(room_id)
+            room_id = parent[room_id]
+        home.update(path)
+        return True
+
+    def _rehang(self, top, home, lost):
+        """Search top's detached subtree for a room next to the intact region
+
+        On success that room becomes the subtree's new top, hanging from its
+        intact neighbour, and the tree path up to the old top is reversed.
+        Returns (success, rooms looked at).
+        """
+        offsets, targets = self.layout.offsets, self.layout.targets
+        parent = self.parent
+        subtree = [top]
+        for current in subtree:
+            for i in range(offsets[current], offsets[current + 1]):
+                neighbor = targets[i]
+                if parent[neighbor] == current:
+                    subtree.append(neighbor)
+                elif parent[neighbor] >= 0 and self._leads_home(neighbor, home, lost):
+                    previous = neighbor
+                    while True:
+                        above = parent[current]
+                        parent[current] = previous
+                        if current == top:
+                            return True, len(subtree)
+                        previous, current = current, above
+        return False, len(subtree)
+
+    def _detach(self, dead_rooms, cut_rooms=()):
+        """Take dead_rooms out of the region and mend the tree around them
+
+        cut_rooms are rooms whose link to their parent is gone. The subtree
+        below each cut room, and below each child of a dead room, is
+        searched breadth-first for a room next to the intact region and
+        re-hung from there, so the cost is the part of the subtree searched
+        before such a room turns up. Subtrees with no way back are dropped.
+        """
+        offsets, targets = self.layout.offsets, self.layout.targets
+        parent = self.parent
+        if self.root in dead_rooms:
+            # The player's own room: nothing is safely reachable any more
+            touched = self.size
+            for room_id in range(len(parent)):
+                parent[room_id] = -1
+            self.size = 0
+            return touched
+
+        tops = list(cut_rooms)
+        dead = [room_id for room_id in dead_rooms if parent[room_id] >= 0]
+        for room_id in dead:
+            parent[room_id] = -2  # Marks rooms being detached
+        for room_id in dead:
+            for i in range(offsets[room_id], offsets[room_id + 1]):
+                neighbor = targets[i]
+                if parent[neighbor] == room_id:
+                    tops.append(neighbor)
+        for room_id in dead:
+            parent[room_id] = -1
+        self.size -= len(dead)
+        touched = len(dead)
+        for top in tops:
+            parent[top] = -2
+
+        # One re-hung subtree can be another's way home, so retry until none succeeds
+        home = set()
+        pending, progress = tops, True
+        while pending and progress:
+            progress, failed = False, []
+            for top in pending:
+                lost = set()
+                rehung, looked_at = self._rehang(top, home, lost)
+                touched += looked_at
+                if rehung:
+                    progress = True
+                else:
+                    failed.append(top)
+            pending = failed
+
+        # What is left is cut off from the player
+        for top in pending:
+            subtree = [top]
+            for current in subtree:
+                for i in range(offsets[current], offsets[current + 1]):
+                    if parent[targets[i]] == current:
+                        subtree.append(targets[i])
+            for room_id in subtree:
+                parent[room_id] = -1
+            self.size -= len(subtree)
+        return touched
+
+    def rooms_blocked(self, room_ids):
+        """Rooms that now hold a hazard, handled in one pass"""
+        self._fit()
+        self.search_stats = {'touched': self._detach(room_ids)}
+
+    def room_blocked(self, room_id):
+        """A room now holds a hazard"""
+        self.rooms_blocked([room_id])
+
+    def connection_removed(self, room_a, room_b):
+        """A passage between two rooms is gone"""
+        self._fit()
+        touched = 0
+        if self.parent[room_a] == room_b and room_a != self.root:
+            touched = self._detach((), [room_a])
+        elif self.parent[room_b] == room_a and room_b != self.root:
+            touched = self._detach((), [room_b])
+        self.search_stats = {'touched': touched}
+
+    def connection_added(self, room_a, room_b):
+        """A new passage between two rooms"""
+        self._fit()
+        touched = 0
+        for inside, outside in ((room_a, room_b), (room_b, room_a)):
+            if (self.parent[inside] >= 0 and self.parent[outside] < 0
+                    and not self._blocked(outside)):
+                self.parent[outside] = inside
+                self.size += 1
+                touched = self._grow([outside])
+        self.search_stats = {'touched': touched}
+
+class HazardSpread:
+    """Advances a mansion's hazards tick by tick, touching only the hazard frontier
+
+    Each tick, every gas-filled room fills each clear neighbour with
+    probability gas_rate, and every passage of a collapse-prone room caves
+    in with probability collapse_rate. New hazards bring the usual warnings
+    to the rooms next to them; a caved-in passage takes its warning with it.
+    An optional SafeRegion is kept up to date as well, and an optional
+    WumpusInference is told which rooms turned hazardous.
+    """
+
+    def __init__(self, mansion, gas_rate=0.25, collapse_rate=0.05, seed=None, region=None,
+                 inference=None):
+        self.mansion = mansion
+        self.layout = mansion.layout
+        self.gas_rate = gas_rate
+        self.collapse_rate = collapse_rate
+        self.rng = random.Random(seed)
+        self.region = region
+        self.inference = inference
+        self.ticks = 0
+        # Last tick: hazard frontier scanned, and rooms the region update looked at
+        self.search_stats = {'frontier': 0, 'touched': 0}
+        layout = self.layout
+        self.gas_text = layout.intern_text(GAS_LEAK[0])
+        collapse_text = layout.intern_text(COLLAPSE[0])
+        # The one full scan: where each evolving hazard starts from
+        self.gas_frontier = {room_id for room_id, text_id in enumerate(layout.hazard)
+                             if text_id == self.gas_text}
+        self.collapse_frontier = {room_id for room_id, text_id in enumerate(layout.hazard)
+                                  if text_id == collapse_text}
+
+    def tick(self):
+        """Advance one step; returns {'gassed': [rooms], 'collapsed': [(room, room)]}"""
+        layout = self.layout
+        rng = self.rng
+        self.ticks += 1
+        frontier = len(self.gas_frontier) + len(self.collapse_frontier)
+
+        spreading = set()
+        for room_id in list(self.gas_frontier):
+            clear = [neighbor for neighbor in layout.neighbors(room_id)
+                     if layout.hazard[neighbor] < 0]
+            if not clear:
+                self.gas_frontier.discard(room_id)  # Surrounded: gas has nowhere left to go
+                continue
+            spreading.update(neighbor for neighbor in clear if rng.random() < self.gas_rate)
+
+        caving = []
+        for room_id in list(self.collapse_frontier):
+            passages = list(layout.neighbors(room_id))
+            if not passages:
+                self.collapse_frontier.discard(room_id)
+                continue
+            caving.extend((room_id, neighbor) for neighbor in passages
+                          if rng.random() < self.collapse_rate)
+
+        spreading = sorted(spreading)
+        for room_id in spreading:
+            self._fill_with_gas(room_id)
+        touched = 0
+        if self.region is not None and spreading:
+            self.region.rooms_blocked(spreading)
+            touched += self.region.search_stats['touched']
+        caving = [(room_id, neighbor) for room_id, neighbor in caving
+                  if layout.has_edge(room_id, neighbor)]
+        if caving:
+            self._cave_in(caving)
+            if self.region is not None:
+                for room_id, neighbor in caving:
+                    self.region.connection_removed(room_id, neighbor)
+                    touched += self.region.search_stats['touched']
+        self.search_stats = {'frontier': frontier, 'touched': touched}
+        gassed = [layout.names[room_id] for room_id in spreading]
+        if self.inference is not None and (spreading or caving):
+            self.inference.hazards_changed(gassed)
+        return {'gassed': gassed,
+                'collapsed': [(layout.names[room_id], layout.names[neighbor])
+                              for room_id, neighbor in caving]}
+
+    def _fill_with_gas(self, room_id):
+        layout = self.layout
+        room = layout.names[room_id]
+        self.mansion.hazards[room] = GAS_LEAK[0]
+        warning = GAS_LEAK[1].format(room=room)
+        for neighbor in layout.neighbors(room_id):
+            warnings = layout.warnings_of(neighbor)
+            if warning not in warnings:
+                layout.set_warnings(neighbor, warnings + [warning])
+        self.gas_frontier.add(room_id)
+
+    def _cave_in(self, passages):
+        layout = self.layout
+        names = layout.names
+        # One adjacency edit for the whole tick
+        self.mansion.remove_connections([(names[room_id], names[neighbor])
+                                         for room_id, neighbor in passages])
+        # Neither room can sense the other's hazard through rubble
+        for room_id, neighbor in passages:
+            for listener, source in ((neighbor, room_id), (room_id, neighbor)):
+                if layout.hazard[source] < 0:
+                    continue
+                warnings = layout.warnings_of(listener)
+                remaining = [text for text in warnings
+                             if text not in {warning.format(room=names[source])
+                                             for _, warning in HAZARDS}]
+                if len(remaining) != len(warnings):
+                    layout.set_warnings(listener, remaining)
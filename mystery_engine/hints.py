@@ -0,0 +1,68 @@
+"""Hints: which unexplored room or unasked suspect would tell the detective most
+
+Every room with a clue not yet searched, and every suspect with a dialogue
+tree not yet interrogated, is a candidate. Its value is what its evidence
+would do to the current MurderMysteryCSP solution: whether the best
+hypothesis changes, how far the marginals move and how confidence moves.
+All candidates are scored together by MurderMysteryCSP.counterfactuals,
+one vectorized pass over the assignment space, so ranking hundreds of them
+takes milliseconds.
+
+    csp = build_case_csp(found)
+    for hint in rank_hints(csp, case_candidates(mansion, found_rooms, interrogated)):
+        print(hint['kind'], hint['target'], hint['shift'])
+
+Dialogue trees carry no evidence of their own; what a suspect can give
+away is TESTIMONY_EVIDENCE, the same as when the server interrogates them.
+"""
+
+from .case import ROOM_EVIDENCE, SUSPECTS, TESTIMONY_EVIDENCE
+
+def case_candidates(mansion, found_rooms=(), interrogated=(), evidence=(), dialogue_library=None):
+    """{(kind, target): [(Constraint, weight)]} of the Ashford case's unexplored leads
+
+    kind is 'room' or 'suspect'. Evidence already held adds nothing, so
+    leads whose every clue is in evidence are left out. With a
+    dialogue_library, only suspects that have a dialogue tree are offered.
+    """
+    from .csp import MurderMysteryCSP
+
+    held = set(evidence)
+    leads = [('room', room, ROOM_EVIDENCE.get(room, ()))
+             for room in mansion.clues if room not in found_rooms]
+    leads += [('suspect', suspect, TESTIMONY_EVIDENCE.get(suspect, ()))
+              for suspect in SUSPECTS if suspect not in interrogated
+              and (dialogue_library is None or dialogue_library.has_tree(suspect))]
+    candidates = {}
+    for kind, target, clue_names in leads:
+        constraints = [pair for clue_name in clue_names if clue_name not in held
+                       for pair in MurderMysteryCSP.clue_constraints(clue_name)]
+        if constraints:
+            candidates[(kind, target)] = constraints
+    return candidates
+
+def world_candidates(directory, found_rooms=()):
+    """Like case_candidates for a generated world: one candidate per unsearched clue room"""
+    from .generator import clue_record_constraints, read_world_clues
+
+    _, records = read_world_clues(directory)
+    candidates = {}
+    for record in records:
+        if record['room'] not in found_rooms:
+            candidates.setdefault(('room', record['room']), []).extend(
+                clue_record_constraints(record))
+    return candidates
+
+def rank_hints(csp, candidates, top=None, temperature=1.0):
+    """Candidates scored by counterfactuals, most informative first
+
+    Leads that would change the best hypothesis come first, then those that
+    move the marginals most, then those that raise confidence most. Each
+    hint is the counterfactual result plus 'kind' and 'target'.
+    """
+    results = csp.counterfactuals(candidates, temperature)
+    hints = [{'kind': kind, 'target': target, **result}
+             for (kind, target), result in results.items()]
+    hints.sort(key=lambda hint: (hint['changes_solution'], hint['shift'],
+                                 hint['confidence_gain']), reverse=True)
+    return hints if top is None else hints[:top]
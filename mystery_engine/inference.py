@@ -0,0 +1,337 @@
+"""Wumpus-style knowledge base and hazard inference"""
+
+from array import array
+from collections import deque
+
+# Predicates are statement templates; a fact pairs one with an interned room id
+VISITED_SURVIVED = 'visited_{}_survived'
+GAS_DETECTED = 'gas_detected_from_{}'
+RUMBLING_DETECTED = 'rumbling_detected_from_{}'
+GAS_MASK_EQUIPPED = 'gas_mask_equipped'
+STRUCTURE_REINFORCED = 'structure_reinforced'
+
+# Predicates that take a room, split around the room name, for parsing whole statements
+ROOM_PREDICATES = {predicate: tuple(predicate.split('{}'))
+                   for predicate in (VISITED_SURVIVED, GAS_DETECTED, RUMBLING_DETECTED)}
+
+# Sensing predicate -> the fact that makes the rooms it warns about safe to enter
+PROTECTIONS = {GAS_DETECTED: GAS_MASK_EQUIPPED, RUMBLING_DETECTED: STRUCTURE_REINFORCED}
+
+# Word in a hazard description (MansionGraph.hazards) -> the fact that makes its room
+# safe to enter; hazards matching none of them are never safe
+HAZARD_PROTECTIONS = {'gas': GAS_MASK_EQUIPPED, 'collapse': STRUCTURE_REINFORCED}
+
+class KnowledgeBase:
+    """Set of (predicate, room id) facts indexed by predicate and by room
+
+    Room arguments are interned through the mansion layout's name table, so
+    any room name works, underscores and spaces included. Iterating yields
+    the facts as readable statements such as 'visited_Kitchen_survived', and
+    such a statement is accepted wherever a predicate without a room is.
+    """
+    def __init__(self, layout):
+        self.layout = layout
+        self.facts = set()
+        self.by_predicate = {}
+        self.by_room = {}
+        self.version = 0
+    
+    def fact(self, predicate, room=None):
+        """Interned fact for predicate(room); room may be a name or an id"""
+        if room is None:
+            return self.parse(predicate)
+        if isinstance(room, str):
+            room = self.layout.names.index(room)
+        return (predicate, room)
+    
+    def parse(self, statement):
+        """Fact for a whole statement such as 'visited_Kitchen_survived'
+        
+        Statements naming no known room are facts without a room, so
+        'gas_mask_equipped' parses to (GAS_MASK_EQUIPPED, None).
+        """
+        for predicate, (prefix, suffix) in ROOM_PREDICATES.items():
+            if (len(statement) > len(prefix) + len(suffix) and statement.startswith(prefix)
+                    and statement.endswith(suffix)):
+                room_id = self.layout.names.get(statement[len(prefix):len(statement) - len(suffix)])
+                if room_id is not None:
+                    return (predicate, room_id)
+        return (statement, None)
+    
+    def add(self, predicate, room=None):
+        """Assert a fact; returns it if it is new, otherwise None"""
+        fact = self.fact(predicate, room)
+        if fact in self.facts:
+            return None
+        self.facts.add(fact)
+        self.by_predicate.setdefault(predicate, set()).add(fact[1])
+        if fact[1] is not None:
+            self.by_room.setdefault(fact[1], set()).add(fact)
+        self.version += 1
+        return fact
+    
+    def holds(self, predicate, room=None):
+        return self.fact(predicate, room) in self.facts
+    
+    def rooms_with(self, predicate):
+        """Room ids for which predicate holds"""
+        return self.by_predicate.get(predicate, set())
+    
+    def facts_about(self, room):
+        if isinstance(room, str):
+            room = self.layout.names.index(room)
+        return self.by_room.get(room, set())
+    
+    def statement(self, fact):
+        predicate, room_id = fact
+        return predicate if room_id is None else predicate.format(self.layout.names[room_id])
+    
+    def __contains__(self, item):
+        if isinstance(item, tuple):
+            return item in self.facts
+        return self.parse(item) in self.facts
+    
+    def __iter__(self):
+        return (self.statement(fact) for fact in self.facts)
+    
+    def __len__(self):
+        return len(self.facts)
+
+class WumpusInference:
+    def __init__(self, mansion, on_event=None, verbose=True):
+        self.mansion = mansion
+        self.on_event = on_event  # Optional diagnostics hook: on_event(event, details)
+        self.verbose = verbose  # Narrate moves, warnings and clues on stdout
+        self.knowledge_base = KnowledgeBase(mansion.layout)  # Propositional logic statements
+        self.safe_rooms = set()
+        self.dangerous_rooms = set()
+        self.current_room = 'Hall'  # Start in the Hall
+        # Forward-chaining rules triggered by each predicate
+        self.rules = {
+            VISITED_SURVIVED: [self._survived_rule],
+            GAS_DETECTED: [self._warning_rule],
+            RUMBLING_DETECTED: [self._warning_rule],
+            GAS_MASK_EQUIPPED: [self._equipment_rule],
+            STRUCTURE_REINFORCED: [self._equipment_rule],
+        }
+        # Bumped whenever the answer of can_safely_enter may change
+        self.version = 0
+        self._passable = None
+        self._passable_stamp = None
+        self._routes = {}
+        
+    def add_knowledge(self, predicate, room=None):
+        """Add a fact to the KB and forward-chain from it"""
+        fact = self.knowledge_base.add(predicate, room)
+        if fact is not None:
+            self._forward_chain([fact])
+        return fact
+        
+    def infer_safe_rooms(self):
+        """Re-derive the safe rooms from every fact in the KB"""
+        self._forward_chain(list(self.knowledge_base.facts))
+    
+    def _forward_chain(self, facts):
+        """Fire the rules affected by new facts until nothing new is derived
+        
+        Each newly safe room only looks at its own neighbours, so a move
+        costs time proportional to the rooms it affects, not the KB size.
+        """
+        layout = self.mansion.layout
+        newly_safe = deque()
+        for fact in facts:
+            for rule in self.rules.get(fact[0], ()):
+                newly_safe.extend(rule(fact[1]))
+        
+        while newly_safe:
+            room_id = newly_safe.popleft()
+            room = layout.names[room_id]
+            if room in self.safe_rooms:
+                continue
+            self.safe_rooms.add(room)
+            self.dangerous_rooms.discard(room)
+            self._safety_changed()
+            # A safe room with no hazard warnings has no hazardous neighbours
+            if not layout.warning_sets[layout.warning[room_id]]:
+                for adjacent in layout.neighbors(room_id):
+                    if layout.hazard[adjacent] < 0:
+                        newly_safe.append(adjacent)
+    
+    def _survived_rule(self, room_id):
+        # If we've been in a room and survived, it's safe
+        return [room_id]
+    
+    def _warning_rule(self, room_id):
+        # A warning means some neighbour not yet known to be safe holds the hazard
+        layout = self.mansion.layout
+        for adjacent in layout.neighbors(room_id):
+            room = layout.names[adjacent]
+            if room not in self.safe_rooms:
+                self._mark_dangerous(room)
+        return []
+    
+    def _equipment_rule(self, room_id):
+        self._safety_changed()
+        return []
+    
+    def _mark_dangerous(self, room):
+        if room not in self.dangerous_rooms:
+            self.dangerous_rooms.add(room)
+            self._safety_changed()
+    
+    def _safety_changed(self):
+        """Invalidate planned routes once the safe/dangerous picture changes"""
+        self.version += 1
+        self._passable = None
+        self._routes.clear()
+    
+    def hazards_changed(self, rooms):
+        """Rooms whose hazard appeared after the fact (see hazards.HazardSpread)
+        
+        Whatever was inferred about them no longer holds, so they leave the
+        safe rooms and every planned route is dropped.
+        """
+        for room in rooms:
+            self.safe_rooms.discard(room)
+        self._safety_changed()
+    
+    def _emit(self, event, **details):
+        if self.on_event is not None:
+            self.on_event(event, details)
+    
+    def detect_hazards(self, current_room):
+        """Detect hazards using sensor information"""
+        warnings = self.mansion.check_hazard_warnings(current_room)
+        
+        if warnings:
+            if self.verbose:
+                print(f"HAZARD DETECTION in {current_room}:")
+            for warning in warnings:
+                if self.verbose:
+                    print(f"  ⚠️  {warning}")
+                
+                # Add logical statements to knowledge base
+                if "gas" in warning.lower():
+                    self.add_knowledge(GAS_DETECTED, current_room)
+                    
+                if "rumbling" in warning.lower():
+                    self.add_knowledge(RUMBLING_DETECTED, current_room)
+        
+        # Record that we visited this room and survived
+        self.add_knowledge(VISITED_SURVIVED, current_room)
+        
+        return warnings
+    
+    def can_safely_enter(self, room):
+        """Determine if it's safe to enter a room
+        
+        A room is safe once inferred so. Otherwise every protection it calls
+        for must be known: one per hazard sensed next to it (if it is
+        dangerous) and one for the mansion's recorded hazard in it.
+        """
+        if room in self.safe_rooms:
+            return True
+        knowledge_base = self.knowledge_base
+        required = set()
+        if room in self.dangerous_rooms:
+            neighbors = self.mansion.layout.neighbors(self.mansion.layout.names.index(room))
+            required.update(protection for sensed, protection in PROTECTIONS.items()
+                            if not knowledge_base.rooms_with(sensed).isdisjoint(neighbors))
+            if not required:
+                return False  # The warnings that flagged it are gone, the danger is not
+        hazard = self.mansion.hazards.get(room)
+        if hazard is not None:
+            protection = next((protection for word, protection in HAZARD_PROTECTIONS.items()
+                               if word in hazard.lower()), None)
+            if protection is None:
+                return False
+            required.add(protection)
+        return all(protection in knowledge_base for protection in required)
+    
+    def passable_mask(self):
+        """bytearray over room ids: 1 where can_safely_enter holds (cached per version)"""
+        layout = self.mansion.layout
+        # Hazard edits change the answer too, whoever makes them
+        stamp = (layout.attribute_version, layout.room_count())
+        if self._passable is None or self._passable_stamp != stamp:
+            self._passable = bytearray(self.can_safely_enter(room) for room in layout.names)
+            self._passable_stamp = stamp
+        return self._passable
+    
+    def plan_safe_route(self, destination):
+        """Plan a route avoiding known hazards
+        
+        Results are memoized on (current room, destination, version and the
+        layout's versions) and dropped as soon as the safe or dangerous rooms
+        change.
+        """
+        layout = self.mansion.layout
+        key = (self.current_room, destination, self.version, layout.version,
+               layout.attribute_version)
+        cached = self._routes.get(key)
+        if cached is None:
+            cached = self._routes[key] = self._search_safe_route(destination)
+        else:
+            self._emit('route_cache_hit', start=self.current_room, destination=destination)
+        route, message = cached
+        return (list(route) if route is not None else None), message
+    
+    def _search_safe_route(self, destination):
+        if not self.can_safely_enter(destination):
+            return None, f"Destination {destination} is too dangerous!"
+            
+        # Use BFS over room ids but avoid dangerous rooms
+        layout = self.mansion.layout
+        offsets, targets = layout.offsets, layout.targets
+        passable = self.passable_mask()
+        start_id = layout.names.index(self.current_room)
+        destination_id = layout.names.index(destination)
+        parent = array('i', [-1]) * layout.room_count()
+        parent[start_id] = start_id
+        queue = deque([start_id])
+        
+        while queue:
+            current = queue.popleft()
+            
+            if current == destination_id:
+                path = [current]
+                while current != start_id:
+                    current = parent[current]
+                    path.append(current)
+                return tuple(layout.names[room_id] for room_id in reversed(path)), "Safe route found"
+            
+            for i in range(offsets[current], offsets[current + 1]):
+                neighbor = targets[i]
+                if parent[neighbor] < 0:
+                    if passable[neighbor]:
+                        parent[neighbor] = current
+                        queue.append(neighbor)
+                    else:
+                        self._emit('avoided_room', room=layout.names[neighbor])
+        
+        return None, "No safe route found"
+    
+    def move_to_room(self, room):
+        """Move to a room with hazard checking"""
+        if self.verbose:
+            print(f"\n--- Moving from {self.current_room} to {room} ---")
+        
+        # Check if the move is valid
+        if room not in self.mansion.rooms[self.current_room]:
+            return False, f"Cannot move directly from {self.current_room} to {room}"
+        
+        # Check for hazards before moving
+        if not self.can_safely_enter(room):
+            return False, f"Too dangerous to enter {room}!"
+        
+        # Move to the room
+        self.current_room = room
+        
+        # Detect hazards and update knowledge
+        warnings = self.detect_hazards(room)
+        
+        # Check for clues
+        if self.verbose and room in self.mansion.clues:
+            print(f"🔍 CLUE FOUND: {self.mansion.clues[room]}")
+        
+        return True, f"Successfully moved to {room}"
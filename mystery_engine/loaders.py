@@ -0,0 +1,161 @@
+"""Engine objects built from the CSV data files, with a memory-mapped index cache
+
+mansion_layout.csv (and a generated world's mansion.csv) lists each room's
+connections and warnings as comma-joined strings. load_mansion parses such
+a file once and saves the resulting CompactLayout next to it as
+<file>.idx. Later loads map the index with mmap and read the layout
+straight from it, so opening even a million-room world costs the same as
+opening the Ashford one.
+
+The index records the CSV's size, mtime and BLAKE2b digest. When size and
+mtime match, the CSV is not read at all. When only the mtime differs (the
+file was touched or copied), the CSV is hashed; an unchanged digest just
+refreshes the recorded mtime, anything else rebuilds the index.
+
+    mansion = load_mansion('worlds/seed7/mansion.csv')     # parses, writes .idx
+    mansion = load_mansion('worlds/seed7/mansion.csv')     # maps the .idx
+"""
+
+import csv
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+
+from .graph import CompactLayout, MansionGraph
+
+INDEX_MAGIC = b'MMIX'
+INDEX_VERSION = 1
+INDEX_SUFFIX = '.idx'
+
+# magic, version, byte order (0 little, 1 big), source mtime_ns, size, digest
+_INDEX_HEADER = struct.Struct('<4sBBxxqQ16s')
+_MTIME_OFFSET = 8
+# byte offset, byte length of each CompactLayout.BUFFERS entry
+_SECTION = struct.Struct('<QQ')
+
+def read_mansion_csv(path):
+    """MansionGraph parsed from a room,connections,clue,hazard,warnings CSV"""
+    rooms, clues, hazards, warnings = {}, {}, {}, {}
+    with open(path, newline='') as f:
+        for row in csv.DictReader(f):
+            room = row['room']
+            rooms[room] = _split(row['connections'])
+            if row['clue']:
+                clues[room] = row['clue']
+            if row['hazard']:
+                hazards[room] = row['hazard']
+            if row['warnings']:
+                warnings[room] = _split(row['warnings'])
+    return MansionGraph.from_dicts(rooms, clues, hazards, warnings)
+
+def _split(joined):
+    return [item.strip() for item in joined.split(',') if item.strip()] if joined else []
+
+def load_mansion(path, cache=True):
+    """MansionGraph for a mansion CSV, through the <path>.idx cache unless cache=False"""
+    if not cache:
+        return read_mansion_csv(path)
+    index_path = path + INDEX_SUFFIX
+    stat = os.stat(path)
+    header = _read_index_header(index_path)
+    if header is not None and header[4] == stat.st_size:
+        if header[3] == stat.st_mtime_ns:
+            return MansionGraph(_map_layout(index_path))
+        if header[5] == _digest(path):
+            with open(index_path, 'r+b') as f:
+                f.seek(_MTIME_OFFSET)
+                f.write(stat.st_mtime_ns.to_bytes(8, 'little', signed=True))
+            return MansionGraph(_map_layout(index_path))
+    mansion = read_mansion_csv(path)
+    write_index(mansion.layout, index_path, stat, _digest(path))
+    return mansion
+
+def _digest(path):
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.digest()
+
+def _read_index_header(index_path):
+    """Unpacked header of a usable index, or None if it is missing or foreign"""
+    try:
+        with open(index_path, 'rb') as f:
+            raw = f.read(_INDEX_HEADER.size)
+    except OSError:
+        return None
+    if len(raw) < _INDEX_HEADER.size:
+        return None
+    header = _INDEX_HEADER.unpack(raw)
+    if header[:3] != (INDEX_MAGIC, INDEX_VERSION, sys.byteorder == 'big'):
+        return None
+    return header
+
+def write_index(layout, index_path, stat, digest):
+    """Save layout's buffers to index_path, tagged with the source's stat and digest
+
+    Sections are 8-byte aligned so they can be cast in place once mapped.
+    The file is written beside the target and renamed over it, so readers
+    never see a half-written index.
+    """
+    buffers = layout.to_buffers()
+    names = [name for name, _ in CompactLayout.BUFFERS]
+    payloads = [memoryview(buffers[name]).cast('B') for name in names]
+    offset = _INDEX_HEADER.size + _SECTION.size * len(names)
+    sections = []
+    for payload in payloads:
+        offset += -offset % 8
+        sections.append((offset, len(payload)))
+        offset += len(payload)
+
+    temporary = f'{index_path}.{os.getpid()}.tmp'
+    with open(temporary, 'wb') as f:
+        f.write(_INDEX_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, sys.byteorder == 'big',
+                                   stat.st_mtime_ns, stat.st_size, digest))
+        for section in sections:
+            f.write(_SECTION.pack(*section))
+        for (start, _), payload in zip(sections, payloads):
+            f.write(b'\0' * (start - f.tell()))
+            f.write(payload)
+    os.replace(temporary, index_path)
+
+def _map_layout(index_path):
+    """CompactLayout reading from a copy-on-write mapping of the index"""
+    with open(index_path, 'rb') as f:
+        mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+    view = memoryview(mapping)
+    buffers = {}
+    for i, (name, typecode) in enumerate(CompactLayout.BUFFERS):
+        start, length = _SECTION.unpack_from(mapping, _INDEX_HEADER.size + _SECTION.size * i)
+        buffers[name] = view[start:start + length].cast(typecode)
+    return CompactLayout.from_buffers(buffers)
+
+def read_suspects_csv(path):
+    """DialogueSystem-style suspect profiles from a suspect_profiles.csv file"""
+    suspects = {}
+    with open(path, newline='') as f:
+        for row in csv.DictReader(f):
+            suspects[row['role']] = {
+                'name': row['name'],
+                'personality': row['personality'],
+                'guilty': row['is_guilty'].strip().lower() == 'true',
+                'truth_value': int(row['truth_level']),
+                'suspicion_level': int(row['suspicion_level']),
+            }
+    return suspects
+
+def load_world(directory, cache=True):
+    """Mansion, DialogueSystem and DialogueLibrary of a generated world directory"""
+    from .dialogue import DialogueLibrary, DialogueSystem
+
+    with open(os.path.join(directory, 'world.json')) as f:
+        files = json.load(f)['files']
+    suspects = read_suspects_csv(os.path.join(directory, files['suspects']))
+    return {
+        'mansion': load_mansion(os.path.join(directory, files['mansion']), cache),
+        'dialogue_system': DialogueSystem(suspects),
+        'dialogue_library': DialogueLibrary(os.path.join(directory, files['dialogues'])),
+    }
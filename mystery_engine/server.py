@@ -0,0 +1,560 @@
+"""Asyncio HTTP/WebSocket game server for the web frontend
+
+Serves the static frontend (index.html, app.js, ...) and runs the game
+authoritatively with the Python engine. Every session shares one read-only
+MansionGraph and keeps only its own WumpusInference, evidence and
+interrogation lists. Past a cap, the least recently used sessions are
+parked as binary snapshots (see snapshot.py); idle ones expire. Minimax
+interrogations and CSP solves run in a process pool, with their results
+memoized, so the event loop only does I/O and cheap bookkeeping.
+
+Only the standard library is used. HTTP/1.1 with keep-alive and RFC 6455
+WebSocket text frames are implemented directly on asyncio streams.
+
+    python -m mystery_engine serve --port 8000 --workers 4
+
+Protocol: JSON objects with an "action" key, either as WebSocket messages
+(an optional "id" is echoed back) or as POST /api/<action> bodies:
+
+    new_game                      -> {"session": ..., state}
+    state                         -> state
+    move         {"room"}         -> WumpusInference.move_to_room outcome + state
+    route        {"to"}           -> plan_safe_route
+    interrogate  {"suspect"}      -> dialogue value, best question, testimony gained
+    analysis                      -> CSP solution, confidence, rankings, top hypotheses
+    hints                         -> unexplored rooms and suspects, most informative first
+    accuse       {"murderer", ...}-> verdict and the true solution
+"""
+
+import asyncio
+import base64
+import hashlib
+import json
+import mimetypes
+import os
+import secrets
+import struct
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+from .case import (CASE_CLUES, DIALOGUE_DIR, ROOM_EVIDENCE, SUSPECTS, TESTIMONY_EVIDENCE,
+                   TRUE_SOLUTION)
+from .graph import MansionGraph
+from .inference import WumpusInference
+from .snapshot import dump_game, load_game
+
+STATIC_DIR = os.path.dirname(DIALOGUE_DIR)
+STATIC_EXTENSIONS = {'.html', '.js', '.css', '.png', '.svg', '.ico'}
+
+MAX_HEADER_BYTES = 16 * 1024
+MAX_BODY_BYTES = 64 * 1024
+WEBSOCKET_GUID = '258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+
+# Per-turn budget of the interrogation search, whatever the size of the tree
+INTERROGATION_SECONDS = 0.2
+
+# Message fields that name a session, room, suspect or accused value: strings or absent
+NAME_FIELDS = ('session', 'room', 'to', 'suspect', *TRUE_SOLUTION)
+
+# Leads listed by the hints action
+HINT_COUNT = 3
+
+# --- CPU-heavy work, run in the process pool (module level so it pickles) ---
+
+@lru_cache(maxsize=4096)
+def solve_evidence(clue_names):
+    """CSP analysis for a sorted tuple of Ashford clue names"""
+    from .case import build_case_csp
+
+    descriptions = dict(CASE_CLUES)
+    csp = build_case_csp([(name, descriptions.get(name, name)) for name in clue_names])
+    query = csp.query(k=3)
+    solution, score, confidence = query['best']
+    return {
+        'solution': solution,
+        'score': score,
+        'total_possible': csp.total_weight,
+        'confidence': confidence,
+        'rankings': csp.get_suspect_rankings(),
+        'marginals': query['marginals'],
+        'top_k': query['top_k'],
+    }
+
+@lru_cache(maxsize=64)
+def interrogation(suspect):
+    """(minimax value, best question) of the suspect's dialogue tree, (None, None) without one"""
+    from .dialogue import DialogueLibrary, DialogueSystem
+
+    library = DialogueLibrary(DIALOGUE_DIR)
+    if not library.has_tree(suspect):
+        return None, None
+    result = DialogueSystem().search_anytime(library.get(suspect), suspect,
+                                             time_limit=INTERROGATION_SECONDS)
+    return result['value'], result['question']
+
+@lru_cache(maxsize=4096)
+def case_hints(clue_names, found_rooms, interrogated):
+    """Ranked hints (see hints.rank_hints) for sorted tuples of evidence, rooms and suspects"""
+    from .case import build_case_csp
+    from .dialogue import DialogueLibrary
+    from .hints import case_candidates, rank_hints
+
+    descriptions = dict(CASE_CLUES)
+    csp = build_case_csp([(name, descriptions.get(name, name)) for name in clue_names])
+    candidates = case_candidates(MansionGraph(), found_rooms, interrogated, clue_names,
+                                 DialogueLibrary(DIALOGUE_DIR))
+    return rank_hints(csp, candidates, top=HINT_COUNT)
+
+# --- Sessions ---
+
+class GameSession:
+    """One player's game; everything else is shared between sessions"""
+    __slots__ = ('id', 'wumpus', 'found_rooms', 'evidence', 'interrogated', 'moves',
+                 'outcome', 'last_seen')
+
+    def __init__(self, session_id, mansion, snapshot=None):
+        self.id = session_id
+        self.last_seen = time.monotonic()
+        if snapshot is not None:
+            state = load_game(snapshot, mansion)
+            self.wumpus = state['wumpus']
+            self.found_rooms = state['found_rooms']
+            self.evidence = state['evidence']
+            self.interrogated = state['interrogated']
+            self.moves = state['moves']
+            self.outcome = state['outcome']
+            return
+        self.wumpus = WumpusInference(mansion, verbose=False)
+        self.wumpus.detect_hazards(self.wumpus.current_room)
+        self.found_rooms = []
+        self.evidence = []
+        self.interrogated = []
+        self.moves = 0
+        self.outcome = None
+
+    def snapshot(self):
+        """Compact bytes from which GameSession(id, mansion, snapshot) resumes the game"""
+        return dump_game(self.wumpus, self.evidence, self.found_rooms, self.interrogated,
+                         self.moves, self.outcome)
+
+    def add_evidence(self, clue_names):
+        for clue_name in clue_names:
+            if clue_name not in self.evidence:
+                self.evidence.append(clue_name)
+
+    def state(self):
+        mansion = self.wumpus.mansion
+        room = self.wumpus.current_room
+        return {
+            'session': self.id,
+            'room': room,
+            'exits': list(mansion.rooms[room]),
+            'warnings': mansion.check_hazard_warnings(room),
+            'clues_found': [mansion.clues[found] for found in self.found_rooms],
+            'evidence': list(self.evidence),
+            'interrogated': list(self.interrogated),
+            'safe_rooms': sorted(self.wumpus.safe_rooms),
+            'dangerous_rooms': sorted(self.wumpus.dangerous_rooms),
+            'moves': self.moves,
+            'outcome': self.outcome,
+        }
+
+class SessionStore:
+    """LRU-bounded session table with idle expiry
+
+    At most max_sessions games are kept as live objects. Past that the least
+    recently used are parked as compact snapshots (a few dozen bytes each)
+    and rehydrated on their next request; beyond max_parked snapshots the
+    oldest game is dropped.
+    """
+
+    def __init__(self, mansion, max_sessions=10000, idle_timeout=1800, max_parked=100000):
+        self.mansion = mansion
+        self.max_sessions = max_sessions
+        self.max_parked = max_parked
+        self.idle_timeout = idle_timeout
+        self.sessions = OrderedDict()
+        self.parked = OrderedDict()  # session id -> (snapshot, last_seen)
+
+    def __len__(self):
+        return len(self.sessions) + len(self.parked)
+
+    def create(self):
+        session = GameSession(secrets.token_urlsafe(12), self.mansion)
+        self._add(session)
+        return session
+
+    def _add(self, session):
+        self.sessions[session.id] = session
+        while len(self.sessions) > self.max_sessions:
+            _, idle = self.sessions.popitem(last=False)
+            self.parked[idle.id] = (idle.snapshot(), idle.last_seen)
+        while len(self.parked) > self.max_parked:
+            self.parked.popitem(last=False)
+
+    def get(self, session_id):
+        session = self.sessions.get(session_id)
+        if session is not None:
+            session.last_seen = time.monotonic()
+            self.sessions.move_to_end(session_id)
+        elif session_id in self.parked:
+            snapshot, _ = self.parked.pop(session_id)
+            session = GameSession(session_id, self.mansion, snapshot)
+            self._add(session)
+        return session
+
+    def expire(self):
+        """Drop sessions idle for longer than idle_timeout; returns how many"""
+        cutoff = time.monotonic() - self.idle_timeout
+        expired = 0
+        while self.sessions:
+            session = next(iter(self.sessions.values()))
+            if session.last_seen >= cutoff:
+                break
+            self.sessions.popitem(last=False)
+            expired += 1
+        while self.parked:
+            _, last_seen = next(iter(self.parked.values()))
+            if last_seen >= cutoff:
+                break
+            self.parked.popitem(last=False)
+            expired += 1
+        return expired
+
+# --- Server ---
+
+class GameServer:
+    def __init__(self, host='127.0.0.1', port=8000, static_dir=STATIC_DIR, workers=None,
+                 max_sessions=10000, idle_timeout=1800, max_parked=100000):
+        self.host = host
+        self.port = port
+        self.static_dir = os.path.abspath(static_dir)
+        self.mansion = MansionGraph()
+        self.mansion.build_path_table()
+        self.sessions = SessionStore(self.mansion, max_sessions, idle_timeout, max_parked)
+        self.workers = workers
+        self.pool = None
+        self.server = None
+        # Results of pool jobs, shared by every session (the inputs are tiny)
+        self._results = OrderedDict()
+        self._pending = {}
+        self._janitor = None
+        self._connections = {}
+
+    async def start(self):
+        self.pool = ProcessPoolExecutor(max_workers=self.workers)
+        self.server = await asyncio.start_server(self._client, self.host, self.port,
+                                                 limit=MAX_HEADER_BYTES)
+        self.port = self.server.sockets[0].getsockname()[1]
+        self._janitor = asyncio.create_task(self._expire_sessions())
+        return self
+
+    async def close(self):
+        if self._janitor:
+            self._janitor.cancel()
+        if self.server:
+            self.server.close()
+            # Closing the transports ends each handler at its next read
+            handlers = []
+            for writer, task in list(self._connections.items()):
+                writer.close()
+                handlers.append(task)
+            await asyncio.gather(*handlers, return_exceptions=True)
+            await self.server.wait_closed()
+        if self.pool:
+            self.pool.shutdown(cancel_futures=True)
+
+    async def _expire_sessions(self):
+        while True:
+            await asyncio.sleep(min(60, self.sessions.idle_timeout))
+            self.sessions.expire()
+
+    async def offload(self, func, *args):
+        """Run func(*args) in the process pool, sharing results and in-flight jobs"""
+        key = (func.__name__, args)
+        if key in self._results:
+            self._results.move_to_end(key)
+            return self._results[key]
+        future = self._pending.get(key)
+        if future is None:
+            future = asyncio.get_running_loop().run_in_executor(self.pool, func, *args)
+            self._pending[key] = future
+            try:
+                result = await future
+            finally:
+                del self._pending[key]
+            self._results[key] = result
+            if len(self._results) > 4096:
+                self._results.popitem(last=False)
+            return result
+        return await asyncio.shield(future)
+
+    async def dispatch(self, message, session=None):
+        """Apply one protocol message; returns the JSON-ready reply"""
+        action = message.get('action')
+        for field in NAME_FIELDS:
+            if message.get(field) is not None and not isinstance(message[field], str):
+                return {'error': f'{field!r} must be a string'}
+        if action == 'new_game':
+            return self.sessions.create().state()
+        session_id = message.get('session') or (session.id if session else None)
+        session = self.sessions.get(session_id) if session_id else None
+        if session is None:
+            return {'error': 'unknown or expired session; send new_game'}
+        handler = getattr(self, f'_action_{action}', None) if isinstance(action, str) else None
+        if handler is None:
+            return {'error': f'unknown action {action!r}'}
+        if session.outcome is not None and action in ('move', 'interrogate', 'accuse'):
+            return {'error': f'game is over ({session.outcome})', **session.state()}
+        return await handler(session, message)
+
+    async def _action_state(self, session, message):
+        return session.state()
+
+    async def _action_move(self, session, message):
+        room = message.get('room')
+        if room not in self.mansion.rooms:
+            return {'error': f'unknown room {room!r}'}
+        wumpus = session.wumpus
+        moved, text = wumpus.move_to_room(room)
+        reply = {'moved': moved, 'message': text, 'clue': None}
+        if moved:
+            session.moves += 1
+            if room in self.mansion.hazards:
+                session.outcome = 'killed by hazard'
+                reply['hazard'] = self.mansion.hazards[room]
+            elif room in self.mansion.clues and room not in session.found_rooms:
+                session.found_rooms.append(room)
+                session.add_evidence(ROOM_EVIDENCE.get(room, ()))
+                reply['clue'] = self.mansion.clues[room]
+        return {**reply, **session.state()}
+
+    async def _action_route(self, session, message):
+        destination = message.get('to')
+        if destination not in self.mansion.rooms:
+            return {'error': f'unknown room {destination!r}'}
+        route, text = session.wumpus.plan_safe_route(destination)
+        return {'route': route, 'message': text}
+
+    async def _action_interrogate(self, session, message):
+        suspect = message.get('suspect')
+        if suspect not in SUSPECTS:
+            return {'error': f'unknown suspect {suspect!r}'}
+        value, question = await self.offload(interrogation, suspect)
+        testimony = []
+        if value is None or value > 0:
+            testimony = [clue for clue in TESTIMONY_EVIDENCE.get(suspect, ())
+                         if clue not in session.evidence]
+            session.add_evidence(testimony)
+        if suspect not in session.interrogated:
+            session.interrogated.append(suspect)
+        return {'suspect': suspect, 'value': value, 'question': question, 'testimony': testimony,
+                **session.state()}
+
+    async def _action_analysis(self, session, message):
+        return await self.offload(solve_evidence, tuple(sorted(session.evidence)))
+
+    async def _action_hints(self, session, message):
+        hints = await self.offload(case_hints, tuple(sorted(session.evidence)),
+                                   tuple(sorted(session.found_rooms)),
+                                   tuple(sorted(session.interrogated)))
+        return {'hints': hints}
+
+    async def _action_accuse(self, session, message):
+        accused = {var: message[var] for var in TRUE_SOLUTION if message.get(var) is not None}
+        if 'murderer' not in accused:
+            return {'error': 'an accusation needs at least a murderer'}
+        correct = all(TRUE_SOLUTION[var] == value for var, value in accused.items())
+        session.outcome = 'solved' if correct else 'wrong accusation'
+        analysis = await self.offload(solve_evidence, tuple(sorted(session.evidence)))
+        return {'correct': correct, 'solution': TRUE_SOLUTION,
+                'confidence': analysis['confidence'], **session.state()}
+
+    # --- HTTP ---
+
+    async def _client(self, reader, writer):
+        self._connections[writer] = asyncio.current_task()
+        try:
+            while True:
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+                method, path, headers, body = request
+                if path == '/ws' and headers.get('upgrade', '').lower() == 'websocket':
+                    await self._websocket(reader, writer, headers)
+                    break
+                status, content_type, payload = await self._http(method, path, body)
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                writer.write(_http_response(status, content_type, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            self._connections.pop(writer, None)
+            writer.close()
+
+    async def _read_request(self, reader):
+        try:
+            head = await reader.readuntil(b'\r\n\r\n')
+        except asyncio.IncompleteReadError:
+            return None
+        lines = head.decode('latin-1').split('\r\n')
+        method, target, _ = lines[0].split(' ', 2)
+        headers = {}
+        for line in lines[1:]:
+            if ':' in line:
+                name, value = line.split(':', 1)
+                headers[name.strip().lower()] = value.strip()
+        length = int(headers.get('content-length', 0))
+        if length > MAX_BODY_BYTES:
+            raise ValueError('request body too large')
+        body = await reader.readexactly(length) if length else b''
+        return method, target.split('?', 1)[0], headers, body
+
+    async def _http(self, method, path, body):
+        if path.startswith('/api/'):
+            if method != 'POST':
+                return 405, 'application/json', b'{"error": "use POST"}'
+            try:
+                message = json.loads(body or b'{}')
+            except ValueError:
+                return 400, 'application/json', b'{"error": "invalid JSON"}'
+            if not isinstance(message, dict):
+                return 400, 'application/json', b'{"error": "expected a JSON object"}'
+            message['action'] = path[len('/api/'):]
+            reply = await self.dispatch(message)
+            return (400 if 'error' in reply else 200), 'application/json', _dumps(reply)
+        if method not in ('GET', 'HEAD'):
+            return 405, 'text/plain', b'Method not allowed'
+        return self._static(path)
+
+    def _static(self, path):
+        name = 'index.html' if path in ('', '/') else path.lstrip('/')
+        if '/' in name or '\\' in name or os.path.splitext(name)[1] not in STATIC_EXTENSIONS:
+            return 404, 'text/plain', b'Not found'
+        full_path = os.path.join(self.static_dir, name)
+        if not os.path.isfile(full_path):
+            return 404, 'text/plain', b'Not found'
+        with open(full_path, 'rb') as f:
+            content = f.read()
+        return 200, mimetypes.guess_type(name)[0] or 'application/octet-stream', content
+
+    # --- WebSocket ---
+
+    async def _websocket(self, reader, writer, headers):
+        key = headers.get('sec-websocket-key', '')
+        accept = base64.b64encode(hashlib.sha1((key + WEBSOCKET_GUID).encode()).digest()).decode()
+        writer.write(('HTTP/1.1 101 Switching Protocols\r\n'
+                      'Upgrade: websocket\r\nConnection: Upgrade\r\n'
+                      f'Sec-WebSocket-Accept: {accept}\r\n\r\n').encode())
+        await writer.drain()
+        session = None
+        while True:
+            frame = await _read_frame(reader, writer)
+            if frame is None:
+                break
+            try:
+                message = json.loads(frame)
+            except ValueError:
+                message = None
+            if not isinstance(message, dict):
+                reply = {'error': 'expected a JSON object'}
+            else:
+                reply = await self.dispatch(message, session)
+                if 'session' in reply and 'error' not in reply:
+                    session = self.sessions.get(reply['session'])
+                if 'id' in message:
+                    reply['id'] = message['id']
+            writer.write(_frame(0x1, _dumps(reply)))
+            await writer.drain()
+        writer.write(_frame(0x8, b''))
+
+def _dumps(value):
+    return json.dumps(value, default=float).encode()
+
+def _http_response(status, content_type, payload, keep_alive=True):
+    reason = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed'}[status]
+    head = (f'HTTP/1.1 {status} {reason}\r\n'
+            f'Content-Type: {content_type}\r\n'
+            f'Content-Length: {len(payload)}\r\n'
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode() + payload
+
+def _frame(opcode, payload):
+    """Unmasked server frame"""
+    length = len(payload)
+    if length < 126:
+        header = struct.pack('!BB', 0x80 | opcode, length)
+    elif length < 1 << 16:
+        header = struct.pack('!BBH', 0x80 | opcode, 126, length)
+    else:
+        header = struct.pack('!BBQ', 0x80 | opcode, 127, length)
+    return header + payload
+
+def _unmask(payload, mask):
+    length = len(payload)
+    key = (mask * (length // 4 + 1))[:length]
+    return (int.from_bytes(payload, 'big') ^ int.from_bytes(key, 'big')).to_bytes(length, 'big')
+
+async def _read_frame(reader, writer):
+    """Next complete text message, answering pings; None once the peer closes"""
+    fragments = []
+    while True:
+        first, second = await reader.readexactly(2)
+        opcode = first & 0x0F
+        length = second & 0x7F
+        if length == 126:
+            length = struct.unpack('!H', await reader.readexactly(2))[0]
+        elif length == 127:
+            length = struct.unpack('!Q', await reader.readexactly(8))[0]
+        if length > MAX_BODY_BYTES or sum(map(len, fragments)) + length > MAX_BODY_BYTES:
+            raise ValueError('WebSocket message too large')
+        mask = await reader.readexactly(4) if second & 0x80 else None
+        payload = await reader.readexactly(length)
+        if mask:
+            payload = _unmask(payload, mask)
+        if opcode == 0x8:
+            return None
+        if opcode == 0x9:
+            writer.write(_frame(0xA, payload))
+            continue
+        if opcode == 0xA:
+            continue
+        fragments.append(payload)
+        if first & 0x80:
+            return b''.join(fragments).decode()
+
+def configure_parser(parser):
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--workers', type=int, default=None,
+                        help="processes for minimax/CSP solves (default: one per CPU)")
+    parser.add_argument('--max-sessions', type=int, default=10000,
+                        help="games kept live in memory; older ones are parked as snapshots")
+    parser.add_argument('--max-parked', type=int, default=100000,
+                        help="parked game snapshots kept before the oldest is dropped")
+    parser.add_argument('--idle-timeout', type=float, default=1800,
+                        help="seconds before an idle session is dropped")
+    parser.set_defaults(run=run)
+
+def run(args):
+    server = GameServer(args.host, args.port, workers=args.workers,
+                        max_sessions=args.max_sessions, idle_timeout=args.idle_timeout,
+                        max_parked=args.max_parked)
+
+    async def main():
+        await server.start()
+        print(f"Serving on http://{server.host}:{server.port}/ (WebSocket at /ws)", flush=True)
+        try:
+            await server.server.serve_forever()
+        finally:
+            await server.close()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,379 @@
+"""Headless batch playthroughs of the Ashford Manor mystery for balance testing
+
+Each game is played end to end: the agent explores with
+WumpusInference.move_to_room, feeds what it finds into
+MurderMysteryCSP.add_evidence, interrogates suspects with DialogueSystem and
+finally accuses the CSP's best solution. Games run in batches on a process
+pool and the aggregate statistics are streamed as batches finish.
+
+    python -m mystery_engine simulate --games 100000 --policy greedy --workers 8 --stream
+"""
+
+import json
+import os
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import permutations
+
+from .case import DIALOGUE_DIR, ROOM_EVIDENCE, TESTIMONY_EVIDENCE, TRUE_SOLUTION
+from .csp import MurderMysteryCSP
+from .dialogue import DialogueLibrary, DialogueSystem
+from .graph import MansionGraph
+from .inference import WumpusInference
+
+STAGES = ('setup', 'explore', 'evidence', 'interrogate', 'accuse')
+
+# Columns of the per-game records written by `simulate --records`
+GAME_FIELDS = ['seed', 'policy', 'outcome', 'moves', 'actions', 'evidence', 'accused', 'ms']
+
+# Compiled dialogue trees are shared by every game played in this process
+_dialogue_library = None
+
+def dialogue_library():
+    global _dialogue_library
+    if _dialogue_library is None:
+        _dialogue_library = DialogueLibrary(DIALOGUE_DIR)
+    return _dialogue_library
+
+class Game:
+    """State of one playthrough; a policy picks actions until it accuses"""
+
+    def __init__(self, max_moves=60):
+        self.max_moves = max_moves
+        self.max_actions = 4 * max_moves
+        self.timings = dict.fromkeys(STAGES, 0.0)
+
+        start = time.perf_counter()
+        self.mansion = MansionGraph()
+        self.wumpus = WumpusInference(self.mansion, verbose=False)
+        self.csp = MurderMysteryCSP()
+        self.dialogue = DialogueSystem()
+        self.library = dialogue_library()
+        self.found_rooms = set()
+        self.interrogated = set()
+        self.moves = 0
+        self.actions = 0
+        self.outcome = None  # 'solved', 'wrong accusation' or 'out of moves'
+        self.accusation = None
+        # Sense the starting room like any other
+        self.wumpus.detect_hazards(self.wumpus.current_room)
+        self.timings['setup'] += time.perf_counter() - start
+        self._search_room(self.wumpus.current_room)
+
+    @property
+    def current_room(self):
+        return self.wumpus.current_room
+
+    def legal_moves(self):
+        """Neighbouring rooms the agent currently believes are safe"""
+        return [room for room in self.mansion.rooms[self.current_room]
+                if self.wumpus.can_safely_enter(room)]
+
+    def unsafe_rooms(self):
+        layout = self.mansion.layout
+        passable = self.wumpus.passable_mask()
+        return [layout.names[i] for i in range(layout.room_count()) if not passable[i]]
+
+    def pending_suspects(self):
+        return [suspect for suspect in self.dialogue.suspects if suspect not in self.interrogated]
+
+    def move(self, room):
+        start = time.perf_counter()
+        moved, _ = self.wumpus.move_to_room(room)
+        self.timings['explore'] += time.perf_counter() - start
+        self.actions += 1
+        if not moved:
+            return False
+        self.moves += 1
+        if room in self.mansion.hazards:
+            self.outcome = 'killed by hazard'
+            return True
+        self._search_room(room)
+        return True
+
+    def interrogate(self, suspect):
+        """Question a suspect; returns the dialogue value (None without a tree)"""
+        start = time.perf_counter()
+        self.actions += 1
+        self.interrogated.add(suspect)
+        value = None
+        if self.library.has_tree(suspect):
+            tree = self.library.get(suspect)
+            value = self.dialogue.search_compiled(tree, depth=len(tree), suspect_name=suspect)
+        self.timings['interrogate'] += time.perf_counter() - start
+        if value is None or value > 0:
+            self._add_evidence(TESTIMONY_EVIDENCE.get(suspect, ()))
+        return value
+
+    def accuse(self):
+        start = time.perf_counter()
+        self.actions += 1
+        solution, _, _ = self.csp.find_best_solution()
+        self.accusation = solution
+        self.outcome = 'solved' if solution == TRUE_SOLUTION else 'wrong accusation'
+        self.timings['accuse'] += time.perf_counter() - start
+
+    def _search_room(self, room):
+        if room in self.mansion.clues and room not in self.found_rooms:
+            self.found_rooms.add(room)
+            self._add_evidence(ROOM_EVIDENCE.get(room, ()))
+
+    def _add_evidence(self, clue_names):
+        start = time.perf_counter()
+        for clue_name in clue_names:
+            if clue_name not in self.csp.evidence:
+                self.csp.add_evidence(clue_name, clue_name.replace('_', ' '))
+        self.timings['evidence'] += time.perf_counter() - start
+
+class RandomPolicy:
+    """Wanders between safe rooms, questions people at random, accuses on a whim"""
+
+    def __init__(self, rng, accuse_chance=0.05):
+        self.rng = rng
+        self.accuse_chance = accuse_chance
+
+    def choose(self, game):
+        options = ([('move', room) for room in game.legal_moves()] +
+                   [('interrogate', suspect) for suspect in game.pending_suspects()])
+        if not options or self.rng.random() < self.accuse_chance:
+            return ('accuse',)
+        return self.rng.choice(options)
+
+class GreedyPolicy:
+    """Walks to the nearest unsearched clue room, then questions everyone and accuses"""
+
+    def __init__(self, rng):
+        self.rng = rng
+
+    def choose(self, game):
+        path = game.mansion.nearest_unfound_clue(game.current_room, game.found_rooms,
+                                                 avoid=game.unsafe_rooms())
+        if path and len(path) > 1:
+            return ('move', path[1])
+        suspects = game.pending_suspects()
+        if suspects:
+            return ('interrogate', suspects[0])
+        return ('accuse',)
+
+class OptimalPolicy:
+    """Knows the scenario: questions only informative suspects, then takes the
+    shortest tour through every clue room (exhaustive over the path table)"""
+
+    def __init__(self, rng):
+        self.rng = rng
+        self.tour = None
+
+    def choose(self, game):
+        for suspect in game.pending_suspects():
+            if suspect in TESTIMONY_EVIDENCE:
+                return ('interrogate', suspect)
+        if self.tour is None:
+            self.tour = self._plan_tour(game)
+        while self.tour and self.tour[0] in game.found_rooms:
+            self.tour.pop(0)
+        if not self.tour:
+            return ('accuse',)
+        return ('move', game.mansion.path_table.next_room(game.current_room, self.tour[0]))
+
+    def _plan_tour(self, game):
+        mansion = game.mansion
+        if mansion.path_table is None:
+            mansion.build_path_table()
+        table = mansion.path_table
+        targets = [room for room in mansion.clues
+                   if room not in game.found_rooms and
+                   table.distance_between(game.current_room, room) is not None]
+        best_tour, best_length = [], None
+        for order in permutations(targets):
+            length, here = 0, game.current_room
+            for room in order:
+                length += table.distance_between(here, room)
+                here = room
+            if best_length is None or length < best_length:
+                best_tour, best_length = list(order), length
+        return best_tour
+
+POLICIES = {
+    'random': RandomPolicy,
+    'greedy': GreedyPolicy,
+    'optimal': OptimalPolicy,
+}
+
+def play_game(policy_name, seed, max_moves=60):
+    """Play one complete game and return the finished Game"""
+    game = Game(max_moves)
+    policy = POLICIES[policy_name](random.Random(seed))
+    while game.outcome is None:
+        if game.moves >= game.max_moves or game.actions >= game.max_actions:
+            game.outcome = 'out of moves'
+            break
+        action = policy.choose(game)
+        if action[0] == 'move':
+            game.move(action[1])
+        elif action[0] == 'interrogate':
+            game.interrogate(action[1])
+        else:
+            game.accuse()
+    return game
+
+def game_record(policy_name, seed, game):
+    """One GAME_FIELDS row describing a finished game"""
+    return {
+        'seed': seed,
+        'policy': policy_name,
+        'outcome': game.outcome,
+        'moves': game.moves,
+        'actions': game.actions,
+        'evidence': len(game.csp.evidence),
+        'accused': game.accusation['murderer'] if game.accusation else None,
+        'ms': round(1000 * sum(game.timings.values()), 3),
+    }
+
+class Aggregate:
+    """Running totals over finished games; batches merge into one
+
+    rows holds the game_record of each game added, when asked for; it is
+    not carried over by merge, so running totals stay small.
+    """
+
+    def __init__(self, keep_rows=False):
+        self.rows = [] if keep_rows else None
+        self.games = 0
+        self.wins = 0
+        self.outcomes = {}
+        self.moves = 0
+        self.moves_to_solve = 0
+        self.actions = 0
+        self.move_histogram = {}
+        self.timings = dict.fromkeys(STAGES, 0.0)
+
+    def add(self, game):
+        self.games += 1
+        self.outcomes[game.outcome] = self.outcomes.get(game.outcome, 0) + 1
+        self.moves += game.moves
+        self.actions += game.actions
+        self.move_histogram[game.moves] = self.move_histogram.get(game.moves, 0) + 1
+        if game.outcome == 'solved':
+            self.wins += 1
+            self.moves_to_solve += game.moves
+        for stage, seconds in game.timings.items():
+            self.timings[stage] += seconds
+
+    def merge(self, other):
+        self.games += other.games
+        self.wins += other.wins
+        self.moves += other.moves
+        self.moves_to_solve += other.moves_to_solve
+        self.actions += other.actions
+        for outcome, count in other.outcomes.items():
+            self.outcomes[outcome] = self.outcomes.get(outcome, 0) + count
+        for moves, count in other.move_histogram.items():
+            self.move_histogram[moves] = self.move_histogram.get(moves, 0) + count
+        for stage, seconds in other.timings.items():
+            self.timings[stage] += seconds
+
+    def summary(self):
+        games = self.games or 1
+        return {
+            'games': self.games,
+            'win_rate': self.wins / games,
+            'outcomes': dict(sorted(self.outcomes.items())),
+            'mean_moves': self.moves / games,
+            'mean_moves_to_solve': self.moves_to_solve / self.wins if self.wins else None,
+            'mean_actions': self.actions / games,
+            'move_histogram': dict(sorted(self.move_histogram.items())),
+            'stage_ms_per_game': {stage: 1000 * seconds / games
+                                  for stage, seconds in self.timings.items()},
+        }
+
+def run_batch(policy_name, seeds, max_moves=60, keep_rows=False):
+    """Worker entry point: play one game per seed and total them up"""
+    aggregate = Aggregate(keep_rows)
+    for seed in seeds:
+        game = play_game(policy_name, seed, max_moves)
+        aggregate.add(game)
+        if keep_rows:
+            aggregate.rows.append(game_record(policy_name, seed, game))
+    return aggregate
+
+def simulate(games, policy='greedy', workers=None, batch_size=250, max_moves=60, seed=0,
+             on_rows=None):
+    """Yield the running Aggregate each time a batch of games finishes
+
+    workers=1 plays in this process; otherwise batches go to a process pool
+    (workers=None uses one process per CPU) with only a few per worker in
+    flight, so memory does not grow with the number of games. Game i is
+    seeded with seed + i, so totals do not depend on the worker count.
+    on_rows(rows), if given, receives each finished batch's game records.
+    """
+    if policy not in POLICIES:
+        raise ValueError(f"Unknown policy {policy!r}; choose from {sorted(POLICIES)}")
+    batches = (range(seed + start, seed + min(start + batch_size, games))
+               for start in range(0, games, batch_size))
+    keep_rows = on_rows is not None
+    total = Aggregate()
+    if workers == 1:
+        for batch in batches:
+            result = run_batch(policy, batch, max_moves, keep_rows)
+            total.merge(result)
+            if keep_rows:
+                on_rows(result.rows)
+            yield total
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        window = 2 * (workers or os.cpu_count() or 1)
+        pending = set()
+        while True:
+            for batch in batches:
+                pending.add(pool.submit(run_batch, policy, batch, max_moves, keep_rows))
+                if len(pending) >= window:
+                    break
+            if not pending:
+                return
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                result = future.result()
+                total.merge(result)
+                if keep_rows:
+                    on_rows(result.rows)
+                yield total
+
+def configure_parser(parser):
+    parser.add_argument('--games', type=int, default=1000)
+    parser.add_argument('--policy', choices=sorted(POLICIES), default='greedy')
+    parser.add_argument('--workers', type=int, default=None,
+                        help="processes to use (default: one per CPU, 1 = no pool)")
+    parser.add_argument('--batch-size', type=int, default=250)
+    parser.add_argument('--max-moves', type=int, default=60)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--stream', action='store_true',
+                        help="print the running summary as a JSON line after every batch")
+    parser.add_argument('--records', default=None,
+                        help="also write one row per game here (.csv, .jsonl or .parquet)")
+    parser.add_argument('--append', action='store_true',
+                        help="append to the --records file instead of replacing it")
+    parser.set_defaults(run=run)
+
+def run(args):
+    records = None
+    if args.records:
+        from .export import open_table
+        records = open_table(args.records, GAME_FIELDS, append=args.append)
+    started = time.perf_counter()
+    aggregate = Aggregate()
+    try:
+        for aggregate in simulate(args.games, args.policy, args.workers, args.batch_size,
+                                  args.max_moves, args.seed,
+                                  on_rows=records.write_rows if records else None):
+            if args.stream:
+                print(json.dumps(aggregate.summary()), flush=True)
+    finally:
+        if records:
+            records.close()
+    elapsed = time.perf_counter() - started
+    summary = aggregate.summary()
+    summary['policy'] = args.policy
+    summary['wall_seconds'] = elapsed
+    summary['games_per_hour'] = aggregate.games / elapsed * 3600 if elapsed > 0 else None
+    print(json.dumps(summary, indent=2))
@@ -0,0 +1,211 @@
+"""Compact, versioned binary snapshots of a game in progress
+
+A snapshot holds everything needed to resume a game against a known
+mansion: the player's room, the knowledge base, the safe and dangerous
+rooms, the evidence found and the session counters. Given the game's
+MurderMysteryCSP, dump_game also stores its declarative constraints
+(Equals, NotEquals, AllOf, as generator constraint specs) and restore_csp
+rebuilds exactly that CSP, e.g. one over a generated world's domains.
+Without it, restore_csp replays the evidence through the case's clues.
+
+Layout (little-endian), FORMAT_VERSION 2:
+
+    header      magic b'MMS', format version, room count, current room id,
+                moves, outcome code, interrogated suspects (a bitmask, so
+                their order is not kept), unary KB flags (bitmask),
+                evidence count, found room count, CSP section length
+    bitsets     one per ROOM_PREDICATES entry, then safe rooms, then
+                dangerous rooms; ceil(room count / 8) bytes each
+    evidence    uint16 clue ids (indices into CLUE_NAMES), in order found
+    found rooms uint32 room ids, in order found
+    CSP         UTF-8 JSON: variables, domains, evidence and constraints
+                ([clue or null, spec, weight, hard]); empty without a CSP
+
+Version 1 snapshots (no CSP section length or section) still load.
+
+Rooms are stored by their id in the mansion's layout, so a snapshot can
+only be restored against a mansion with the same room table. The room
+count is checked and a mismatch raises ValueError.
+"""
+
+import json
+import re
+import struct
+
+from .case import CASE_CLUES, SUSPECTS, build_case_csp
+from .generator import constraint_from_spec, constraint_to_spec
+from .inference import (GAS_DETECTED, GAS_MASK_EQUIPPED, RUMBLING_DETECTED, STRUCTURE_REINFORCED,
+                        VISITED_SURVIVED, WumpusInference)
+
+MAGIC = b'MMS'
+FORMAT_VERSION = 2
+
+# Fixed code tables: append only, or bump FORMAT_VERSION
+ROOM_PREDICATES = (VISITED_SURVIVED, GAS_DETECTED, RUMBLING_DETECTED)
+UNARY_PREDICATES = (GAS_MASK_EQUIPPED, STRUCTURE_REINFORCED)
+CLUE_NAMES = tuple(name for name, _ in CASE_CLUES)
+OUTCOMES = (None, 'solved', 'wrong accusation', 'killed by hazard')
+
+_HEADER = struct.Struct('<3sBIIIBBBHII')
+_HEADER_V1 = struct.Struct('<3sBIIIBBBHI')
+_CLUE_IDS = {name: clue_id for clue_id, name in enumerate(CLUE_NAMES)}
+_ROOM_PREDICATE_IDS = {predicate: i for i, predicate in enumerate(ROOM_PREDICATES)}
+_UNARY_PREDICATE_IDS = {predicate: i for i, predicate in enumerate(UNARY_PREDICATES)}
+
+# Set bit positions of every byte value, and the nonzero bytes of a bitset
+_BYTE_BITS = [tuple(bit for bit in range(8) if value >> bit & 1) for value in range(256)]
+_NONZERO = re.compile(b'[^\x00]')
+
+def _bitset(room_ids, size):
+    """size bytes with bit room_id set for every room id (bit i & 7 of byte i >> 3)"""
+    bits = bytearray(size)
+    for room_id in room_ids:
+        bits[room_id >> 3] |= 1 << (room_id & 7)
+    return bits
+
+def _members(data, offset, size):
+    """Room ids of the bitset stored at data[offset:offset + size], in ascending order
+
+    Only the nonzero bytes are visited, so a sparse set costs little
+    whatever the room count.
+    """
+    room_ids = []
+    for match in _NONZERO.finditer(data, offset, offset + size):
+        base = (match.start() - offset) << 3
+        room_ids.extend(base + bit for bit in _BYTE_BITS[data[match.start()]])
+    return room_ids
+
+def _csp_state(csp):
+    """JSON-ready variables, domains, evidence and constraint specs of a CSP"""
+    clue_of = {id(constraint): clue_name
+               for clue_name, constraints in csp.evidence_constraints.items()
+               for constraint in constraints}
+    return {
+        'variables': csp.variables,
+        'domains': csp.domains,
+        'evidence': [[clue_name, description] for clue_name, description in csp.evidence.items()],
+        'constraints': [[clue_of.get(id(constraint)), constraint_to_spec(constraint['func']),
+                         constraint['weight'], constraint['hard']]
+                        for constraint in csp.constraints],
+    }
+
+def dump_game(wumpus, evidence=(), found_rooms=(), interrogated=(), moves=0, outcome=None,
+              csp=None):
+    """Snapshot of a game as bytes
+
+    evidence holds clue names from CLUE_NAMES, found_rooms room names and
+    interrogated suspect names from SUSPECTS. Facts with predicates outside
+    the code tables raise ValueError rather than being silently dropped, as
+    do csp constraints that are plain functions rather than declarative.
+    """
+    layout = wumpus.mansion.layout
+    names = layout.names
+    room_count = layout.room_count()
+    size = (room_count + 7) // 8
+
+    room_facts = [[] for _ in ROOM_PREDICATES]
+    flags = 0
+    for predicate, room_id in wumpus.knowledge_base.facts:
+        if room_id is None and predicate in _UNARY_PREDICATE_IDS:
+            flags |= 1 << _UNARY_PREDICATE_IDS[predicate]
+        elif room_id is not None and predicate in _ROOM_PREDICATE_IDS:
+            room_facts[_ROOM_PREDICATE_IDS[predicate]].append(room_id)
+        else:
+            raise ValueError(f"no snapshot code for predicate {predicate!r}")
+
+    csp_section = b''
+    if csp is not None:
+        csp_section = json.dumps(_csp_state(csp), separators=(',', ':')).encode()
+
+    suspects = 0
+    for suspect in interrogated:
+        suspects |= 1 << SUSPECTS.index(suspect)
+
+    parts = [_HEADER.pack(MAGIC, FORMAT_VERSION, room_count, names.index(wumpus.current_room),
+                          moves, OUTCOMES.index(outcome), suspects, flags,
+                          len(evidence), len(found_rooms), len(csp_section))]
+    parts.extend(_bitset(room_ids, size) for room_ids in room_facts)
+    parts.append(_bitset(map(names.index, wumpus.safe_rooms), size))
+    parts.append(_bitset(map(names.index, wumpus.dangerous_rooms), size))
+    parts.append(struct.pack(f'<{len(evidence)}H', *[_CLUE_IDS[name] for name in evidence]))
+    parts.append(struct.pack(f'<{len(found_rooms)}I', *map(names.index, found_rooms)))
+    parts.append(csp_section)
+    return b''.join(parts)
+
+def load_game(data, mansion, on_event=None, verbose=False):
+    """Inverse of dump_game against the same mansion
+
+    Returns a dict with 'wumpus' (a ready WumpusInference), 'evidence',
+    'found_rooms', 'interrogated', 'moves', 'outcome' and 'csp' (the stored
+    CSP state for restore_csp, None if the snapshot has none).
+    """
+    magic, version = struct.unpack_from('<3sB', data)
+    if magic != MAGIC:
+        raise ValueError("not a game snapshot")
+    if version == 1:
+        header, csp_length = _HEADER_V1, 0
+        (_, _, room_count, current, moves, outcome, suspects, flags,
+         evidence_count, found_count) = header.unpack_from(data)
+    elif version == FORMAT_VERSION:
+        header = _HEADER
+        (_, _, room_count, current, moves, outcome, suspects, flags,
+         evidence_count, found_count, csp_length) = header.unpack_from(data)
+    else:
+        raise ValueError(f"unsupported snapshot version {version}")
+    layout = mansion.layout
+    if room_count != layout.room_count():
+        raise ValueError(f"snapshot has {room_count} rooms, the mansion has {layout.room_count()}")
+    names = layout.names
+    size = (room_count + 7) // 8
+    offset = header.size
+
+    wumpus = WumpusInference(mansion, on_event=on_event, verbose=verbose)
+    wumpus.current_room = names[current]
+    knowledge_base = wumpus.knowledge_base
+    for predicate in ROOM_PREDICATES:
+        for room_id in _members(data, offset, size):
+            knowledge_base.add(predicate, room_id)
+        offset += size
+    for i, predicate in enumerate(UNARY_PREDICATES):
+        if flags >> i & 1:
+            knowledge_base.add(predicate)
+    wumpus.safe_rooms = {names[room_id] for room_id in _members(data, offset, size)}
+    offset += size
+    wumpus.dangerous_rooms = {names[room_id] for room_id in _members(data, offset, size)}
+    offset += size
+
+    clue_ids = struct.unpack_from(f'<{evidence_count}H', data, offset)
+    offset += 2 * evidence_count
+    room_ids = struct.unpack_from(f'<{found_count}I', data, offset)
+    offset += 4 * found_count
+    csp_state = json.loads(bytes(data[offset:offset + csp_length])) if csp_length else None
+
+    return {
+        'wumpus': wumpus,
+        'evidence': [CLUE_NAMES[clue_id] for clue_id in clue_ids],
+        'found_rooms': [names[room_id] for room_id in room_ids],
+        'interrogated': [suspect for i, suspect in enumerate(SUSPECTS) if suspects >> i & 1],
+        'moves': moves,
+        'outcome': OUTCOMES[outcome],
+        'csp': csp_state,
+    }
+
+def restore_csp(evidence, csp_state=None):
+    """MurderMysteryCSP for a restored game
+
+    csp_state is load_game's 'csp': when present the stored constraints are
+    rebuilt as they were, otherwise the case's CSP is rebuilt from evidence.
+    """
+    if csp_state is None:
+        descriptions = dict(CASE_CLUES)
+        return build_case_csp([(name, descriptions[name]) for name in evidence])
+    from .csp import MurderMysteryCSP
+
+    csp = MurderMysteryCSP(csp_state['variables'], csp_state['domains'])
+    for clue_name, description in csp_state['evidence']:
+        csp.add_evidence(clue_name, description, constraints=[])
+    for clue_name, spec, weight, hard in csp_state['constraints']:
+        constraint = csp.add_constraint(constraint_from_spec(spec), weight=weight, hard=hard)
+        if clue_name is not None:
+            csp.evidence_constraints[clue_name].append(constraint)
+    return csp
@@ -0,0 +1,92 @@
+"""Shared fixtures: the package importable from a checkout, seeded worlds and brute-force oracles"""
+
+import os
+import random
+import sys
+from collections import deque
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+def random_rooms(seed, count=40, extra=30):
+    """Connected name -> neighbours dict: a random spanning tree plus extra connections"""
+    rng = random.Random(seed)
+    names = [f'Room {i}' if i % 3 else f'room_{i}' for i in range(count)]
+    rooms = {name: [] for name in names}
+
+    def connect(a, b):
+        if a != b and b not in rooms[a]:
+            rooms[a].append(b)
+            rooms[b].append(a)
+
+    for i in range(1, count):
+        connect(names[i], names[rng.randrange(i)])
+    for _ in range(extra):
+        connect(rng.choice(names), rng.choice(names))
+    return rooms
+
+def bfs_distances(layout, start, blocked=None):
+    """Hop distance from room id start to every room id (-1 if unreachable)"""
+    dist = [-1] * layout.room_count()
+    if blocked is not None and blocked[start]:
+        return dist
+    dist[start] = 0
+    queue = deque([start])
+    while queue:
+        current = queue.popleft()
+        for neighbor in layout.neighbors(current):
+            if dist[neighbor] < 0 and (blocked is None or not blocked[neighbor]):
+                dist[neighbor] = dist[current] + 1
+                queue.append(neighbor)
+    return dist
+
+def random_dialogue(seed, depth=6, branching=3, share=0.2):
+    """Dialogue document (dialogue file format) with random values and shared follow-ups"""
+    rng = random.Random(seed)
+    phrases = ['Tell me the truth.', 'I would rather deflect that.', 'Where were you?',
+               'I saw nothing.']
+    nodes = [{'id': 'n0', 'speaker': 'detective', 'text': rng.choice(phrases)}]
+    level = [nodes[0]]
+    for step in range(1, depth + 1):
+        speaker = 'Suspect' if step % 2 else 'detective'
+        next_level = []
+        for parent in level:
+            children = []
+            for _ in range(rng.randint(1, branching)):
+                if next_level and rng.random() < share:
+                    node = rng.choice(next_level)  # A shared follow-up
+                else:
+                    node = {'id': f'n{len(nodes)}', 'speaker': speaker,
+                            'text': rng.choice(phrases)}
+                    if step == depth or rng.random() < 0.15:
+                        node['terminal'] = True
+                        node['value'] = rng.randint(-10, 10)
+                    nodes.append(node)
+                    next_level.append(node)
+                if node['id'] not in children:
+                    children.append(node['id'])
+            parent['children'] = children
+        level = [node for node in next_level if not node.get('terminal')]
+    for node in level:
+        node['terminal'] = True
+    return {'suspect': 'Suspect', 'root': 'n0', 'nodes': nodes}
+
+def plain_minimax(dialogue_system, tree, node, depth, maximizing_player, suspect_name):
+    """Minimax without pruning or tables over a CompiledDialogueTree"""
+    if depth == 0 or tree.terminal[node]:
+        return dialogue_system.evaluate_compiled(tree, node, suspect_name)
+    values = [plain_minimax(dialogue_system, tree, child, depth - 1, not maximizing_player,
+                            suspect_name)
+              for child in tree.children(node)]
+    return max(values) if maximizing_player else min(values)
+
+@pytest.fixture
+def make_mansion():
+    """Factory for seeded random MansionGraphs"""
+    from mystery_engine.graph import MansionGraph
+
+    def make(seed, count=40, extra=30):
+        return MansionGraph.from_dicts(random_rooms(seed, count, extra))
+    return make
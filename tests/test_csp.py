@@ -0,0 +1,296 @@
+"""MurderMysteryCSP's score tensor against brute-force enumeration of the assignments"""
+
+import random
+from itertools import product
+
+def random_constraint(rng, domains):
+    from mystery_engine.csp import AllOf, Equals, NotEquals
+
+    def simple():
+        var = rng.choice(list(domains))
+        kind = Equals if rng.random() < 0.6 else NotEquals
+        return kind(var, rng.choice(domains[var]))
+
+    roll = rng.random()
+    if roll < 0.6:
+        return simple()
+    if roll < 0.85:
+        return AllOf(simple(), simple())
+    # A plain function, tabulated over its scope
+    var_a, var_b = rng.sample(list(domains), 2)
+    return (lambda assignment: domains[var_a].index(assignment[var_a]) % 2 ==
+            domains[var_b].index(assignment[var_b]) % 2), (var_a, var_b)
+
+def random_csp(seed, constraints=8, sizes=(4, 3, 5, 2)):
+    """Seeded CSP with random Equals/NotEquals/AllOf and function constraints"""
+    from mystery_engine.csp import MurderMysteryCSP
+
+    rng = random.Random(seed)
+    variables = [f'v{i}' for i in range(len(sizes))]
+    domains = {var: [f'{var}_{j}' for j in range(size)] for var, size in zip(variables, sizes)}
+    csp = MurderMysteryCSP(variables, domains)
+    for _ in range(constraints):
+        constraint = random_constraint(rng, domains)
+        if isinstance(constraint, tuple):
+            csp.add_constraint(constraint[0], weight=rng.randint(1, 9), scope=constraint[1])
+        else:
+            csp.add_constraint(constraint, weight=rng.randint(1, 9))
+    return csp
+
+def brute_force(csp):
+    """[(assignment, score)] for every assignment meeting the hard constraints"""
+    hard = [c['func'] for c in csp.constraints if c['hard']]
+    scored = []
+    for values in product(*(csp.domains[var] for var in csp.variables)):
+        assignment = dict(zip(csp.variables, values))
+        if all(func(assignment) for func in hard):
+            scored.append((assignment, csp.evaluate_assignment(assignment)[0]))
+    return scored
+
+def brute_force_maxima(csp, scored):
+    return {var: {value: max((score for assignment, score in scored if assignment[var] == value),
+                             default=float('-inf'))
+                  for value in csp.domains[var]}
+            for var in csp.variables}
+
+def assert_tensor_matches(csp):
+    scored = brute_force(csp)
+    scores = csp.score_tensor()
+    for assignment, score in scored:
+        index = tuple(csp.domains[var].index(assignment[var]) for var in csp.variables)
+        assert scores[index] == score
+    assignment, score, confidence = csp.find_best_solution()
+    if not scored:
+        assert assignment is None
+        return
+    best = max(score for _, score in scored)
+    # The first maximum in domain order, as the nested loops found it
+    assert (assignment, score) == next(pair for pair in scored if pair[1] == best)
+    assert confidence == (score / csp.total_weight if csp.total_weight else 0)
+    assert csp.variable_maxima() == brute_force_maxima(csp, scored)
+
+def test_tensor_matches_brute_force():
+    for seed in range(25):
+        assert_tensor_matches(random_csp(seed))
+
+def test_default_case():
+    from mystery_engine.csp import MurderMysteryCSP
+
+    csp = MurderMysteryCSP()
+    for clue in ('bloodstained_glove', 'shattered_wine_glass', 'missing_knife',
+                 'poison_analysis', 'dining_room_scene', 'inheritance_motive'):
+        csp.add_evidence(clue, {})
+    assert_tensor_matches(csp)
+    assert csp.find_best_solution()[0] == {'murderer': 'Heiress', 'weapon': 'Poison',
+                                           'location': 'Dining Room', 'motive': 'Inheritance'}
+    assert csp.get_suspect_rankings()[0] == ('Heiress', csp.total_weight)
+
+def test_running_scores_follow_evidence():
+    csp = random_csp(40, constraints=3)
+    csp.score_tensor()
+    rng = random.Random(40)
+    for step in range(60):
+        roll = rng.random()
+        if roll < 0.4:
+            pairs = [(random_constraint(rng, csp.domains), rng.randint(1, 9))
+                     for _ in range(rng.randint(1, 3))]
+            csp.add_evidence(f'clue {step}', {}, [pair for pair in pairs
+                                                  if not isinstance(pair[0], tuple)])
+        elif roll < 0.6 and csp.evidence:
+            assert csp.retract_evidence(rng.choice(list(csp.evidence)))
+        elif roll < 0.8:
+            constraint = random_constraint(rng, csp.domains)
+            if not isinstance(constraint, tuple):
+                csp.add_constraint(constraint, weight=rng.choice((1, 2.5, 4)))
+        elif csp.constraints:
+            assert csp.remove_constraint(rng.choice(csp.constraints))
+        assert_tensor_matches(csp)
+    assert not csp.retract_evidence('never found')
+
+def test_retract_restores_the_previous_answer():
+    from mystery_engine.csp import MurderMysteryCSP
+
+    csp = MurderMysteryCSP()
+    csp.add_evidence('bloodstained_glove', {})
+    before = csp.query()
+    version = csp.version
+    csp.add_evidence('shattered_wine_glass', {})
+    assert csp.version > version and csp.evidence_weight('shattered_wine_glass') == 5
+    assert csp.retract_evidence('shattered_wine_glass')
+    assert csp.query() == before
+
+def with_hard_constraints(csp, seed, count=2):
+    rng = random.Random(seed)
+    for _ in range(count):
+        constraint = random_constraint(rng, csp.domains)
+        if isinstance(constraint, tuple):
+            csp.add_constraint(constraint[0], scope=constraint[1], hard=True)
+        else:
+            csp.add_constraint(constraint, hard=True)
+    return csp
+
+def test_branch_and_bound_matches_brute_force():
+    for seed in range(30):
+        csp = random_csp(seed, constraints=10)
+        if seed % 2:
+            with_hard_constraints(csp, seed)
+        scored = brute_force(csp)
+        assignment, score, _ = csp.solve_branch_and_bound()
+        if not scored:
+            assert assignment is None
+            continue
+        assert score == max(score for _, score in scored)
+        assert (assignment, score) in scored
+        maxima = brute_force_maxima(csp, scored)
+        for var in csp.variables:
+            assert csp._branch_and_bound_maxima(var) == maxima[var]
+
+def test_propagation_keeps_every_supported_value():
+    for seed in range(30):
+        csp = with_hard_constraints(random_csp(seed, constraints=0), seed, count=3)
+        domains = {var: list(values) for var, values in csp.domains.items()}
+        scored = brute_force(csp)
+        if not csp.propagate(domains):
+            assert not scored
+            continue
+        for assignment, _ in scored:
+            assert all(assignment[var] in domains[var] for var in csp.variables)
+
+def test_large_spaces_use_branch_and_bound():
+    for seed in range(4):
+        sizes = (6, 5, 4, 6, 3, 5, 4, 3)
+        tensor = with_hard_constraints(random_csp(seed, constraints=25, sizes=sizes), seed)
+        searched = with_hard_constraints(random_csp(seed, constraints=25, sizes=sizes), seed)
+        searched.tensor_limit = 1000
+        expected, result = tensor.query(), searched.query()
+        assert result['best'][1:] == expected['best'][1:]
+        best = result['best'][0]
+        assert tensor.evaluate_assignment(best)[0] == expected['best'][1]
+        assert all(c['func'](best) for c in tensor.constraints if c['hard'])
+        assert result['max_marginals'] == expected['max_marginals']
+        assert searched.search_stats['nodes'] < searched.space_size()
+
+def test_query_matches_brute_force():
+    import math
+
+    for seed in range(20):
+        csp = random_csp(seed)
+        if seed % 3 == 0:
+            with_hard_constraints(csp, seed)
+        scored = brute_force(csp)
+        for temperature in (0.5, 2.0):
+            result = csp.query(k=7, temperature=temperature)
+            if not scored:
+                assert result['top_k'] == [] and result['best'][0] is None
+                continue
+            peak = max(score for _, score in scored)
+            weights = [math.exp((score - peak) / temperature) for _, score in scored]
+            for var in csp.variables:
+                for value in csp.domains[var]:
+                    mass = sum(weight for (assignment, _), weight in zip(scored, weights)
+                               if assignment[var] == value)
+                    assert math.isclose(result['marginals'][var][value], mass / sum(weights),
+                                        abs_tol=1e-12)
+            # Top-k ordered by score, ties in domain order
+            ranked = sorted(enumerate(scored), key=lambda item: (-item[1][1], item[0]))
+            assert result['top_k'] == [pair for _, pair in ranked[:7]]
+            maxima = brute_force_maxima(csp, scored)
+            assert result['max_marginals'] == maxima
+            total = csp.total_weight
+            assert result['confidence'] == {
+                var: {value: max(score, 0) / total for value, score in values.items()}
+                for var, values in maxima.items()}
+
+def test_query_is_cached_until_evidence_changes():
+    from mystery_engine.csp import MurderMysteryCSP
+
+    csp = MurderMysteryCSP()
+    csp.add_evidence('bloodstained_glove', {})
+    first = csp.query()
+    assert csp.query() is first
+    csp.add_evidence('poison_analysis', {})
+    second = csp.query()
+    assert second is not first
+    assert second['top_k'][0][0]['weapon'] == 'Poison'
+
+def random_candidates(seed, csp, count=12):
+    rng = random.Random(seed)
+    candidates = {}
+    for i in range(count):
+        pairs = []
+        while len(pairs) < rng.randint(1, 3):
+            constraint = random_constraint(rng, csp.domains)
+            if not isinstance(constraint, tuple):
+                pairs.append((constraint, rng.randint(1, 9)))
+        candidates[f'lead {i}'] = pairs
+    candidates['lead 0 again'] = candidates['lead 0']  # Equal evidence shares a row
+    return candidates
+
+def re_solved(seed, pairs, hard, temperature):
+    """Counterfactual result for pairs by adding them to a fresh copy of random_csp(seed)"""
+    csp = random_csp(seed)
+    if hard:
+        with_hard_constraints(csp, seed)
+    now = csp.query(temperature=temperature)
+    for constraint, weight in pairs:
+        csp.add_constraint(constraint, weight=weight)
+    then = csp.query(temperature=temperature)
+    solution, score, confidence = then['best']
+    shift = max(0.5 * sum(abs(then['marginals'][var][value] - now['marginals'][var][value])
+                          for value in csp.domains[var])
+                for var in csp.variables)
+    return {'solution': solution, 'score': score, 'confidence': confidence,
+            'changes_solution': solution != now['best'][0],
+            'confidence_gain': confidence - now['best'][2], 'shift': shift}
+
+def test_counterfactuals_match_re_solving():
+    import math
+
+    for seed in range(12):
+        hard = seed % 3 == 0
+        csp = random_csp(seed)
+        if hard:
+            with_hard_constraints(csp, seed)
+        candidates = random_candidates(seed, csp)
+        temperature = 1.0 if seed % 2 else 3.0
+        if seed % 4 == 1:
+            csp.counterfactual_block = 1  # One row per block
+        results = csp.counterfactuals(candidates, temperature)
+        assert set(results) == set(candidates)
+        for label, pairs in candidates.items():
+            expected = re_solved(seed, pairs, hard, temperature)
+            result = results[label]
+            for key in ('solution', 'score', 'changes_solution'):
+                assert result[key] == expected[key]
+            for key in ('confidence', 'confidence_gain', 'shift'):
+                assert math.isclose(result[key], expected[key], abs_tol=1e-9)
+
+def test_counterfactuals_by_search_leave_the_csp_alone():
+    sizes = (6, 5, 4, 6, 3, 5, 4, 3)
+    tensor = random_csp(3, constraints=20, sizes=sizes)
+    searched = random_csp(3, constraints=20, sizes=sizes)
+    searched.tensor_limit = 1000
+    candidates = random_candidates(3, tensor, count=4)
+    before = searched.query()
+    expected = tensor.counterfactuals(candidates)
+    results = searched.counterfactuals(candidates)
+    for label in candidates:
+        assert results[label]['score'] == expected[label]['score']
+        assert tensor.evaluate_assignment(results[label]['solution'])[0] + sum(
+            weight for constraint, weight in candidates[label]
+            if constraint(results[label]['solution'])) == expected[label]['score']
+    assert len(searched.constraints) == 20 and searched.query() == before
+
+def test_hints_rank_the_case_leads():
+    from mystery_engine.case import build_case_csp
+    from mystery_engine.graph import MansionGraph
+    from mystery_engine.hints import case_candidates, rank_hints
+
+    csp = build_case_csp([('missing_knife', '')])
+    candidates = case_candidates(MansionGraph(), ['Kitchen'], evidence=['missing_knife'])
+    assert ('room', 'Kitchen') not in candidates
+    assert ('suspect', 'Butler') in candidates and ('suspect', 'Maid') not in candidates
+    hints = rank_hints(csp, candidates)
+    keys = [(hint['changes_solution'], hint['shift'], hint['confidence_gain']) for hint in hints]
+    assert keys == sorted(keys, reverse=True)
+    assert rank_hints(csp, candidates, top=2) == hints[:2]
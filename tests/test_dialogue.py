@@ -0,0 +1,124 @@
+"""Dialogue minimax with tables and move ordering against plain minimax"""
+
+import json
+
+import pytest
+
+from conftest import plain_minimax, random_dialogue
+
+def dialogue_nodes(document):
+    """DialogueNode DAG for a dialogue document; shared follow-ups stay shared"""
+    from mystery_engine.dialogue import DialogueNode
+
+    nodes = {entry['id']: DialogueNode(entry['speaker'], entry['text'],
+                                       is_terminal=entry.get('terminal', False),
+                                       value=entry.get('value', 0), key=entry['id'])
+             for entry in document['nodes']}
+    for entry in document['nodes']:
+        nodes[entry['id']].children = [nodes[child] for child in entry.get('children', [])]
+    return nodes[document['root']]
+
+def plain_node_minimax(dialogue_system, node, depth, maximizing_player, suspect_name):
+    if depth == 0 or node.is_terminal:
+        return dialogue_system.evaluate_dialogue_outcome(node, suspect_name)
+    values = [plain_node_minimax(dialogue_system, child, depth - 1, not maximizing_player,
+                                 suspect_name)
+              for child in node.children]
+    return max(values) if maximizing_player else min(values)
+
+def test_pruned_search_matches_plain_minimax():
+    from mystery_engine.dialogue import DialogueSystem
+
+    for seed in range(6):
+        root = dialogue_nodes(random_dialogue(seed))
+        ds = DialogueSystem()  # Tables are shared across every search below
+        for suspect in ('Heiress', 'Butler'):
+            for depth in range(1, 8):
+                for maximizing in (True, False):
+                    expected = plain_node_minimax(ds, root, depth, maximizing, suspect)
+                    assert ds.search(root, depth, suspect, maximizing) == expected
+
+def test_transpositions_are_reused():
+    from mystery_engine.dialogue import DialogueSystem
+
+    ds = DialogueSystem()
+    root = dialogue_nodes(random_dialogue(3, share=0.5))
+    first = ds.search(root, 6, 'Heiress')
+    searched = ds.search_stats['nodes_searched']
+    assert ds.search(root, 6, 'Heiress') == first
+    assert ds.search_stats['tt_hits'] >= 1
+    assert ds.search_stats['nodes_searched'] < searched
+
+def test_capped_tables_stay_exact():
+    from mystery_engine.dialogue import DialogueSystem
+
+    for seed in range(4):
+        ds = DialogueSystem()
+        ds.table_limit = 16
+        root = dialogue_nodes(random_dialogue(seed))
+        for depth in (3, 6):
+            assert ds.search(root, depth, 'Heiress') == plain_node_minimax(
+                ds, root, depth, True, 'Heiress')
+            assert len(ds.transposition_table) <= 16
+            assert len(ds.evaluation_cache) <= 16
+            assert len(ds.history_scores) <= 16
+
+def test_butler_tree():
+    from mystery_engine.dialogue import DialogueSystem
+
+    ds = DialogueSystem()
+    root = ds.create_butler_dialogue_tree()
+    for depth in range(1, 5):
+        assert ds.search(root, depth, 'Butler') == plain_node_minimax(ds, root, depth, True, 'Butler')
+
+def test_compiled_search_matches_plain_minimax():
+    from mystery_engine.dialogue import DialogueSystem, compile_dialogue_tree
+
+    for seed in range(6):
+        document = random_dialogue(seed)
+        tree = compile_dialogue_tree(document)
+        root = dialogue_nodes(document)
+        ds = DialogueSystem()
+        for depth in range(1, 8):
+            for maximizing in (True, False):
+                expected = plain_minimax(ds, tree, 0, depth, maximizing, 'Heiress')
+                assert expected == plain_node_minimax(ds, root, depth, maximizing, 'Heiress')
+                assert ds.search_compiled(tree, depth, 'Heiress', maximizing) == expected
+
+def test_compile_shares_follow_ups_and_round_trips():
+    from mystery_engine.dialogue import (DialogueSystem, compile_dialogue_tree,
+                                         dialogue_tree_to_document)
+
+    document = random_dialogue(2, share=0.5)
+    tree = compile_dialogue_tree(document)
+    assert len(tree) == len(document['nodes'])
+    ds = DialogueSystem()
+    butler = ds.create_butler_dialogue_tree()
+    compiled = compile_dialogue_tree(dialogue_tree_to_document(butler, 'Butler'))
+    assert compiled.suspect == 'Butler'
+    assert compiled.node_text(0) == butler.question
+    for depth in range(1, 5):
+        assert ds.search_compiled(compiled, depth, 'Butler') == plain_node_minimax(
+            ds, butler, depth, True, 'Butler')
+
+def test_compile_rejects_dangling_children():
+    from mystery_engine.dialogue import compile_dialogue_tree
+
+    with pytest.raises(ValueError):
+        compile_dialogue_tree({'root': 'a', 'nodes': [{'id': 'a', 'children': ['b']}]})
+    with pytest.raises(ValueError):
+        compile_dialogue_tree({'root': 'z', 'nodes': [{'id': 'a'}]})
+
+def test_library_loads_lazily(tmp_path):
+    from mystery_engine.dialogue import DialogueLibrary
+
+    document = random_dialogue(1)
+    del document['suspect']
+    (tmp_path / 'lady_grey.json').write_text(json.dumps(document))
+    library = DialogueLibrary(str(tmp_path))
+    assert library.has_tree('Lady Grey') and not library.has_tree('Butler')
+    assert library.trees == {}
+    tree = library.get('Lady Grey')
+    assert tree.suspect == 'Lady Grey' and library.get('Lady Grey') is tree
+    library.unload('Lady Grey')
+    assert library.trees == {}
@@ -0,0 +1,40 @@
+"""Streaming table exports"""
+
+import csv
+import json
+import os
+
+import pytest
+
+def test_export_all_writes_the_case(tmp_path):
+    from mystery_engine.export import EXPORT_FILES, export_all
+    from mystery_engine.graph import MansionGraph
+    from mystery_engine.loaders import read_mansion_csv
+
+    paths = export_all(str(tmp_path))
+    assert [os.path.basename(path) for path in paths] == EXPORT_FILES
+    mansion = read_mansion_csv(paths[0])
+    original = MansionGraph()
+    assert dict(mansion.rooms) == dict(original.rooms)
+    assert dict(mansion.clues) == dict(original.clues)
+    assert dict(mansion.warnings) == dict(original.warnings)
+    with open(paths[4], newline='') as f:
+        solution = {row['variable']: row['solution'] for row in csv.DictReader(f)}
+    assert solution == {'murderer': 'Heiress', 'weapon': 'Poison',
+                        'location': 'Dining Room', 'motive': 'Inheritance'}
+
+def test_json_lines_append(tmp_path):
+    from mystery_engine.export import write_table
+
+    path = str(tmp_path / 'games.jsonl')
+    rows = ({'game': i, 'moves': i * i} for i in range(5))
+    assert write_table(path, ['game', 'moves'], rows) == 5
+    assert write_table(path, ['game', 'moves'], [{'game': 5, 'moves': 25}], append=True) == 1
+    with open(path) as f:
+        assert [json.loads(line)['moves'] for line in f] == [i * i for i in range(6)]
+
+def test_unknown_format(tmp_path):
+    from mystery_engine.export import open_table
+
+    with pytest.raises(ValueError):
+        open_table(str(tmp_path / 'table.xlsx'), ['a'])
@@ -0,0 +1,110 @@
+"""Evolving hazards: SafeRegion, batched passage removal and inference, against BFS"""
+
+import random
+
+from conftest import bfs_distances, random_rooms
+
+def test_remove_edges_matches_model():
+    from mystery_engine.graph import CompactLayout
+
+    for seed in range(10):
+        rng = random.Random(seed)
+        layout = CompactLayout.from_dicts(random_rooms(seed, count=20, extra=10))
+        for _ in range(5):  # Some parallel connections too
+            layout.add_edge(rng.randrange(20), rng.randrange(20))
+        model = [list(layout.neighbors(room)) for room in range(20)]
+        pairs = [(room, rng.choice(model[room]) if model[room] and rng.random() < 0.8
+                  else rng.randrange(20))
+                 for room in (rng.randrange(20) for _ in range(rng.randint(1, 25)))]
+        removed = 0
+        for room_a, room_b in dict.fromkeys(pairs):
+            if room_b in model[room_a]:
+                model[room_a].remove(room_b)
+                removed += 1
+        version = layout.version
+        assert layout.remove_edges(pairs) == removed
+        assert [list(layout.neighbors(room)) for room in range(20)] == model
+        assert layout.offsets[-1] == len(layout.targets)
+        assert layout.version == version + (1 if removed else 0)
+
+def evolving_mansion(seed):
+    from mystery_engine.generator import HAZARDS
+    from mystery_engine.graph import MansionGraph
+
+    rng = random.Random(seed)
+    rooms = random_rooms(seed, count=60, extra=40)
+    names = sorted(rooms)
+    hazards = {room: HAZARDS[0][0] for room in rng.sample(names[1:], 2)}
+    hazards.update({room: HAZARDS[1][0] for room in rng.sample(names[1:], 4)
+                    if room not in hazards})
+    return MansionGraph.from_dicts(rooms, hazards=hazards), names[0]
+
+def assert_region_matches_bfs(region, mansion):
+    layout = mansion.layout
+    blocked = bytearray(1 if hazard >= 0 else 0 for hazard in layout.hazard)
+    reachable = bfs_distances(layout, region.root, blocked)
+    assert {layout.names[room] for room, d in enumerate(reachable) if d >= 0} == set(region)
+    assert len(region) == sum(d >= 0 for d in reachable)
+    for room, parent in enumerate(region.parent):
+        if parent >= 0 and room != region.root:
+            assert reachable[parent] >= 0 and layout.has_edge(parent, room)
+
+def test_safe_region_follows_spreading_hazards():
+    from mystery_engine.hazards import HazardSpread, SafeRegion
+
+    for seed in range(10):
+        mansion, start = evolving_mansion(seed)
+        mansion.build_path_table()
+        region = SafeRegion(mansion, start)
+        spread = HazardSpread(mansion, gas_rate=0.2, collapse_rate=0.2, seed=seed, region=region)
+        rng = random.Random(seed)
+        for tick in range(15):
+            spread.tick()
+            assert_region_matches_bfs(region, mansion)
+            if tick % 3 == 0:  # New passages are dug as well
+                room_a, room_b = rng.sample(list(mansion.layout.names), 2)
+                mansion.add_connection(room_a, room_b if tick % 2 else f'Tunnel {tick}')
+                names = mansion.layout.names
+                region.connection_added(names.index(room_a),
+                                        names.index(room_b if tick % 2 else f'Tunnel {tick}'))
+                assert_region_matches_bfs(region, mansion)
+            if not len(region):
+                break
+        # The path table saw every cave-in
+        layout = mansion.layout
+        for target in range(layout.room_count()):
+            assert list(mansion.path_table.distance[target]) == bfs_distances(layout, target)
+
+def test_spreading_gas_revokes_safety():
+    from mystery_engine.graph import MansionGraph
+    from mystery_engine.hazards import HazardSpread
+    from mystery_engine.inference import GAS_MASK_EQUIPPED, WumpusInference
+
+    mansion = MansionGraph()
+    inference = WumpusInference(mansion, verbose=False)
+    inference.current_room = 'Dining Room'
+    inference.detect_hazards('Dining Room')
+    inference.detect_hazards('Kitchen')
+    assert 'Kitchen' in inference.safe_rooms
+    assert not inference.can_safely_enter('Cellar')
+    route = inference.plan_safe_route('Kitchen')[0]
+    assert route == ['Dining Room', 'Kitchen']
+
+    spread = HazardSpread(mansion, gas_rate=1.0, collapse_rate=0.0, seed=0, inference=inference)
+    assert 'Kitchen' in spread.tick()['gassed']
+    assert 'Kitchen' not in inference.safe_rooms
+    assert inference.plan_safe_route('Kitchen')[0] is None
+    inference.add_knowledge(GAS_MASK_EQUIPPED)
+    assert inference.plan_safe_route('Kitchen')[0] == ['Dining Room', 'Kitchen']
+
+def test_dangerous_room_needs_evidence_of_its_hazard():
+    from mystery_engine.graph import MansionGraph
+    from mystery_engine.inference import GAS_MASK_EQUIPPED, WumpusInference
+
+    mansion = MansionGraph()
+    inference = WumpusInference(mansion, verbose=False)
+    inference.add_knowledge(GAS_MASK_EQUIPPED)
+    inference.dangerous_rooms.add('Library')  # Flagged, but nothing sensed next to it
+    assert not inference.can_safely_enter('Library')
+    assert inference.can_safely_enter('Cellar')  # Its recorded gas leak, and a mask
+    assert not inference.can_safely_enter('Secret Passage')  # Collapse needs reinforcement
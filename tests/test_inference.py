@@ -0,0 +1,129 @@
+"""WumpusInference: incremental forward chaining against a from-scratch fixpoint"""
+
+import random
+
+from conftest import random_rooms
+
+def hazardous_mansion(seed, hazards=4):
+    """Random mansion whose hazard rooms warn their neighbours"""
+    from mystery_engine.graph import MansionGraph
+
+    rng = random.Random(seed)
+    rooms = random_rooms(seed, count=30, extra=15)
+    hazard_rooms = rng.sample(sorted(rooms), hazards)
+    warnings = {}
+    for room in hazard_rooms:
+        for neighbor in rooms[room]:
+            warnings.setdefault(neighbor, []).append('You smell gas' if rng.random() < 0.5
+                                                     else 'You hear rumbling')
+    return MansionGraph.from_dicts(rooms, hazards={room: 'Gas leak' for room in hazard_rooms},
+                                   warnings=warnings)
+
+def derived_safe_rooms(mansion, visited):
+    """Visited rooms plus the hazard-free neighbours of every warning-free safe room"""
+    safe = set(visited)
+    frontier = list(safe)
+    while frontier:
+        room = frontier.pop()
+        if mansion.warnings.get(room):
+            continue
+        for neighbor in mansion.rooms[room]:
+            if neighbor not in safe and neighbor not in mansion.hazards:
+                safe.add(neighbor)
+                frontier.append(neighbor)
+    return safe
+
+def test_forward_chaining_matches_fixpoint():
+    from mystery_engine.inference import WumpusInference
+
+    for seed in range(8):
+        mansion = hazardous_mansion(seed)
+        rng = random.Random(seed)
+        inference = WumpusInference(mansion, verbose=False)
+        inference.current_room = rng.choice([room for room in mansion.rooms
+                                             if room not in mansion.hazards])
+        inference.detect_hazards(inference.current_room)
+        visited = {inference.current_room}
+        for _ in range(40):
+            options = [room for room in mansion.rooms[inference.current_room]
+                       if inference.can_safely_enter(room)]
+            if not options:
+                break
+            moved, _ = inference.move_to_room(rng.choice(options))
+            assert moved
+            visited.add(inference.current_room)
+            assert inference.safe_rooms == derived_safe_rooms(mansion, visited)
+            assert not inference.safe_rooms & set(mansion.hazards)
+            assert not inference.safe_rooms & inference.dangerous_rooms
+
+        # Re-deriving everything from the stored facts changes nothing
+        fresh = WumpusInference(mansion, verbose=False)
+        for predicate, room_id in inference.knowledge_base.facts:
+            fresh.knowledge_base.add(predicate, room_id)
+        fresh.infer_safe_rooms()
+        assert fresh.safe_rooms == inference.safe_rooms
+
+def test_knowledge_base_indexes_any_room_name():
+    from mystery_engine.graph import MansionGraph
+    from mystery_engine.inference import GAS_DETECTED, VISITED_SURVIVED, KnowledgeBase
+
+    mansion = MansionGraph.from_dicts({'Wine_Cellar': ['Old Study'], 'Old Study': ['Wine_Cellar']})
+    knowledge_base = KnowledgeBase(mansion.layout)
+    fact = knowledge_base.add(VISITED_SURVIVED, 'Wine_Cellar')
+    assert knowledge_base.add(VISITED_SURVIVED, 'Wine_Cellar') is None
+    knowledge_base.add(GAS_DETECTED, 'Old Study')
+    assert fact in knowledge_base and knowledge_base.holds(GAS_DETECTED, 'Old Study')
+    assert knowledge_base.rooms_with(VISITED_SURVIVED) == {mansion.layout.names.index('Wine_Cellar')}
+    assert knowledge_base.facts_about('Wine_Cellar') == {fact}
+    assert set(knowledge_base) == {'visited_Wine_Cellar_survived', 'gas_detected_from_Old Study'}
+
+def test_knowledge_base_accepts_whole_statements():
+    from mystery_engine.graph import MansionGraph
+    from mystery_engine.inference import GAS_MASK_EQUIPPED, VISITED_SURVIVED, WumpusInference
+
+    mansion = MansionGraph.from_dicts({'Wine_Cellar': ['Old Study'], 'Old Study': ['Wine_Cellar']})
+    inference = WumpusInference(mansion, verbose=False)
+    knowledge_base = inference.knowledge_base
+    fact = inference.add_knowledge('visited_Old Study_survived')
+    assert fact == (VISITED_SURVIVED, mansion.layout.names.index('Old Study'))
+    assert 'Old Study' in inference.safe_rooms and 'Wine_Cellar' in inference.safe_rooms
+    assert inference.add_knowledge(VISITED_SURVIVED, 'Old Study') is None
+    assert 'visited_Old Study_survived' in knowledge_base
+    assert 'visited_Wine_Cellar_survived' not in knowledge_base
+    knowledge_base.add('visited_Wine_Cellar_survived')
+    assert knowledge_base.holds(VISITED_SURVIVED, 'Wine_Cellar')
+    assert set(knowledge_base) == {'visited_Old Study_survived', 'visited_Wine_Cellar_survived'}
+    # Statements about no known room stay facts without a room
+    assert 'gas_mask_equipped' not in knowledge_base
+    inference.add_knowledge('gas_mask_equipped')
+    assert GAS_MASK_EQUIPPED in knowledge_base and knowledge_base.holds('gas_mask_equipped')
+    assert knowledge_base.add('visited_Attic_survived') == ('visited_Attic_survived', None)
+
+def test_safe_route_avoids_the_cellar():
+    from mystery_engine.graph import MansionGraph
+    from mystery_engine.inference import WumpusInference
+
+    inference = WumpusInference(MansionGraph(), verbose=False)
+    inference.detect_hazards('Hall')
+    route, _ = inference.plan_safe_route('Library')
+    assert route == ['Hall', 'Study', 'Library']
+    assert inference.plan_safe_route('Cellar')[0] is None
+
+def test_route_cache_drops_stale_routes():
+    from mystery_engine.graph import MansionGraph
+    from mystery_engine.inference import GAS_MASK_EQUIPPED, WumpusInference
+
+    events = []
+    inference = WumpusInference(MansionGraph(), verbose=False,
+                                on_event=lambda event, details: events.append(event))
+    inference.current_room = 'Dining Room'
+    inference.detect_hazards('Dining Room')
+    first = inference.plan_safe_route('Library')
+    assert inference.plan_safe_route('Library') == first
+    assert events.count('route_cache_hit') == 1
+    inference.detect_hazards('Kitchen')
+    assert inference.plan_safe_route('Cellar')[0] is None
+    inference.add_knowledge(GAS_MASK_EQUIPPED)
+    assert inference.plan_safe_route('Cellar')[0] == ['Dining Room', 'Kitchen', 'Cellar']
+    inference.mansion.remove_connection('Kitchen', 'Cellar')
+    assert inference.plan_safe_route('Cellar')[0] is None
@@ -0,0 +1,82 @@
+"""CompactLayout (CSR adjacency) against a plain dict-of-lists model"""
+
+import random
+
+from conftest import random_rooms
+
+def assert_matches(layout, model):
+    assert sorted(layout.names) == sorted(model)
+    for room, neighbors in model.items():
+        room_id = layout.names.index(room)
+        assert [layout.names[n] for n in layout.neighbors(room_id)] == neighbors
+    assert layout.offsets[-1] == len(layout.targets) == sum(map(len, model.values()))
+
+def test_from_dicts_keeps_rows_and_attributes():
+    from mystery_engine.graph import MansionGraph
+
+    rooms = random_rooms(3)
+    clues = {'Room 1': 'A torn letter'}
+    hazards = {'room_3': 'Gas leak'}
+    warnings = {'Room 2': ['You smell gas', 'You hear rumbling']}
+    mansion = MansionGraph.from_dicts(rooms, clues, hazards, warnings, {'Room 1': (1.5, -2)})
+    assert_matches(mansion.layout, rooms)
+    assert dict(mansion.rooms) == rooms
+    assert dict(mansion.clues) == clues and dict(mansion.hazards) == hazards
+    assert mansion.warnings['Room 2'] == warnings['Room 2']
+    assert 'Room 4' not in mansion.warnings
+    room_id = mansion.layout.names.index('Room 1')
+    assert (mansion.layout.x[room_id], mansion.layout.y[room_id]) == (1.5, -2)
+
+def test_edge_edits_match_model():
+    from mystery_engine.graph import CompactLayout
+
+    rooms = random_rooms(4, count=25, extra=10)
+    layout = CompactLayout.from_dicts(rooms)
+    model = {room: list(neighbors) for room, neighbors in rooms.items()}
+    rng = random.Random(4)
+    for step in range(300):
+        room_a = rng.choice(list(model))
+        if rng.random() < 0.5 and model[room_a]:
+            room_b = rng.choice(model[room_a])
+            assert layout.remove_edge(layout.names.index(room_a), layout.names.index(room_b))
+            model[room_a].remove(room_b)
+        else:
+            room_b = rng.choice(list(model)) if rng.random() < 0.8 else f'Annex {step}'
+            id_b = layout.intern_room(room_b)
+            model.setdefault(room_b, [])
+            layout.add_edge(layout.names.index(room_a), id_b)
+            model[room_a].append(room_b)
+        assert_matches(layout, model)
+    assert not layout.remove_edge(0, layout.room_count() + 5)
+
+def test_buffers_round_trip_and_copy_on_write():
+    from mystery_engine.graph import CompactLayout, MansionGraph
+
+    original = MansionGraph().layout
+    copy = CompactLayout.from_buffers(original.to_buffers())
+    mansion = MansionGraph(copy)
+    assert dict(mansion.rooms) == dict(MansionGraph().rooms)
+    assert dict(mansion.hazards) == dict(MansionGraph().hazards)
+    assert mansion.warnings['Kitchen'] == ['You smell gas from the Cellar']
+    mansion.add_connection('Library', 'Observatory')
+    mansion.warnings['Hall'] = ['A draught']
+    assert 'Observatory' in mansion.rooms['Library']
+    assert mansion.warnings['Hall'] == ['A draught']
+
+def test_views_leave_new_rooms_to_the_mansion():
+    import pytest
+
+    from mystery_engine.graph import MansionGraph
+
+    mansion = MansionGraph()
+    table = mansion.build_path_table()
+    for view, value in ((mansion.clues, 'A note'), (mansion.hazards, 'Gas leak'),
+                        (mansion.warnings, ['A draught'])):
+        with pytest.raises(KeyError):
+            view['Observatory'] = value
+    assert 'Observatory' not in mansion.rooms
+    mansion.add_connection('Library', 'Observatory')
+    mansion.clues['Observatory'] = 'A star chart'
+    mansion.warnings['Observatory'] = ['A draught']
+    assert mansion.path_table is table
+    assert mansion.shortest_path('Hall', 'Observatory') == ['Hall', 'Study', 'Library', 'Observatory']
@@ -0,0 +1,52 @@
+"""The importable package and its command line"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def run_python(code):
+    return subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True,
+                          text=True, check=True).stdout
+
+def test_import_is_lazy():
+    loaded = json.loads(run_python(
+        "import json, sys, mystery_engine; from mystery_engine import MansionGraph; "
+        "print(json.dumps(sorted(m for m in sys.modules if m.split('.')[0] in "
+        "('mystery_engine', 'numpy', 'plotly'))))"))
+    assert 'mystery_engine.graph' in loaded
+    assert not any(name.split('.')[0] in ('numpy', 'plotly') for name in loaded)
+    assert 'mystery_engine.csp' not in loaded
+
+def test_unknown_export_raises():
+    import mystery_engine
+
+    with pytest.raises(AttributeError):
+        mystery_engine.NoSuchThing
+
+def test_every_export_resolves():
+    import mystery_engine
+
+    for name in mystery_engine.__all__:
+        assert getattr(mystery_engine, name) is not None
+
+def test_cli_solve_json(capsys):
+    from mystery_engine.cli import main
+
+    main(['solve', '--json', '--top', '2'])
+    result = json.loads(capsys.readouterr().out)
+    assert result['solution'] == {'murderer': 'Heiress', 'weapon': 'Poison',
+                                  'location': 'Dining Room', 'motive': 'Inheritance'}
+    assert result['confidence'] == 1.0
+    assert len(result['top_k']) == 2
+
+def test_cli_simulate_runs_without_a_pool(capsys):
+    from mystery_engine.cli import main
+
+    main(['simulate', '--games', '20', '--workers', '1', '--policy', 'greedy'])
+    summary = json.loads(capsys.readouterr().out)
+    assert summary['games'] == 20
@@ -0,0 +1,55 @@
+"""ShortestPathTable against plain BFS, before and after incremental edits"""
+
+import random
+
+from conftest import bfs_distances
+
+def assert_table_matches_bfs(mansion):
+    layout = mansion.layout
+    table = mansion.path_table
+    for target in range(layout.room_count()):
+        expected = bfs_distances(layout, target)
+        assert list(table.distance[target]) == expected
+        for start, distance in enumerate(expected):
+            path = table.path_ids(start, target)
+            if distance < 0:
+                assert path is None
+                continue
+            assert len(path) == distance + 1
+            assert path[0] == start and path[-1] == target
+            assert all(layout.has_edge(a, b) for a, b in zip(path, path[1:]))
+
+def test_fresh_table_matches_bfs(make_mansion):
+    mansion = make_mansion(1)
+    mansion.build_path_table()
+    assert_table_matches_bfs(mansion)
+
+def test_edits_keep_table_exact(make_mansion):
+    mansion = make_mansion(2, count=30, extra=15)
+    mansion.build_path_table()
+    rng = random.Random(2)
+    names = list(mansion.layout.names)
+    for step in range(60):
+        if rng.random() < 0.5:
+            room_a = rng.choice(names)
+            neighbors = mansion.rooms[room_a]
+            if neighbors:
+                mansion.remove_connection(room_a, rng.choice(neighbors))
+        else:
+            room_b = rng.choice(names) if rng.random() < 0.9 else f'New Wing {step}'
+            mansion.add_connection(rng.choice(names), room_b)
+            names = list(mansion.layout.names)
+        assert_table_matches_bfs(mansion)
+
+def test_name_level_queries():
+    from mystery_engine.graph import MansionGraph
+
+    mansion = MansionGraph()
+    mansion.build_path_table()
+    assert mansion.shortest_path('Library', 'Cellar') == [
+        'Library', 'Study', 'Hall', 'Dining Room', 'Kitchen', 'Cellar']
+    assert mansion.path_table.distance_between('Library', 'Cellar') == 5
+    assert mansion.path_table.next_room('Library', 'Cellar') == 'Study'
+    mansion.remove_connection('Hall', 'Study')
+    assert mansion.shortest_path('Library', 'Cellar') is None
+    assert mansion.path_table.distance_between('Library', 'Hall') is None
@@ -0,0 +1,123 @@
+"""PathQueries (BFS, bidirectional, A*, nearest) against plain BFS distances"""
+
+import random
+
+from conftest import bfs_distances, random_rooms
+
+def check_path(layout, path, start, goal, expected, blocked=None):
+    if expected < 0:
+        assert path is None
+        return
+    assert len(path) == expected + 1
+    assert path[0] == start and path[-1] == goal
+    assert all(layout.has_edge(a, b) for a, b in zip(path, path[1:]))
+    assert blocked is None or not any(blocked[room] for room in path)
+
+def positioned_mansion(seed, share=1.0):
+    from mystery_engine.graph import MansionGraph
+
+    rng = random.Random(seed)
+    rooms = random_rooms(seed, count=35, extra=20)
+    positions = {room: (rng.randint(0, 9), rng.randint(0, 9))
+                 for room in rooms if rng.random() < share}
+    return MansionGraph.from_dicts(rooms, positions=positions)
+
+def test_searches_match_bfs():
+    for seed, share in ((5, 1.0), (6, 0.6), (7, 0.0)):
+        mansion = positioned_mansion(seed, share)
+        layout, paths = mansion.layout, mansion.paths
+        rng = random.Random(seed)
+        count = layout.room_count()
+        blocked = bytearray(1 if rng.random() < 0.15 else 0 for _ in range(count))
+        for start in range(count):
+            plain = bfs_distances(layout, start)
+            avoiding = bfs_distances(layout, start, blocked)
+            for goal in range(count):
+                for search in (paths.bfs, paths.bidirectional, paths.astar):
+                    check_path(layout, search(start, goal), start, goal, plain[goal])
+                if not blocked[goal]:
+                    check_path(layout, paths.bidirectional(start, goal, blocked), start, goal,
+                               avoiding[goal], blocked)
+                    check_path(layout, paths.astar(start, goal, blocked), start, goal,
+                               avoiding[goal], blocked)
+
+def test_astar_needs_every_coordinate():
+    assert positioned_mansion(5).paths.edge_span() > 0
+    span = positioned_mansion(6, 0.6).paths.edge_span()
+    assert span != span
+
+def test_nearest_matches_bfs():
+    mansion = positioned_mansion(8)
+    layout, paths = mansion.layout, mansion.paths
+    rng = random.Random(8)
+    count = layout.room_count()
+    for _ in range(40):
+        targets = bytearray(1 if rng.random() < 0.1 else 0 for _ in range(count))
+        start = rng.randrange(count)
+        distances = bfs_distances(layout, start)
+        reachable = [distances[room] for room in range(count) if targets[room]]
+        path = paths.nearest(start, targets)
+        if not reachable:
+            assert path is None
+            continue
+        assert targets[path[-1]]
+        check_path(layout, path, start, path[-1], min(reachable))
+
+def test_name_level_searches():
+    from mystery_engine.graph import MansionGraph
+
+    mansion = MansionGraph()
+    assert mansion.bidirectional_path('Library', 'Cellar') == mansion.bfs_pathfind('Library', 'Cellar')
+    assert len(mansion.astar_path('Library', 'Cellar')) == 6
+    assert mansion.bidirectional_path('Library', 'Cellar', avoid=['Hall']) is None
+    assert mansion.nearest_unfound_clue('Hall')[-1] in mansion.clues
+    assert mansion.nearest_safe_room('Cellar')[-1] not in mansion.hazards
+
+def test_distance_field_matches_bfs():
+    from mystery_engine.graph import DistanceField
+
+    for seed in range(6):
+        mansion = positioned_mansion(seed)
+        layout = mansion.layout
+        rng = random.Random(seed)
+        count = layout.room_count()
+        blocked = None
+        if seed % 2:
+            blocked = bytearray(1 if rng.random() < 0.2 else 0 for _ in range(count))
+        targets = rng.sample(range(count), 3)
+        field = DistanceField(layout, targets, blocked)
+        from_targets = [bfs_distances(layout, target, blocked) for target in targets]
+        expected = [min((d[room] for d in from_targets if d[room] >= 0), default=-1)
+                    for room in range(count)]
+        if blocked is not None:
+            for room in range(count):
+                if blocked[room]:
+                    way_out = [expected[n] + 1 for n in layout.neighbors(room)
+                               if not blocked[n] and expected[n] >= 0]
+                    expected[room] = min(way_out, default=-1)
+        assert list(field.distance) == expected
+        for room in range(count):
+            hop = field.next_hop[room]
+            if expected[room] <= 0:
+                assert hop == -1
+            else:
+                assert layout.has_edge(room, hop) and expected[hop] == expected[room] - 1
+
+def test_shared_fields_follow_the_mansion():
+    from mystery_engine.graph import MansionGraph
+
+    mansion = MansionGraph()
+    field = mansion.distance_field(['Dining Room'])
+    assert mansion.distance_field(['Dining Room']) is field
+    assert field.path_from('Library') == ['Library', 'Study', 'Hall', 'Dining Room']
+    assert field.distance_from('Cellar') == 2 and field.next_room('Dining Room') is None
+    names = mansion.layout.names
+    assert field.step([names.index('Library'), names.index('Dining Room')]) == [
+        names.index('Study'), names.index('Dining Room')]
+    mansion.add_connection('Library', 'Dining Room')
+    moved = mansion.distance_field(['Dining Room'])
+    assert moved is not field and moved.distance_from('Library') == 1
+    mansion.hazards['Hall'] = 'Gas leak'
+    assert mansion.distance_field(['Dining Room']).distance_from('Conservatory') is None
+    unguarded = mansion.distance_field(['Dining Room'], avoid_hazards=False)
+    assert unguarded.distance_from('Conservatory') == 2
@@ -0,0 +1,69 @@
+"""Parallel and anytime dialogue search against plain minimax"""
+
+from conftest import plain_minimax, random_dialogue
+
+def test_parallel_matches_serial():
+    from mystery_engine.dialogue import DialogueSystem, ParallelDialogueSearch, compile_dialogue_tree
+
+    ds = DialogueSystem()
+    for seed, workers in ((0, 2), (6, 3), (3, 5)):
+        tree = compile_dialogue_tree(random_dialogue(seed, depth=7, branching=4))
+        with ParallelDialogueSearch(tree, workers=workers) as parallel:
+            # More workers than root children splits on the grandchildren
+            assert (len(parallel.frontier(4)) > len(tree.children(0))) == (workers == 5)
+            for depth in range(1, 8):
+                for maximizing in (True, False):
+                    expected = plain_minimax(ds, tree, 0, depth, maximizing, 'Heiress')
+                    assert parallel.search(depth, 'Heiress', maximizing) == expected
+
+def check_anytime_result(ds, tree, result, maximizing):
+    move, depth, line = result['move'], result['depth'], result['principal_variation']
+    assert move in tree.children(0) and line[0] == move
+    assert all(b in tree.children(a) for a, b in zip(line, line[1:]))
+    # Whatever iteration it came from, the value is the move's exact value at that depth
+    assert result['value'] == plain_minimax(ds, tree, move, depth - 1, not maximizing, 'Heiress')
+    if result['complete']:
+        assert result['value'] == plain_minimax(ds, tree, 0, len(tree), maximizing, 'Heiress')
+
+def test_anytime_values_are_exact_under_any_budget():
+    from mystery_engine.dialogue import DialogueSystem, compile_dialogue_tree
+
+    for seed in (0, 3, 5, 6):
+        tree = compile_dialogue_tree(random_dialogue(seed, depth=7, branching=4))
+        for maximizing in (True, False):
+            for node_limit in (0, 10, 60, 200, 600, 2000, None):
+                ds = DialogueSystem()
+                result = ds.search_anytime(tree, 'Heiress', node_limit=node_limit,
+                                           maximizing_player=maximizing)
+                check_anytime_result(ds, tree, result, maximizing)
+                assert result['complete'] or node_limit is not None
+            ds = DialogueSystem()
+            result = ds.search_anytime(tree, 'Heiress', max_depth=3, maximizing_player=maximizing)
+            assert result['depth'] == 3
+            assert result['value'] == plain_minimax(ds, tree, 0, 3, maximizing, 'Heiress')
+
+def test_anytime_mcts_needs_a_budget():
+    import pytest
+
+    from mystery_engine.dialogue import DialogueSystem, compile_dialogue_tree
+
+    tree = compile_dialogue_tree(random_dialogue(0))
+    ds = DialogueSystem()
+    with pytest.raises(ValueError):
+        ds.search_anytime(tree, 'Heiress', method='mcts')
+    result = ds.search_anytime(tree, 'Heiress', node_limit=300, method='mcts', seed=1)
+    assert result['move'] in tree.children(0) and not result['complete']
+
+def test_anytime_reuses_tables_across_calls():
+    from mystery_engine.dialogue import DialogueSystem, compile_dialogue_tree
+
+    for seed in range(10):
+        tree = compile_dialogue_tree(random_dialogue(seed, depth=7, branching=4))
+        full = plain_minimax(DialogueSystem(), tree, 0, len(tree), True, 'Heiress')
+        for first_limit in (None, 100):
+            ds = DialogueSystem()
+            first = ds.search_anytime(tree, 'Heiress', node_limit=first_limit)
+            check_anytime_result(ds, tree, first, True)
+            second = ds.search_anytime(tree, 'Heiress')
+            check_anytime_result(ds, tree, second, True)
+            assert second['complete'] and second['value'] == full
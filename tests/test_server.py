@@ -0,0 +1,62 @@
+"""GameServer.dispatch driven directly, without sockets or a process pool"""
+
+import asyncio
+
+def play(messages):
+    """Replies to messages sent in order to one fresh server; "session" is filled in"""
+    from mystery_engine.server import GameServer
+
+    async def run():
+        server = GameServer()  # Not started: pool jobs run on the loop's default executor
+        replies = []
+        session = None
+        for message in messages:
+            if session is not None and 'session' not in message:
+                message = {**message, 'session': session}
+            reply = await server.dispatch(message)
+            session = reply.get('session', session)
+            replies.append(reply)
+        return replies
+    return asyncio.run(run())
+
+def test_a_game_from_start_to_accusation():
+    new, study, library, route, interrogate, analysis, hints, accuse, after = play([
+        {'action': 'new_game'},
+        {'action': 'move', 'room': 'Study'},
+        {'action': 'move', 'room': 'Library'},
+        {'action': 'route', 'to': 'Dining Room'},
+        {'action': 'interrogate', 'suspect': 'Butler'},
+        {'action': 'analysis'},
+        {'action': 'hints'},
+        {'action': 'accuse', 'murderer': 'Heiress', 'weapon': 'Poison'},
+        {'action': 'move', 'room': 'Study'},
+    ])
+    assert new['room'] == 'Hall' and new['outcome'] is None
+    assert study['moved'] and study['evidence'] == ['suspicious_ledger']
+    assert library['clue'] == 'Bloodstained glove (belongs to Heiress)'
+    assert route['route'] == ['Library', 'Study', 'Hall', 'Dining Room']
+    assert interrogate['suspect'] == 'Butler' and interrogate['interrogated'] == ['Butler']
+    assert analysis['solution']['murderer'] == 'Heiress'
+    assert hints['hints'] and all(hint['target'] not in ('Study', 'Library')
+                                  for hint in hints['hints'])
+    assert accuse['correct'] and accuse['outcome'] == 'solved'
+    assert after['error'].startswith('game is over')
+
+def test_bad_messages_get_errors():
+    replies = play([
+        {'action': 'state', 'session': 'nobody'},
+        {'action': 'new_game'},
+        {'action': 'fly'},
+        {'action': 'move', 'room': 'Attic'},
+        {'action': 'move', 'room': ['Study']},
+        {'action': 'route', 'to': 7},
+        {'action': 'interrogate', 'suspect': 'Gardener'},
+        {'action': 'accuse', 'weapon': 'Rope'},
+        {'action': 'state'},
+    ])
+    assert 'error' in replies[0] and 'session' in replies[1]
+    assert [reply['error'] for reply in replies[2:8]] == [
+        "unknown action 'fly'", "unknown room 'Attic'", "'room' must be a string",
+        "'to' must be a string", "unknown suspect 'Gardener'",
+        'an accusation needs at least a murderer']
+    assert replies[-1]['room'] == 'Hall' and replies[-1]['outcome'] is None
@@ -0,0 +1,138 @@
+"""Binary game snapshots: dump, load and dump again"""
+
+import random
+
+import pytest
+
+def played_game(seed, moves=12):
+    """A WumpusInference after a random walk through the default mansion, plus its rooms"""
+    from mystery_engine.graph import MansionGraph
+    from mystery_engine.inference import GAS_MASK_EQUIPPED, WumpusInference
+
+    mansion = MansionGraph()
+    wumpus = WumpusInference(mansion, verbose=False)
+    wumpus.detect_hazards(wumpus.current_room)
+    rng = random.Random(seed)
+    found = []
+    if seed % 2:
+        wumpus.add_knowledge(GAS_MASK_EQUIPPED)
+    for _ in range(moves):
+        options = [room for room in mansion.rooms[wumpus.current_room]
+                   if wumpus.can_safely_enter(room)]
+        wumpus.move_to_room(rng.choice(options))
+        if wumpus.current_room in mansion.clues and wumpus.current_room not in found:
+            found.append(wumpus.current_room)
+    return wumpus, found
+
+def assert_same_inference(restored, wumpus):
+    assert restored.current_room == wumpus.current_room
+    assert restored.knowledge_base.facts == wumpus.knowledge_base.facts
+    assert restored.safe_rooms == wumpus.safe_rooms
+    assert restored.dangerous_rooms == wumpus.dangerous_rooms
+
+def test_round_trip():
+    from mystery_engine.snapshot import dump_game, load_game
+
+    for seed in range(6):
+        wumpus, found = played_game(seed)
+        evidence = ['missing_knife', 'bloodstained_glove'][:seed % 3]
+        data = dump_game(wumpus, evidence, found, ['Maid', 'Butler'], moves=12, outcome='solved')
+        state = load_game(data, wumpus.mansion)
+        assert_same_inference(state['wumpus'], wumpus)
+        assert state['evidence'] == evidence and state['found_rooms'] == found
+        assert state['interrogated'] == ['Butler', 'Maid']
+        assert (state['moves'], state['outcome'], state['csp']) == (12, 'solved', None)
+        assert dump_game(state['wumpus'], evidence, found, ['Maid', 'Butler'], 12,
+                         'solved') == data
+        # The restored game plans like the original
+        assert state['wumpus'].plan_safe_route('Hall') == wumpus.plan_safe_route('Hall')
+
+def test_csp_round_trip(tmp_path):
+    from mystery_engine.csp import Equals, NotEquals
+    from mystery_engine.generator import generate_world, load_world_csp
+    from mystery_engine.snapshot import dump_game, load_game, restore_csp
+
+    wumpus, _ = played_game(0, moves=3)
+    case = restore_csp(['bloodstained_glove', 'poison_analysis'])
+    case.add_constraint(NotEquals('motive', 'Money'), hard=True)
+    case.add_constraint(Equals('location', 'Study'), weight=2.5)
+    state = load_game(dump_game(wumpus, ['bloodstained_glove'], csp=case), wumpus.mansion)
+    restored = restore_csp(state['evidence'], state['csp'])
+    assert restored.query() == case.query()
+    assert restored.retract_evidence('poison_analysis') and case.retract_evidence('poison_analysis')
+    assert restored.query() == case.query()
+
+    generate_world(str(tmp_path), seed=2, rooms=100)
+    world = load_world_csp(str(tmp_path))
+    data = dump_game(wumpus, csp=world)
+    restored = restore_csp([], load_game(data, wumpus.mansion)['csp'])
+    assert restored.domains == world.domains
+    assert restored.query() == world.query()
+
+def test_version_1_snapshots_still_load():
+    from mystery_engine import snapshot
+
+    wumpus, found = played_game(3)
+    data = snapshot.dump_game(wumpus, ['missing_knife'], found, moves=4)
+    fields = snapshot._HEADER.unpack_from(data)
+    old = (snapshot._HEADER_V1.pack(fields[0], 1, *fields[2:-1]) +
+           data[snapshot._HEADER.size:])
+    state = snapshot.load_game(old, wumpus.mansion)
+    assert_same_inference(state['wumpus'], wumpus)
+    assert state['evidence'] == ['missing_knife'] and state['csp'] is None
+
+def test_bad_snapshots_are_refused():
+    from mystery_engine.graph import MansionGraph
+    from mystery_engine.snapshot import dump_game, load_game, restore_csp
+
+    wumpus, _ = played_game(1)
+    data = dump_game(wumpus)
+    with pytest.raises(ValueError):
+        load_game(b'XYZ' + data[3:], wumpus.mansion)
+    bigger = MansionGraph()
+    bigger.add_connection('Hall', 'Annex')
+    with pytest.raises(ValueError):
+        load_game(data, bigger)
+    case = restore_csp([])
+    case.add_constraint(lambda assignment: True)
+    with pytest.raises(ValueError):
+        dump_game(wumpus, csp=case)
+
+def test_parked_sessions_resume():
+    from mystery_engine.graph import MansionGraph
+    from mystery_engine.server import SessionStore
+
+    store = SessionStore(MansionGraph(), max_sessions=1)
+    first = store.create()
+    first.wumpus.move_to_room('Study')
+    first.found_rooms.append('Study')
+    first.add_evidence(['suspicious_ledger'])
+    expected = first.state()
+    store.create()
+    assert first.id in store.parked
+    assert store.get(first.id).state() == expected
+
+def test_large_world_round_trip():
+    from mystery_engine.graph import MansionGraph
+    from mystery_engine.inference import GAS_DETECTED, VISITED_SURVIVED, WumpusInference
+    from mystery_engine.snapshot import dump_game, load_game
+
+    count = 200_000
+    names = [f'Room {i}' for i in range(count)]
+    rooms = {name: [names[i - 1]] if i else [] for i, name in enumerate(names)}
+    mansion = MansionGraph.from_dicts(rooms)
+    rng = random.Random(7)
+    wumpus = WumpusInference(mansion, verbose=False)
+    wumpus.current_room = names[-1]
+    for room_id in rng.sample(range(count), 5000):
+        wumpus.knowledge_base.add(VISITED_SURVIVED, room_id)
+    for room_id in (0, 7, 8, count - 1):  # First and last bits of bytes and of the set
+        wumpus.knowledge_base.add(GAS_DETECTED, room_id)
+    wumpus.safe_rooms = {names[room_id] for room_id in rng.sample(range(count), count // 2)}
+    wumpus.dangerous_rooms = {names[room_id] for room_id in range(0, count, 97)}
+    found = [names[room_id] for room_id in rng.sample(range(count), 100)]
+    data = dump_game(wumpus, found_rooms=found)
+    assert len(data) < 5 * count // 8 + 1000
+    state = load_game(data, mansion)
+    assert_same_inference(state['wumpus'], wumpus)
+    assert state['found_rooms'] == found
@@ -0,0 +1,92 @@
+"""Generated worlds: reproducible, connected and solvable"""
+
+import os
+
+from conftest import bfs_distances
+
+def world_files(directory):
+    files = {}
+    for folder, _, names in os.walk(directory):
+        for name in names:
+            path = os.path.join(folder, name)
+            with open(path, 'rb') as f:
+                files[os.path.relpath(path, directory)] = f.read()
+    return files
+
+def test_same_seed_same_world(tmp_path):
+    from mystery_engine.generator import generate_world
+
+    generate_world(str(tmp_path / 'a'), seed=11, rooms=300)
+    generate_world(str(tmp_path / 'b'), seed=11, rooms=300)
+    generate_world(str(tmp_path / 'c'), seed=12, rooms=300)
+    assert world_files(tmp_path / 'a') == world_files(tmp_path / 'b')
+    assert world_files(tmp_path / 'a') != world_files(tmp_path / 'c')
+
+def test_world_is_connected_and_solvable(tmp_path):
+    from mystery_engine.generator import generate_world, load_world_csp
+    from mystery_engine.loaders import load_world
+
+    manifest = generate_world(str(tmp_path), seed=5, rooms=500, clues=30)
+    world = load_world(str(tmp_path), cache=False)
+    mansion = world['mansion']
+    layout = mansion.layout
+    assert layout.room_count() == 500
+    assert min(bfs_distances(layout, layout.names.index(manifest['start_room']))) >= 0
+    for room, neighbors in mansion.rooms.items():
+        assert all(room in mansion.rooms[neighbor] for neighbor in neighbors)
+    assert manifest['start_room'] not in mansion.hazards
+
+    assert load_world_csp(str(tmp_path)).find_best_solution()[0] == manifest['solution']
+    library, dialogue_system = world['dialogue_library'], world['dialogue_system']
+    for suspect in manifest['domains']['murderer']:
+        tree = library.get(suspect)
+        assert isinstance(dialogue_system.search_compiled(tree, 3, suspect), (int, float))
+
+def same_mansion(mansion, expected):
+    assert list(mansion.layout.names) == list(expected.layout.names)
+    for view in ('rooms', 'clues', 'hazards', 'warnings'):
+        assert dict(getattr(mansion, view)) == dict(getattr(expected, view))
+
+def test_index_is_used_until_the_csv_changes(tmp_path):
+    from mystery_engine.generator import generate_world
+    from mystery_engine.loaders import (INDEX_SUFFIX, _read_index_header, load_mansion,
+                                        read_mansion_csv)
+
+    generate_world(str(tmp_path), seed=9, rooms=400)
+    path = str(tmp_path / 'mansion.csv')
+    index_path = path + INDEX_SUFFIX
+    parsed = read_mansion_csv(path)
+    same_mansion(load_mansion(path), parsed)
+    assert os.path.exists(index_path)
+
+    mapped = load_mansion(path)
+    assert isinstance(mapped.layout.offsets, memoryview)
+    same_mansion(mapped, parsed)
+    # Edits copy the mapped arrays; the index on disk is untouched
+    mapped.add_connection(parsed.layout.names[0], 'Annex')
+    same_mansion(load_mansion(path), parsed)
+
+    # Touched but unchanged: still mapped, and the new mtime is recorded
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    assert isinstance(load_mansion(path).layout.offsets, memoryview)
+    assert _read_index_header(index_path)[3] == os.stat(path).st_mtime_ns
+
+    # Changed contents rebuild the index
+    with open(path, 'a', newline='') as f:
+        f.write('Annex,,A hidden note,,\n')
+    changed = load_mansion(path)
+    assert changed.clues['Annex'] == 'A hidden note'
+    same_mansion(load_mansion(path), read_mansion_csv(path))
+
+def test_foreign_index_is_rebuilt(tmp_path):
+    from mystery_engine.export import MANSION_FIELDS, mansion_rows, write_table
+    from mystery_engine.graph import MansionGraph
+    from mystery_engine.loaders import INDEX_SUFFIX, load_mansion
+
+    path = str(tmp_path / 'mansion_layout.csv')
+    write_table(path, MANSION_FIELDS, mansion_rows(MansionGraph()))
+    with open(path + INDEX_SUFFIX, 'wb') as f:
+        f.write(b'not an index')
+    same_mansion(load_mansion(path), MansionGraph())
+    assert isinstance(load_mansion(path).layout.offsets, memoryview)